@@ -18,6 +18,8 @@ from routes.symptom_routes import symptom_bp
 from routes.hospital_routes import hospital_bp
 from routes.appointment_routes import appointment_bp
 from routes.chat_routes import chat_bp
+from utils import stage_timing
+from utils.stage_timing import stage, stage_timings
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -94,6 +96,9 @@ app.register_blueprint(hospital_bp, url_prefix='/api/hospitals')
 app.register_blueprint(appointment_bp, url_prefix='/api/appointments')
 app.register_blueprint(chat_bp, url_prefix='/api/chat')
 
+# Per-stage timings: Server-Timing header and histograms in /api/health
+stage_timing.init_app(app)
+
 # ============================================
 # CREATE DATABASE TABLES
 # ============================================
@@ -142,6 +147,8 @@ def health_check():
         'database': db_status,
         'symptom_analyzer': 'active' if symptom_analyzer.symptoms_data else 'no data',
         'hospital_matcher': 'active' if hospital_matcher.hospitals else 'no data',
+        'analysis_cache': symptom_analyzer.cache_stats(),
+        'stage_timings': stage_timings.stats(),
         'timestamp': datetime.utcnow().isoformat()
     }), 200
 
@@ -199,12 +206,12 @@ def analyze_symptoms():
     
     Response:
     {
-        "urgency": "HIGH",
+        "urgency_level": "HIGH",
         "urgency_score": 9,
-        "matched_symptoms": ["Chest Pain", "Shortness of Breath"],
-        "specialties": ["Cardiology", "Emergency Medicine"],
-        "description": "...",
-        "first_aid": [...],
+        "matched_symptoms": [...],
+        "recommended_specialties": ["Cardiology", "Emergency Medicine"],
+        "recommendation": "...",
+        "first_aid_tips": [...],
         "red_flags": [...]
     }
     """
@@ -247,11 +254,12 @@ def analyze_symptoms():
                 history_entry = SearchHistory(
                     user_id=user_id,
                     symptoms=symptoms_text,
-                    urgency_level=analysis_result['urgency'],
-                    specialties=','.join(analysis_result['specialties'])
+                    urgency_level=analysis_result['urgency_level'],
+                    specialties=','.join(analysis_result['recommended_specialties'])
                 )
-                db.session.add(history_entry)
-                db.session.commit()
+                with stage('history'):
+                    db.session.add(history_entry)
+                    db.session.commit()
                 logger.info(f"Saved search history for user {user_id}")
         except Exception as e:
             logger.warning(f"Could not save search history: {e}")
@@ -724,8 +732,8 @@ def combined_search():
         analysis_result = symptom_analyzer.analyze(symptoms_text, language)
         
         # Step 2: Find hospitals based on analysis
-        specialties = analysis_result['specialties']
-        urgency = analysis_result['urgency']
+        specialties = analysis_result['recommended_specialties']
+        urgency = analysis_result['urgency_level']
         
         hospitals = hospital_matcher.find_hospitals(
             specialties=specialties,
@@ -746,8 +754,9 @@ def combined_search():
                     urgency_level=urgency,
                     specialties=','.join(specialties)
                 )
-                db.session.add(history_entry)
-                db.session.commit()
+                with stage('history'):
+                    db.session.add(history_entry)
+                    db.session.commit()
         except:
             pass
         
@@ -0,0 +1,34 @@
+"""
+Shared benchmark helpers
+Latency percentiles and summaries used by the benchmark scripts
+"""
+
+import statistics
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of unsorted samples (fraction between 0 and 1)"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def latency_summary(samples, fractions=(0.50, 0.99), unit='ms', digits=4,
+                    count=False, mean=False, maximum=False):
+    """
+    Percentiles of timing samples as a JSON-ready dict
+
+    Keys are named after the fraction and unit ('p50_ms', 'p99_us'), with
+    'queries', 'mean_<unit>' and 'max_<unit>' added on request.
+    """
+    ordered = sorted(samples)
+    summary = {}
+    if count:
+        summary['queries'] = len(ordered)
+    if mean:
+        summary[f'mean_{unit}'] = round(statistics.fmean(ordered), digits)
+    for fraction in fractions:
+        value = ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+        summary[f'p{round(fraction * 100)}_{unit}'] = round(value, digits)
+    if maximum:
+        summary[f'max_{unit}'] = round(ordered[-1], digits)
+    return summary
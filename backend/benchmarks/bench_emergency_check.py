@@ -0,0 +1,125 @@
+"""
+Benchmark for the emergency-check fast path
+
+Measures SymptomAnalyzer.emergency_check and the POST
+/api/symptoms/emergency-check route (through a bare Flask app with only
+the symptom blueprint) over emergency and non-emergency descriptions, and
+over descriptions padded to EMERGENCY_CHECK_MAX_CHARS. Fails when the p99
+of either set exceeds the budget, which covers every accepted length.
+
+Usage (from the backend directory):
+    python benchmarks/bench_emergency_check.py [--symptoms 1000] [--queries 5000] [--budget-ms 2]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from flask import Flask
+
+from bench_common import latency_summary
+from bench_suggest import build_catalogue
+from models.symptom_analyzer import EMERGENCY_CHECK_BUDGET_MS, EMERGENCY_CHECK_MAX_CHARS, SymptomAnalyzer
+
+QUERIES = [
+    'severe chest pain spreading to my left arm',
+    'my father is unconscious and not breathing',
+    'cannot breathe, lips turning blue',
+    'heavy bleeding from a cut that will not stop',
+    'sudden weakness on one side of the face',
+    'ಎದೆ ನೋವು ಮತ್ತು ಉಸಿರಾಟದ ತೊಂದರೆ',
+    'mild headache since morning',
+    'runny nose and sneezing',
+    'I have a slight cough and sore throat',
+    'back pain after lifting boxes'
+]
+
+
+def max_length_queries():
+    """Each query repeated up to EMERGENCY_CHECK_MAX_CHARS (the worst case)"""
+    queries = []
+    for query in QUERIES:
+        repeats = EMERGENCY_CHECK_MAX_CHARS // (len(query) + 2) + 1
+        queries.append(', '.join([query] * repeats)[:EMERGENCY_CHECK_MAX_CHARS])
+    return queries
+
+
+def time_check(analyzer, queries):
+    """emergency_check latencies in milliseconds"""
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        analyzer.emergency_check(query)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--symptoms', type=int, default=0,
+                        help='Synthetic catalogue size (0 uses data/symptoms.json)')
+    parser.add_argument('--queries', type=int, default=5000)
+    parser.add_argument('--budget-ms', type=float, default=EMERGENCY_CHECK_BUDGET_MS)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = None
+        if args.symptoms:
+            path = os.path.join(directory, 'symptoms.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'symptoms': build_catalogue(args.symptoms)}, f)
+        analyzer = SymptomAnalyzer(symptoms_db_path=path, snapshot_path='')
+
+    # The route resolves its analyzer through the module singleton
+    import models.symptom_analyzer as symptom_analyzer_module
+    symptom_analyzer_module.symptom_analyzer = analyzer
+    from routes.symptom_routes import symptom_bp
+
+    app = Flask(__name__)
+    app.register_blueprint(symptom_bp, url_prefix='/api/symptoms')
+    client = app.test_client()
+
+    rng = random.Random(5)
+    queries = rng.choices(QUERIES, k=args.queries)
+    long_queries = rng.choices(max_length_queries(), k=args.queries)
+
+    for query in queries[:200] + long_queries[:200]:
+        analyzer.emergency_check(query)
+        client.post('/api/symptoms/emergency-check', json={'symptoms': query})
+
+    function_latencies = time_check(analyzer, queries)
+    max_length_latencies = time_check(analyzer, long_queries)
+
+    route_latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        client.post('/api/symptoms/emergency-check', json={'symptoms': query})
+        route_latencies.append((time.perf_counter() - started) * 1000)
+
+    function_summary = latency_summary(function_latencies, count=True, maximum=True)
+    max_length_summary = latency_summary(max_length_latencies, count=True, maximum=True)
+    worst_p99 = max(function_summary['p99_ms'], max_length_summary['p99_ms'])
+    print(json.dumps({
+        'symptoms': len(analyzer.symptoms_data),
+        'budget_ms': args.budget_ms,
+        'max_chars': EMERGENCY_CHECK_MAX_CHARS,
+        'emergency_check': function_summary,
+        'emergency_check_max_length': max_length_summary,
+        'route': latency_summary(route_latencies, count=True, maximum=True),
+        'within_budget': worst_p99 <= args.budget_ms
+    }, indent=2))
+
+    if worst_p99 > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
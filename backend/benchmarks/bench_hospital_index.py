@@ -0,0 +1,144 @@
+"""
+Benchmark for emergency hospital search
+
+Builds synthetic hospital registries of increasing size (real hospitals
+first, then copies of them scattered over Karnataka with coordinates rounded
+like the real data, so equal distances occur), and measures
+HospitalMatcher.find_emergency_hospitals latency with the spatial index. For
+sizes up to --scan-limit it also times the previous linear scan (haversine
+for every emergency hospital, then a full sort) and checks that both return
+identical results.
+
+Usage (from the backend directory):
+    python benchmarks/bench_hospital_index.py [--sizes 50,500,5000,50000,500000] [--queries 2000]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bench_common import latency_summary
+from models.hospital_matcher import HospitalMatcher
+
+HOSPITALS_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'hospitals.json')
+
+# Fields the matcher reads; the rest of a record only adds file size
+KEPT_FIELDS = ('id', 'name', 'type', 'specialties', 'emergency_available', 'open_24_7', 'rating')
+
+# Karnataka bounding box
+LAT_RANGE = (11.6, 18.4)
+LNG_RANGE = (74.1, 78.5)
+
+
+def build_registry(size, seed=7):
+    """Real hospitals followed by synthetic ones across the state"""
+    with open(HOSPITALS_PATH, 'r', encoding='utf-8') as f:
+        real = json.load(f)['hospitals']
+
+    rng = random.Random(seed)
+    registry = [{field: h[field] for field in KEPT_FIELDS if field in h} | {'location': h['location']} for h in real]
+    while len(registry) < size:
+        template = rng.choice(real)
+        registry.append({
+            **{field: template[field] for field in KEPT_FIELDS if field in template},
+            'id': f'synth_{len(registry):07d}',
+            'location': {
+                'lat': round(rng.uniform(*LAT_RANGE), 4),
+                'lng': round(rng.uniform(*LNG_RANGE), 4)
+            }
+        })
+    return registry[:size]
+
+
+def linear_emergency_hospitals(matcher, user_location, max_results):
+    """The search before the index: every emergency hospital, full sort"""
+    hospitals_with_distance = []
+    for hospital in matcher._hospitals_in(matcher.emergency_bitset):
+        distance = matcher._calculate_distance(
+            user_location['lat'], user_location['lng'],
+            hospital['location']['lat'], hospital['location']['lng']
+        )
+        hospitals_with_distance.append({
+            **hospital,
+            'distance_km': round(distance, 2),
+            'estimated_time_minutes': matcher._estimate_travel_time(distance, 'HIGH')
+        })
+    hospitals_with_distance.sort(key=lambda x: x['distance_km'])
+    return hospitals_with_distance[:max_results]
+
+
+def time_queries(search, locations, max_results):
+    latencies = []
+    for location in locations:
+        started = time.perf_counter()
+        search(location, max_results)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latency_summary(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', default='50,500,5000,50000,500000')
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--max-results', type=int, default=5)
+    parser.add_argument('--scan-limit', type=int, default=50000,
+                        help='largest registry to also time with the linear scan')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    rng = random.Random(11)
+    locations = [
+        {'lat': round(rng.uniform(*LAT_RANGE), 4), 'lng': round(rng.uniform(*LNG_RANGE), 4)}
+        for _ in range(args.queries)
+    ]
+
+    rows = []
+    for size in (int(value) for value in args.sizes.split(',')):
+        registry = build_registry(size)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'hospitals.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'hospitals': registry}, f)
+            del registry
+
+            started = time.perf_counter()
+            matcher = HospitalMatcher(hospitals_db_path=path, snapshot_path='')
+            build_seconds = time.perf_counter() - started
+
+        for location in locations[:200]:
+            matcher.find_emergency_hospitals(location, args.max_results)
+
+        row = {
+            'hospitals': len(matcher.hospitals),
+            'index': matcher.emergency_index.stats(),
+            'matcher_build_seconds': round(build_seconds, 2),
+            'indexed': time_queries(matcher.find_emergency_hospitals, locations, args.max_results)
+        }
+
+        if size <= args.scan_limit:
+            # The scan is slow at large sizes; a sample of queries is enough
+            sample = locations[:max(20, args.queries * 500 // size)]
+            row['linear_scan'] = time_queries(
+                lambda location, k: linear_emergency_hospitals(matcher, location, k), sample, args.max_results
+            )
+            row['identical_results'] = all(
+                matcher.find_emergency_hospitals(location, args.max_results)
+                == linear_emergency_hospitals(matcher, location, args.max_results)
+                for location in sample
+            )
+        rows.append(row)
+        print(json.dumps(row), file=sys.stderr)
+        del matcher
+
+    print(json.dumps({'queries': args.queries, 'max_results': args.max_results, 'sizes': rows}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
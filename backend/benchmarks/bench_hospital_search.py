@@ -0,0 +1,114 @@
+"""
+Benchmark for hospital search
+
+Measures HospitalMatcher.find_hospitals latency on synthetic registries of
+increasing size (see bench_hospital_index.build_registry) against the
+previous per-hospital path (_apply_filters, a haversine, ETA and result copy
+per hospital, then _rank_hospitals), and checks that both return identical
+results, scores included.
+
+Usage (from the backend directory):
+    python benchmarks/bench_hospital_search.py [--sizes 50,5000,50000,500000] [--queries 300]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bench_common import latency_summary
+from bench_hospital_index import LAT_RANGE, LNG_RANGE, build_registry
+from models.hospital_matcher import HospitalMatcher
+
+URGENCIES = ('HIGH', 'MEDIUM', 'LOW')
+FILTERS = ({}, {'type': 'Private'}, {'open_24_7': True}, {'max_distance': 50})
+
+
+def scalar_find_hospitals(matcher, specialties, user_location, urgency, filters):
+    """The search before the vectorized pass: one Python iteration per hospital"""
+    filtered = matcher._apply_filters(matcher.hospitals, specialties, urgency, filters)
+    hospitals_with_distance = []
+    for hospital in filtered:
+        distance = matcher._calculate_distance(
+            user_location['lat'], user_location['lng'],
+            hospital['location']['lat'], hospital['location']['lng']
+        )
+        if urgency != 'HIGH' and distance > filters.get('max_distance', 20):
+            continue
+        hospitals_with_distance.append({
+            **hospital,
+            'distance_km': round(distance, 2),
+            'estimated_time_minutes': matcher._estimate_travel_time(distance, urgency)
+        })
+    return matcher._rank_hospitals(hospitals_with_distance, specialties, urgency)[:15]
+
+
+def time_queries(search, queries):
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        search(*query)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latency_summary(latencies, digits=3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', default='50,5000,50000,500000')
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('--scalar-queries', type=int, default=20,
+                        help='queries timed and compared on the per-hospital path')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    with open(os.path.join(os.path.dirname(__file__), '..', 'data', 'hospitals.json'), encoding='utf-8') as f:
+        specialties = sorted({s for h in json.load(f)['hospitals'] for s in h.get('specialties', [])})
+
+    rng = random.Random(11)
+    queries = [
+        (
+            rng.sample(specialties, rng.randint(0, 3)),
+            {'lat': round(rng.uniform(*LAT_RANGE), 4), 'lng': round(rng.uniform(*LNG_RANGE), 4)},
+            rng.choice(URGENCIES),
+            dict(rng.choice(FILTERS))
+        )
+        for _ in range(args.queries)
+    ]
+
+    rows = []
+    for size in (int(value) for value in args.sizes.split(',')):
+        registry = build_registry(size)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'hospitals.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'hospitals': registry}, f)
+            del registry
+            matcher = HospitalMatcher(hospitals_db_path=path, snapshot_path='')
+
+        for query in queries[:20]:
+            matcher.find_hospitals(*query)
+
+        sample = queries[:args.scalar_queries]
+        row = {
+            'hospitals': len(matcher.hospitals),
+            'vectorized': time_queries(matcher.find_hospitals, queries),
+            'per_hospital': time_queries(lambda *query: scalar_find_hospitals(matcher, *query), sample),
+            'identical_results': all(
+                matcher.find_hospitals(*query) == scalar_find_hospitals(matcher, *query) for query in sample
+            )
+        }
+        rows.append(row)
+        print(json.dumps(row), file=sys.stderr)
+        del matcher
+
+    print(json.dumps({'queries': args.queries, 'sizes': rows}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
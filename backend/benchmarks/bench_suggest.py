@@ -0,0 +1,88 @@
+"""
+Benchmark for symptom autocomplete
+
+Builds a synthetic catalogue of the requested size by recombining the
+words of the real catalogue's keywords, then measures SymptomAnalyzer.suggest
+latency for prefixes of 1 to 12 characters taken from catalogue terms.
+
+Usage (from the backend directory):
+    python benchmarks/bench_suggest.py [--symptoms 10000] [--queries 5000]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bench_common import latency_summary
+from models.symptom_analyzer import SymptomAnalyzer
+
+SYMPTOMS_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'symptoms.json')
+
+
+def build_catalogue(size, seed=7):
+    """Real symptoms followed by synthetic ones with recombined keywords"""
+    with open(SYMPTOMS_PATH, 'r', encoding='utf-8') as f:
+        symptoms = json.load(f)['symptoms']
+
+    rng = random.Random(seed)
+    words = sorted({word for s in symptoms for k in s['keywords'] for word in k.split()})
+    catalogue = list(symptoms)
+    while len(catalogue) < size:
+        template = rng.choice(symptoms)
+        keywords = [' '.join(rng.sample(words, rng.randint(1, 3))) for _ in range(rng.randint(4, 10))]
+        catalogue.append({
+            **template,
+            'id': f'synth_{len(catalogue):06d}',
+            'name': keywords[0].title(),
+            'keywords': keywords
+        })
+    return catalogue[:size]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--symptoms', type=int, default=10000)
+    parser.add_argument('--queries', type=int, default=5000)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    catalogue = build_catalogue(args.symptoms)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'symptoms.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'symptoms': catalogue}, f)
+
+        started = time.perf_counter()
+        analyzer = SymptomAnalyzer(symptoms_db_path=path, snapshot_path='')
+        build_seconds = time.perf_counter() - started
+
+    rng = random.Random(11)
+    terms = [k for s in catalogue for k in s['keywords']]
+    prefixes = [term[:rng.randint(1, 12)] for term in rng.choices(terms, k=args.queries)]
+
+    for prefix in prefixes[:200]:
+        analyzer.suggest(prefix)
+
+    latencies = []
+    for prefix in prefixes:
+        started = time.perf_counter()
+        analyzer.suggest(prefix)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    print(json.dumps({
+        'symptoms': len(catalogue),
+        'index_keys': len(analyzer.suggester),
+        'analyzer_build_seconds': round(build_seconds, 2),
+        **latency_summary(latencies, count=True, maximum=True)
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+"""
+Scale-out benchmark for the symptom engine
+
+For each catalogue size, generates a deterministic synthetic symptoms.json
+(scripts/generate_symptoms.py) and measures:
+
+- load time: building every index from JSON, and loading the compiled
+  knowledge snapshot
+- memory: Python heap retained by a loaded analyzer and its peak during
+  the load (tracemalloc), plus the process's peak RSS
+- latency distribution of analyze (uncached, rule-based path),
+  search_symptoms and get_symptom_by_id
+
+Results are printed (and optionally written) as JSON tagged with the git
+commit, so runs can be compared across commits. Azure OpenAI is disabled
+for the run.
+
+Usage (from the backend directory):
+    python benchmarks/bench_symptom_engine.py [--sizes 1000,10000,50000] [--queries 2000] [--output results.json]
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+# Measure the in-process engine only, never the cloud call
+os.environ['AZURE_OPENAI_KEY'] = ''
+os.environ['AZURE_OPENAI_ENDPOINT'] = ''
+
+from bench_common import latency_summary
+from generate_symptoms import generate_symptoms
+from models.symptom_analyzer import SymptomAnalyzer
+from utils.knowledge_snapshot import write_snapshot
+
+QUERY_TEMPLATES = [
+    'I have {} since yesterday',
+    '{}',
+    'my mother has {} and feels tired',
+    'suffering from {} for two days'
+]
+
+
+def summarize(latencies):
+    return latency_summary(latencies, fractions=(0.50, 0.90, 0.95, 0.99), count=True, mean=True, maximum=True)
+
+
+def time_calls(function, arguments):
+    latencies = []
+    for argument in arguments:
+        started = time.perf_counter()
+        function(argument)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def build_queries(symptoms, count, rng):
+    """Descriptions, search terms and ids drawn from the catalogue"""
+    descriptions = []
+    for _ in range(count):
+        symptom = rng.choice(symptoms)
+        roll = rng.random()
+        if roll < 0.15 and symptom.get('kannada'):
+            descriptions.append(symptom['kannada'])
+        elif roll < 0.30:
+            other = rng.choice(symptoms)
+            descriptions.append(f"{rng.choice(symptom['keywords'])} and {rng.choice(other['keywords'])}")
+        else:
+            descriptions.append(rng.choice(QUERY_TEMPLATES).format(rng.choice(symptom['keywords'])))
+
+    search_terms = []
+    for _ in range(count):
+        keyword = rng.choice(rng.choice(symptoms)['keywords'])
+        search_terms.append(keyword[:rng.randint(3, max(3, len(keyword)))])
+
+    # One lookup in ten misses
+    symptom_ids = [
+        rng.choice(symptoms)['id'] if rng.random() >= 0.1 else f'missing_{i}'
+        for i in range(count)
+    ]
+    return descriptions, search_terms, symptom_ids
+
+
+def bench_size(size, queries, seed, directory):
+    catalogue = generate_symptoms(size, seed=seed)
+    symptoms_path = os.path.join(directory, f'symptoms_{size}.json')
+    snapshot_path = os.path.join(directory, f'knowledge_{size}.snapshot')
+    with open(symptoms_path, 'w', encoding='utf-8') as f:
+        json.dump(catalogue, f, ensure_ascii=False)
+
+    gc.collect()
+    started = time.perf_counter()
+    analyzer = SymptomAnalyzer(symptoms_db_path=symptoms_path, snapshot_path='')
+    build_seconds = time.perf_counter() - started
+
+    write_snapshot(snapshot_path, {
+        'symptom_analyzer': (analyzer.snapshot_version(), analyzer.snapshot_state())
+    })
+    del analyzer
+    gc.collect()
+
+    started = time.perf_counter()
+    analyzer = SymptomAnalyzer(symptoms_db_path=symptoms_path, snapshot_path=snapshot_path)
+    snapshot_load_seconds = time.perf_counter() - started
+    del analyzer
+    gc.collect()
+
+    # Memory is traced on a separate load, so tracing does not skew timings
+    tracemalloc.start()
+    analyzer = SymptomAnalyzer(symptoms_db_path=symptoms_path, snapshot_path=snapshot_path)
+    gc.collect()
+    retained_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rng = random.Random(seed)
+    descriptions, search_terms, symptom_ids = build_queries(analyzer.symptoms_data, queries, rng)
+
+    def analyze_uncached(text):
+        analyzer.result_cache.clear()
+        analyzer.analyze(text)
+
+    # Warm up lazily built state before timing
+    for text in descriptions[:50]:
+        analyze_uncached(text)
+
+    return {
+        'symptoms': len(analyzer.symptoms_data),
+        'load': {
+            'json_build_seconds': round(build_seconds, 3),
+            'snapshot_load_seconds': round(snapshot_load_seconds, 3),
+            'snapshot_bytes': os.path.getsize(snapshot_path),
+            'source_bytes': os.path.getsize(symptoms_path)
+        },
+        'memory': {
+            'retained_bytes': retained_bytes,
+            'load_peak_bytes': peak_bytes
+        },
+        'latency': {
+            'analyze': summarize(time_calls(analyze_uncached, descriptions)),
+            'search_symptoms': summarize(time_calls(analyzer.search_symptoms, search_terms)),
+            'get_symptom_by_id': summarize(time_calls(analyzer.get_symptom_by_id, symptom_ids))
+        }
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', default='1000,10000,50000', help='comma-separated catalogue sizes')
+    parser.add_argument('--queries', type=int, default=2000, help='queries per operation and size')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--output', help='also write the results to this JSON file')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            results.append(bench_size(size, args.queries, args.seed, directory))
+            gc.collect()
+
+    report = {
+        'benchmark': 'symptom_engine',
+        'commit': git_commit(),
+        'created_at': datetime.utcnow().isoformat(),
+        'python': platform.python_version(),
+        'seed': args.seed,
+        'queries': args.queries,
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'results': results
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark for the typo-correction deletes index
+
+Measures how long the SymSpell-style index takes to build over the
+symptom keyword vocabulary and how long a lookup takes, compared with a
+naive pairwise edit-distance scan over the same vocabulary.
+
+Usage (from the backend directory):
+    python benchmarks/bench_typo_index.py [--iterations 2000]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bench_common import latency_summary
+from utils.symspell import SymSpellIndex, edit_distance
+
+SYMPTOMS_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'symptoms.json')
+
+TYPOS = ['hedache', 'chst', 'feaver', 'vomitting', 'dizzyness', 'breathng',
+         'diarhea', 'palpitatons', 'unconscous', 'seizur', 'caugh', 'rashh']
+
+
+def load_vocabulary():
+    """Keyword tokens the analyzer indexes for typo correction"""
+    with open(SYMPTOMS_PATH, 'r', encoding='utf-8') as f:
+        symptoms = json.load(f).get('symptoms', [])
+
+    vocabulary = []
+    for symptom in symptoms:
+        for keyword in symptom.get('keywords', []):
+            vocabulary.extend(
+                token for token in re.findall(r'\w+', keyword.lower())
+                if len(token) >= 4 and token.isascii()
+            )
+    return vocabulary
+
+
+def naive_lookup(vocabulary, term, max_distance):
+    """Pairwise scan: edit distance against every vocabulary word"""
+    best = None
+    for word in vocabulary:
+        distance = edit_distance(term, word, max_distance)
+        if distance <= max_distance and (best is None or distance < best[1]):
+            best = (word, distance)
+    return best
+
+
+def time_lookups(lookup, iterations):
+    """Per-lookup latencies in microseconds"""
+    samples = []
+    for i in range(iterations):
+        term = TYPOS[i % len(TYPOS)]
+        start = time.perf_counter()
+        lookup(term)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def summarize(samples):
+    return latency_summary(samples, unit='us', digits=2, mean=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    vocabulary = load_vocabulary()
+    unique_vocabulary = sorted(set(vocabulary))
+
+    start = time.perf_counter()
+    index = SymSpellIndex(max_edit_distance=2)
+    index.add_words(vocabulary)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    results = {
+        'vocabulary_words': len(index),
+        'delete_keys': index.delete_count,
+        'build_ms': round(build_ms, 2),
+        'deletes_index': summarize(time_lookups(lambda t: index.lookup(t, 2), args.iterations)),
+        'pairwise_scan': summarize(time_lookups(
+            lambda t: naive_lookup(unique_vocabulary, t, 2), max(1, args.iterations // 10)
+        ))
+    }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
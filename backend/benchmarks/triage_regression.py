@@ -0,0 +1,209 @@
+"""
+Triage regression check: accuracy and latency on the labelled corpus
+
+Runs SymptomAnalyzer.analyze in rule-only mode (Azure OpenAI disabled,
+uncached) over benchmarks/triage_corpus.jsonl (see
+scripts/build_triage_corpus.py) and reports:
+
+- urgency accuracy, overall and per slice (generated: en, kn, hi, ta,
+  romanized, misspelled; hand-written: independent, benign, vague,
+  negative), and the HIGH/MEDIUM/LOW confusion matrix
+- HIGH recall and missed HIGH cases, overall and per slice: the share of
+  HIGH cases triaged HIGH (under-triage is the unsafe error)
+- over-triage rate: the share of MEDIUM and LOW cases triaged HIGH
+- specialty hit rate: the share of cases expecting specialties with at
+  least one recommended specialty among the expected ones
+- analyze latency percentiles
+
+and compares them with the committed baseline. Exits 1 when HIGH recall
+drops at all, overall or in any slice, or the accuracy of the benign or
+negative slice drops at all; when accuracy or specialty hit rate
+drop, or the over-triage rate grows, by more than --max-accuracy-drop; or
+when p50, p95 or p99 latency grow by more than --max-latency-increase.
+Latency depends on the machine: refresh the baseline with --update-baseline
+on the machine that runs the check.
+
+Usage (from the backend directory):
+    python benchmarks/triage_regression.py [--corpus PATH] [--baseline PATH] [--update-baseline]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Rule-only: never call the cloud model
+os.environ['AZURE_OPENAI_KEY'] = ''
+os.environ['AZURE_OPENAI_ENDPOINT'] = ''
+
+from bench_common import latency_summary
+from models.symptom_analyzer import SymptomAnalyzer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORPUS = os.path.join(BENCH_DIR, 'triage_corpus.jsonl')
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'triage_baseline.json')
+
+URGENCY_LEVELS = ('HIGH', 'MEDIUM', 'LOW')
+QUALITY_METRICS = ('accuracy', 'specialty_hit_rate')
+
+# Hand-written slices expected LOW: any newly over-triaged case fails
+GUARDED_SLICES = ('benign', 'negative')
+LATENCY_METRICS = ('p50_ms', 'p95_ms', 'p99_ms')
+
+# Latency differences below this are timer and scheduler noise
+LATENCY_NOISE_MS = 0.05
+
+
+def load_corpus(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def rate(hits, total):
+    return round(hits / total, 4) if total else None
+
+
+def evaluate(analyzer, corpus):
+    """Analyze every case; return quality metrics and latency percentiles"""
+    # Build lazily created state outside the timed run
+    for case in corpus[:50]:
+        analyzer.analyze(case['text'])
+
+    confusion = {expected: {predicted: 0 for predicted in URGENCY_LEVELS} for expected in URGENCY_LEVELS}
+    slices = {}
+    latencies = []
+    correct = specialty_cases = specialty_hits = 0
+    failures = []
+
+    for case in corpus:
+        analyzer.result_cache.clear()
+        started = time.perf_counter()
+        result = analyzer.analyze(case['text'])
+        latencies.append((time.perf_counter() - started) * 1000)
+
+        expected, predicted = case['urgency'], result['urgency_level']
+        is_correct = predicted == expected
+        confusion[expected][predicted] += 1
+        correct += is_correct
+        if case['specialties']:
+            specialty_cases += 1
+            specialty_hits += bool(set(result['recommended_specialties']) & set(case['specialties']))
+
+        slice_stats = slices.setdefault(case['slice'], {'cases': 0, 'correct': 0, 'high': 0, 'missed_high': 0})
+        slice_stats['cases'] += 1
+        slice_stats['correct'] += is_correct
+        if expected == 'HIGH':
+            slice_stats['high'] += 1
+            slice_stats['missed_high'] += predicted != 'HIGH'
+        if not is_correct:
+            failures.append({'id': case['id'], 'text': case['text'], 'expected': expected, 'predicted': predicted})
+
+    high_cases = sum(confusion['HIGH'].values())
+    other_cases = len(corpus) - high_cases
+    return {
+        'cases': len(corpus),
+        'accuracy': rate(correct, len(corpus)),
+        'high_recall': rate(confusion['HIGH']['HIGH'], high_cases),
+        'missed_high': high_cases - confusion['HIGH']['HIGH'],
+        'over_triage_rate': rate(confusion['MEDIUM']['HIGH'] + confusion['LOW']['HIGH'], other_cases),
+        'specialty_hit_rate': rate(specialty_hits, specialty_cases),
+        'slices': {
+            name: {
+                'cases': stats['cases'],
+                'accuracy': rate(stats['correct'], stats['cases']),
+                'high_recall': rate(stats['high'] - stats['missed_high'], stats['high']),
+                'missed_high': stats['missed_high']
+            }
+            for name, stats in sorted(slices.items())
+        },
+        'confusion': confusion,
+        'latency': latency_summary(latencies, fractions=(0.50, 0.95, 0.99), maximum=True)
+    }, failures
+
+
+def regressions(report, baseline, max_accuracy_drop, max_latency_increase):
+    """Human-readable list of metrics that regressed beyond the thresholds"""
+    problems = []
+    for metric in QUALITY_METRICS:
+        current, previous = report[metric], baseline.get(metric)
+        if previous is not None and current is not None and current < previous - max_accuracy_drop:
+            problems.append(f'{metric} dropped from {previous} to {current}')
+
+    current, previous = report['over_triage_rate'], baseline.get('over_triage_rate')
+    if previous is not None and current is not None and current > previous + max_accuracy_drop:
+        problems.append(f'over_triage_rate grew from {previous} to {current}')
+
+    # Any lost HIGH case is a regression, overall or in any slice
+    current, previous = report['high_recall'], baseline.get('high_recall')
+    if previous is not None and current is not None and current < previous:
+        problems.append(f'high_recall dropped from {previous} to {current}')
+    for name, stats in report['slices'].items():
+        current = stats['high_recall']
+        previous = baseline.get('slices', {}).get(name, {}).get('high_recall')
+        if previous is not None and current is not None and current < previous:
+            problems.append(f'{name} high_recall dropped from {previous} to {current} '
+                            f'({stats["missed_high"]} HIGH cases missed)')
+
+    for name in GUARDED_SLICES:
+        current = report['slices'].get(name, {}).get('accuracy')
+        previous = baseline.get('slices', {}).get(name, {}).get('accuracy')
+        if previous is not None and current is not None and current < previous:
+            problems.append(f'{name} accuracy dropped from {previous} to {current}')
+
+    for metric in LATENCY_METRICS:
+        current, previous = report['latency'][metric], baseline.get('latency', {}).get(metric)
+        if previous is None:
+            continue
+        if current > previous * (1 + max_latency_increase) and current - previous > LATENCY_NOISE_MS:
+            problems.append(f'latency {metric} grew from {previous} to {current}')
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--max-accuracy-drop', type=float, default=0.005,
+                        help='allowed absolute drop of accuracy and specialty hit rate, and growth '
+                             'of the over-triage rate (HIGH recall may not drop at all)')
+    parser.add_argument('--max-latency-increase', type=float, default=0.25,
+                        help='allowed relative growth of p50/p95/p99 latency')
+    parser.add_argument('--update-baseline', action='store_true', help='write this run as the new baseline')
+    parser.add_argument('--show-failures', type=int, default=0, help='print up to N misclassified cases')
+    args = parser.parse_args()
+    # Includes the missing-credentials error Azure OpenAI logs in rule-only mode
+    logging.disable(logging.ERROR)
+
+    corpus = load_corpus(args.corpus)
+    analyzer = SymptomAnalyzer(snapshot_path='')
+    report, failures = evaluate(analyzer, corpus)
+    report['dataset_version'] = analyzer.dataset_version
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(report, indent=2) + '\n')
+        report['baseline'] = 'updated'
+        problems = []
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('dataset_version') != report['dataset_version']:
+            print('warning: baseline was recorded on a different symptom catalogue', file=sys.stderr)
+        problems = regressions(report, baseline, args.max_accuracy_drop, args.max_latency_increase)
+        report['regressions'] = problems
+    else:
+        print(f'warning: no baseline at {args.baseline}, nothing to compare', file=sys.stderr)
+        problems = []
+
+    if args.show_failures:
+        report['failures'] = failures[:args.show_failures]
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,22 +3,172 @@ import math
 import os
 from typing import List, Dict, Tuple, Optional
 import logging
+import numpy as np
+from utils.knowledge_snapshot import (
+    DEFAULT_SNAPSHOT_PATH, code_fingerprint, load_snapshot_section, section_version, source_fingerprint
+)
+from utils.spatial_index import EARTH_RADIUS_KM, build_geo_index
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Derived state restored from / compiled into the knowledge snapshot
+SNAPSHOT_ATTRIBUTES = (
+    'hospitals', 'hospital_ids', 'specialty_bitsets', 'emergency_bitset', 'emergency_index', 'hospital_columns'
+)
+
+# Hospitals returned by find_hospitals
+SEARCH_RESULT_LIMIT = 15
+
+# Vectorized distances and scores this close (in hundredths) to a rounding
+# or max_distance boundary are redone with the scalar formulas, so every
+# decision matches them exactly; the vector pass is off by ~1e-12 at most
+BOUNDARY_TOLERANCE = 1e-6
+
 class HospitalMatcher:
     """Intelligent hospital matching and ranking system"""
     
-    def __init__(self, hospitals_db_path=None):
+    def __init__(self, hospitals_db_path=None, snapshot_path=None):
         if hospitals_db_path is None:
             hospitals_db_path = os.path.join(
                 os.path.dirname(__file__), '..', 'data', 'hospitals.json'
             )
         self.hospitals_db_path = hospitals_db_path
-        self.hospitals = self._load_hospitals()
+        self.snapshot_path = DEFAULT_SNAPSHOT_PATH if snapshot_path is None else snapshot_path
+        self.code_version = code_fingerprint((type(self), build_geo_index))
+        self._load_dataset()
         logger.info(f"HospitalMatcher initialized with {len(self.hospitals)} hospitals")
     
+    def _load_dataset(self):
+        """Load hospitals and their indexes (snapshot or JSON)"""
+        self.dataset_version = source_fingerprint([self.hospitals_db_path])
+        
+        state = load_snapshot_section(
+            self.snapshot_path, 'hospital_matcher', self.snapshot_version(), SNAPSHOT_ATTRIBUTES
+        )
+        if state is not None:
+            for name in SNAPSHOT_ATTRIBUTES:
+                setattr(self, name, state[name])
+            logger.info(f"Loaded hospitals from knowledge snapshot (version {self.dataset_version})")
+            return
+        
+        self.hospitals = self._load_hospitals()
+        self._build_indexes()
+    
+    def snapshot_version(self) -> str:
+        """Snapshot section version: the data file plus the code that indexes it"""
+        return section_version(self.dataset_version, self.code_version)
+    
+    def snapshot_state(self) -> Dict:
+        """Hospitals and derived indexes to compile into the knowledge snapshot"""
+        return {name: getattr(self, name) for name in SNAPSHOT_ATTRIBUTES}
+    
+    def _build_indexes(self):
+        """
+        Build id, specialty and location lookups
+        
+        Specialty and emergency sets are bitsets over hospital positions
+        (bit i = self.hospitals[i]), so filters combine with | and & and
+        yield hospitals in database order. Emergency hospitals are also
+        indexed by location for nearest-first search.
+        """
+        self.hospital_ids = {}
+        specialty_positions = {}
+        emergency_positions = []
+        
+        for position, hospital in enumerate(self.hospitals):
+            self.hospital_ids.setdefault(hospital.get('id'), position)
+            for specialty in hospital.get('specialties', []):
+                specialty_positions.setdefault(specialty, []).append(position)
+            if hospital.get('emergency_available', False):
+                emergency_positions.append(position)
+        
+        # Set all bits of a set at once; OR-ing them in one by one copies
+        # the growing integer every time (quadratic in registry size)
+        self.specialty_bitsets = {
+            specialty: self._bitset(positions)
+            for specialty, positions in specialty_positions.items()
+        }
+        self.emergency_bitset = self._bitset(emergency_positions)
+        self.emergency_index = build_geo_index(
+            (position, *self._coordinates(self.hospitals[position]))
+            for position in emergency_positions
+        )
+        logger.info(f"Indexed {len(self.emergency_index)} emergency hospitals by location")
+        self.hospital_columns = self._build_columns()
+    
+    def _build_columns(self) -> Dict:
+        """
+        Per-hospital NumPy columns for vectorized search, in database order
+        
+        Coordinates are kept in radians with cos(lat) precomputed. Hospitals
+        without numeric, finite coordinates are marked as not located (the
+        per-hospital search skipped them on the resulting error), and a
+        non-numeric rating scores as the 3.0 default.
+        """
+        count = len(self.hospitals)
+        lat = np.full(count, np.nan)
+        lng = np.full(count, np.nan)
+        rating = np.full(count, 3.0)
+        emergency = np.zeros(count, dtype=bool)
+        open_24_7 = np.zeros(count, dtype=bool)
+        type_codes = np.zeros(count, dtype=np.int32)
+        types = {}
+        
+        for position, hospital in enumerate(self.hospitals):
+            hospital_lat, hospital_lng = self._coordinates(hospital)
+            if isinstance(hospital_lat, (int, float)) and isinstance(hospital_lng, (int, float)):
+                lat[position] = hospital_lat
+                lng[position] = hospital_lng
+            value = hospital.get('rating', 3.0)
+            if isinstance(value, (int, float)):
+                rating[position] = value
+            emergency[position] = bool(hospital.get('emergency_available', False))
+            open_24_7[position] = bool(hospital.get('open_24_7', False))
+            type_codes[position] = types.setdefault(hospital.get('type'), len(types))
+        
+        lat_rad = np.radians(lat)
+        return {
+            'lat_rad': lat_rad,
+            'lng_rad': np.radians(lng),
+            'cos_lat': np.cos(lat_rad),
+            'located': np.isfinite(lat) & np.isfinite(lng),
+            'rating': rating,
+            'emergency': emergency,
+            'open_24_7': open_24_7,
+            'type_codes': type_codes,
+            'types': tuple(types)
+        }
+    
+    @staticmethod
+    def _bitset(positions: List[int]) -> int:
+        """Integer with the bits of the given positions set"""
+        if not positions:
+            return 0
+        bits = bytearray(positions[-1] // 8 + 1)
+        for position in positions:
+            bits[position >> 3] |= 1 << (position & 7)
+        return int.from_bytes(bits, 'little')
+    
+    @staticmethod
+    def _coordinates(hospital: Dict) -> Tuple[Optional[float], Optional[float]]:
+        """(lat, lng) of a hospital, None for parts that are missing"""
+        location = hospital.get('location')
+        if not isinstance(location, dict):
+            return None, None
+        return location.get('lat'), location.get('lng')
+    
+    def _mask(self, bitset: int) -> np.ndarray:
+        """Boolean array over hospital positions, True where the bit is set"""
+        count = len(self.hospitals)
+        raw = np.frombuffer(bitset.to_bytes((count + 7) // 8, 'little'), dtype=np.uint8)
+        return np.unpackbits(raw, count=count, bitorder='little').view(bool)
+    
+    def _hospitals_in(self, bitset: int) -> List[Dict]:
+        """Hospitals whose bits are set, in database order"""
+        hospitals = self.hospitals
+        return [hospitals[position] for position in np.flatnonzero(self._mask(bitset)).tolist()]
+    
     def _load_hospitals(self) -> List[Dict]:
         """Load hospitals database from JSON file"""
         try:
@@ -73,59 +223,206 @@ class HospitalMatcher:
             filters = {}
         
         # Filter hospitals
-        filtered_hospitals = self._apply_filters(
-            self.hospitals,
-            specialties,
-            urgency,
-            filters
-        )
+        candidates = np.flatnonzero(self._filter_mask(specialties, urgency, filters))
         
-        if not filtered_hospitals:
+        if not len(candidates):
             logger.warning("No hospitals matched the filters")
             return []
         
-        logger.info(f"Filtered to {len(filtered_hospitals)} hospitals")
+        logger.info(f"Filtered to {len(candidates)} hospitals")
         
-        # Calculate distances and add location data
-        hospitals_with_distance = []
-        for hospital in filtered_hospitals:
-            try:
-                distance = self._calculate_distance(
-                    user_location['lat'],
-                    user_location['lng'],
-                    hospital['location']['lat'],
-                    hospital['location']['lng']
-                )
-                
-                # Skip if too far (except for HIGH urgency)
-                max_distance = filters.get('max_distance', 20)
-                if urgency != 'HIGH' and distance > max_distance:
-                    continue
-                
-                hospitals_with_distance.append({
-                    **hospital,
-                    'distance_km': round(distance, 2),
-                    'estimated_time_minutes': self._estimate_travel_time(distance, urgency)
-                })
-            except Exception as e:
-                logger.error(f"Error calculating distance for hospital {hospital.get('name')}: {e}")
-                continue
-        
-        if not hospitals_with_distance:
+        # Distances and scores of all candidates in one vectorized pass
+        candidates, distances = self._candidate_distances(candidates, user_location, urgency, filters)
+        
+        if not len(candidates):
             logger.warning("No hospitals within distance range")
             return []
         
-        # Score and rank hospitals
-        ranked_hospitals = self._rank_hospitals(
-            hospitals_with_distance,
-            specialties,
-            urgency
+        scores = self._candidate_scores(candidates, distances, specialties, urgency)
+        top = self._top_positions(candidates, scores, SEARCH_RESULT_LIMIT)
+        
+        # Result records for the top hospitals only, with the scalar formulas
+        ranked_hospitals = []
+        for position in top.tolist():
+            hospital = self.hospitals[position]
+            distance = self._calculate_distance(
+                user_location['lat'],
+                user_location['lng'],
+                *self._coordinates(hospital)
+            )
+            hospital_with_distance = {
+                **hospital,
+                'distance_km': round(distance, 2),
+                'estimated_time_minutes': self._estimate_travel_time(distance, urgency)
+            }
+            score, score_breakdown = self._score_hospital(hospital_with_distance, specialties, urgency)
+            ranked_hospitals.append({
+                **hospital_with_distance,
+                'match_score': round(score, 2),
+                'score_breakdown': score_breakdown
+            })
+        
+        logger.info(f"Ranked {len(candidates)} hospitals, returning top {len(ranked_hospitals)}")
+        
+        return ranked_hospitals
+    
+    def _filter_mask(self, specialties: List[str], urgency: str, filters: Dict) -> np.ndarray:
+        """The hospitals _apply_filters keeps, as a boolean array over positions"""
+        columns = self.hospital_columns
+        mask = np.ones(len(self.hospitals), dtype=bool)
+        
+        # Filter by specialty (must have at least one matching specialty)
+        if specialties:
+            bitset = 0
+            for specialty in specialties:
+                bitset |= self.specialty_bitsets.get(specialty, 0)
+            mask &= self._mask(bitset)
+        
+        # Filter by hospital type (Government/Private)
+        if filters.get('type'):
+            codes = [code for code, value in enumerate(columns['types']) if value == filters['type']]
+            mask &= np.isin(columns['type_codes'], codes)
+        
+        # Filter by emergency availability (required for HIGH urgency)
+        if filters.get('emergency_only') or urgency == 'HIGH':
+            mask &= columns['emergency']
+        
+        # Filter by 24/7 availability
+        if filters.get('open_24_7'):
+            mask &= columns['open_24_7']
+        
+        return mask
+    
+    def _candidate_distances(
+        self,
+        candidates: np.ndarray,
+        user_location: Dict[str, float],
+        urgency: str,
+        filters: Dict
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Haversine distances of the candidates, rounded like distance_km
+        
+        Skips the hospitals the per-hospital loop skipped: those without
+        usable coordinates and, unless urgency is HIGH, those farther than
+        filters['max_distance'] (default 20 km).
+        
+        Returns:
+            Positions of the kept candidates and their distances (km, 2 decimals)
+        """
+        lat, lng = user_location['lat'], user_location['lng']
+        max_distance = filters.get('max_distance', 20)
+        nothing = (candidates[:0], np.empty(0))
+        
+        if not (isinstance(lat, (int, float)) and isinstance(lng, (int, float))
+                and math.isfinite(lat) and math.isfinite(lng)):
+            logger.error(f"Cannot calculate distances from location {lat}, {lng}")
+            return nothing
+        
+        limited = urgency != 'HIGH'
+        if limited and not isinstance(max_distance, (int, float)):
+            logger.error(f"Invalid max_distance filter: {max_distance!r}")
+            return nothing
+        
+        columns = self.hospital_columns
+        candidates = candidates[columns['located'][candidates]]
+        
+        lat1_rad = math.radians(lat)
+        dlat = columns['lat_rad'][candidates] - lat1_rad
+        dlon = columns['lng_rad'][candidates] - math.radians(lng)
+        a = (np.sin(dlat / 2)**2 +
+             math.cos(lat1_rad) * columns['cos_lat'][candidates] *
+             np.sin(dlon / 2)**2)
+        with np.errstate(invalid='ignore'):
+            distances = EARTH_RADIUS_KM * (2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a)))
+        
+        # Redo distances at a rounding or max_distance boundary exactly
+        hundredths = distances * 100
+        boundary = np.abs(hundredths - np.floor(hundredths) - 0.5) < BOUNDARY_TOLERANCE
+        if limited:
+            boundary |= np.abs(hundredths - max_distance * 100) < BOUNDARY_TOLERANCE
+        rounded = np.rint(hundredths) / 100
+        for index in np.flatnonzero(boundary).tolist():
+            distance = self._calculate_distance(lat, lng, *self._coordinates(self.hospitals[candidates[index]]))
+            distances[index] = distance
+            rounded[index] = round(distance, 2)
+        
+        # Skip if too far (except for HIGH urgency)
+        keep = np.isfinite(distances)
+        if limited:
+            keep &= ~(distances > max_distance)
+        
+        return candidates[keep], rounded[keep]
+    
+    def _candidate_scores(
+        self,
+        candidates: np.ndarray,
+        distances: np.ndarray,
+        specialties: List[str],
+        urgency: str
+    ) -> np.ndarray:
+        """
+        Match scores of the candidates, rounded like match_score
+        
+        Adds the same terms in the same order as _score_hospital, so the
+        float sums are identical; scores at a half hundredth are rounded
+        with round() to match it there too.
+        
+        Args:
+            candidates: Hospital positions
+            distances: Their rounded distances (km)
+            specialties: Required specialties
+            urgency: Urgency level
+        
+        Returns:
+            Scores out of 100, 2 decimals
+        """
+        columns = self.hospital_columns
+        
+        # 1. Specialty match score (35 points)
+        if specialties:
+            masks = {}
+            matching = np.zeros(len(candidates))
+            for specialty in specialties:
+                if specialty not in masks:
+                    masks[specialty] = self._mask(self.specialty_bitsets.get(specialty, 0))[candidates]
+                matching += masks[specialty]
+            score = (matching / len(specialties)) * 35
+        else:
+            score = np.full(len(candidates), 20.0)
+        
+        # 2. Distance score (30 points) - closer is better
+        score = score + np.select(
+            [distances <= 2, distances <= 5, distances <= 10, distances <= 15, distances <= 20],
+            [30.0, 25.0, 20.0, 15.0, 10.0],
+            np.maximum(0, 30 - (distances - 20) * 2)
         )
         
-        logger.info(f"Ranked {len(ranked_hospitals)} hospitals, returning top 15")
+        # 3. Rating score (20 points)
+        score = score + (columns['rating'][candidates] / 5.0) * 20
         
-        # Return top 15 hospitals
-        return ranked_hospitals[:15]
+        # 4. Emergency availability bonus (15 points for HIGH urgency)
+        if urgency == 'HIGH':
+            score = score + np.where(columns['emergency'][candidates], 15.0, 0.0)
+        
+        # 5. 24/7 availability bonus (5 points)
+        score = score + np.where(columns['open_24_7'][candidates], 5.0, 0.0)
+        
+        hundredths = score * 100
+        rounded = np.rint(hundredths) / 100
+        for index in np.flatnonzero(np.abs(hundredths - np.floor(hundredths) - 0.5) < BOUNDARY_TOLERANCE).tolist():
+            rounded[index] = round(float(score[index]), 2)
+        return rounded
+    
+    @staticmethod
+    def _top_positions(candidates: np.ndarray, scores: np.ndarray, limit: int) -> np.ndarray:
+        """Positions of the `limit` best scores, ties in database order"""
+        if len(scores) > limit:
+            cutoff = np.partition(scores, len(scores) - limit)[len(scores) - limit]
+            keep = scores >= cutoff
+            candidates, scores = candidates[keep], scores[keep]
+        order = np.lexsort((candidates, -scores))
+        return candidates[order[:limit]]
     
     def find_emergency_hospitals(
         self,
@@ -149,33 +446,37 @@ class HospitalMatcher:
             user_location = {'lat': 12.9716, 'lng': 77.5946}
             logger.warning("Invalid location for emergency search, using default")
         
-        # Filter for emergency-enabled hospitals
-        emergency_hospitals = [
-            h for h in self.hospitals
-            if h.get('emergency_available', False)
-        ]
+        lat, lng = user_location['lat'], user_location['lng']
+        try:
+            if not (math.isfinite(lat) and math.isfinite(lng)):
+                raise ValueError(f"non-finite coordinates {lat}, {lng}")
+            nearest = self.emergency_index.nearest(lat, lng, max_results)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Error processing emergency search location: {e}")
+            return []
+        
+        if not nearest:
+            logger.info("No emergency-enabled hospitals to search")
+            return []
+        
+        # Results are ordered by distance rounded to 10 m, ties in database
+        # order, so hospitals just beyond the k-th nearest can still outrank
+        # it. Fetch everything up to the k-th hospital's rounded distance.
+        farthest = self._calculate_distance(lat, lng, *self._coordinates(self.hospitals[nearest[-1]]))
+        candidates = self.emergency_index.within(lat, lng, round(farthest, 2) + 0.01)
         
-        logger.info(f"Found {len(emergency_hospitals)} emergency-enabled hospitals")
+        logger.info(f"Found {len(candidates)} candidate emergency hospitals near the location")
         
         # Calculate distances
         hospitals_with_distance = []
-        for hospital in emergency_hospitals:
-            try:
-                distance = self._calculate_distance(
-                    user_location['lat'],
-                    user_location['lng'],
-                    hospital['location']['lat'],
-                    hospital['location']['lng']
-                )
-                
-                hospitals_with_distance.append({
-                    **hospital,
-                    'distance_km': round(distance, 2),
-                    'estimated_time_minutes': self._estimate_travel_time(distance, 'HIGH')
-                })
-            except Exception as e:
-                logger.error(f"Error processing emergency hospital: {e}")
-                continue
+        for position in sorted(candidates):
+            hospital = self.hospitals[position]
+            distance = self._calculate_distance(lat, lng, *self._coordinates(hospital))
+            hospitals_with_distance.append({
+                **hospital,
+                'distance_km': round(distance, 2),
+                'estimated_time_minutes': self._estimate_travel_time(distance, 'HIGH')
+            })
         
         # Sort by distance (nearest first)
         hospitals_with_distance.sort(key=lambda x: x['distance_km'])
@@ -197,10 +498,16 @@ class HospitalMatcher:
         
         # Filter by specialty (must have at least one matching specialty)
         if specialties:
-            filtered = [
-                h for h in filtered
-                if any(s in h.get('specialties', []) for s in specialties)
-            ]
+            if hospitals is self.hospitals:
+                bitset = 0
+                for specialty in specialties:
+                    bitset |= self.specialty_bitsets.get(specialty, 0)
+                filtered = self._hospitals_in(bitset)
+            else:
+                filtered = [
+                    h for h in filtered
+                    if any(s in h.get('specialties', []) for s in specialties)
+                ]
             logger.debug(f"After specialty filter: {len(filtered)} hospitals")
         
         # Filter by hospital type (Government/Private)
@@ -329,63 +636,7 @@ class HospitalMatcher:
         scored_hospitals = []
         
         for hospital in hospitals:
-            score = 0
-            score_breakdown = {}
-            
-            # 1. Specialty match score (35 points)
-            hospital_specialties = hospital.get('specialties', [])
-            if specialties:
-                matching_specialties = [
-                    s for s in specialties
-                    if s in hospital_specialties
-                ]
-                specialty_score = (len(matching_specialties) / len(specialties)) * 35
-                score += specialty_score
-                score_breakdown['specialty'] = round(specialty_score, 2)
-            else:
-                # Base score if no specific specialties
-                score += 20
-                score_breakdown['specialty'] = 20
-            
-            # 2. Distance score (30 points) - closer is better
-            distance = hospital['distance_km']
-            if distance <= 2:
-                distance_score = 30
-            elif distance <= 5:
-                distance_score = 25
-            elif distance <= 10:
-                distance_score = 20
-            elif distance <= 15:
-                distance_score = 15
-            elif distance <= 20:
-                distance_score = 10
-            else:
-                # Penalize distant hospitals
-                distance_score = max(0, 30 - (distance - 20) * 2)
-            
-            score += distance_score
-            score_breakdown['distance'] = round(distance_score, 2)
-            
-            # 3. Rating score (20 points)
-            rating = hospital.get('rating', 3.0)
-            rating_score = (rating / 5.0) * 20
-            score += rating_score
-            score_breakdown['rating'] = round(rating_score, 2)
-            
-            # 4. Emergency availability bonus (15 points for HIGH urgency)
-            if urgency == 'HIGH':
-                if hospital.get('emergency_available', False):
-                    score += 15
-                    score_breakdown['emergency'] = 15
-                else:
-                    score_breakdown['emergency'] = 0
-            
-            # 5. 24/7 availability bonus (5 points)
-            if hospital.get('open_24_7', False):
-                score += 5
-                score_breakdown['availability'] = 5
-            else:
-                score_breakdown['availability'] = 0
+            score, score_breakdown = self._score_hospital(hospital, specialties, urgency)
             
             # Add scored hospital to list
             scored_hospitals.append({
@@ -399,6 +650,78 @@ class HospitalMatcher:
         
         return scored_hospitals
     
+    def _score_hospital(
+        self,
+        hospital: Dict,
+        specialties: List[str],
+        urgency: str
+    ) -> Tuple[float, Dict]:
+        """
+        Match score of one hospital with distance data
+        
+        Returns:
+            The unrounded score out of 100 and its per-factor breakdown
+        """
+        score = 0
+        score_breakdown = {}
+        
+        # 1. Specialty match score (35 points)
+        hospital_specialties = hospital.get('specialties', [])
+        if specialties:
+            matching_specialties = [
+                s for s in specialties
+                if s in hospital_specialties
+            ]
+            specialty_score = (len(matching_specialties) / len(specialties)) * 35
+            score += specialty_score
+            score_breakdown['specialty'] = round(specialty_score, 2)
+        else:
+            # Base score if no specific specialties
+            score += 20
+            score_breakdown['specialty'] = 20
+        
+        # 2. Distance score (30 points) - closer is better
+        distance = hospital['distance_km']
+        if distance <= 2:
+            distance_score = 30
+        elif distance <= 5:
+            distance_score = 25
+        elif distance <= 10:
+            distance_score = 20
+        elif distance <= 15:
+            distance_score = 15
+        elif distance <= 20:
+            distance_score = 10
+        else:
+            # Penalize distant hospitals
+            distance_score = max(0, 30 - (distance - 20) * 2)
+        
+        score += distance_score
+        score_breakdown['distance'] = round(distance_score, 2)
+        
+        # 3. Rating score (20 points)
+        rating = hospital.get('rating', 3.0)
+        rating_score = (rating / 5.0) * 20
+        score += rating_score
+        score_breakdown['rating'] = round(rating_score, 2)
+        
+        # 4. Emergency availability bonus (15 points for HIGH urgency)
+        if urgency == 'HIGH':
+            if hospital.get('emergency_available', False):
+                score += 15
+                score_breakdown['emergency'] = 15
+            else:
+                score_breakdown['emergency'] = 0
+        
+        # 5. 24/7 availability bonus (5 points)
+        if hospital.get('open_24_7', False):
+            score += 5
+            score_breakdown['availability'] = 5
+        else:
+            score_breakdown['availability'] = 0
+        
+        return score, score_breakdown
+    
     def get_hospital_by_id(self, hospital_id: str) -> Optional[Dict]:
         """
         Get specific hospital details by ID
@@ -409,10 +732,11 @@ class HospitalMatcher:
         Returns:
             Hospital data or None if not found
         """
-        for hospital in self.hospitals:
-            if hospital.get('id') == hospital_id:
-                logger.info(f"Found hospital: {hospital.get('name')}")
-                return hospital
+        position = self.hospital_ids.get(hospital_id)
+        if position is not None:
+            hospital = self.hospitals[position]
+            logger.info(f"Found hospital: {hospital.get('name')}")
+            return hospital
         
         logger.warning(f"Hospital not found: {hospital_id}")
         return None
@@ -427,10 +751,7 @@ class HospitalMatcher:
         Returns:
             List of hospitals
         """
-        hospitals = [
-            h for h in self.hospitals
-            if specialty in h.get('specialties', [])
-        ]
+        hospitals = self._hospitals_in(self.specialty_bitsets.get(specialty, 0))
         logger.info(f"Found {len(hospitals)} hospitals with specialty: {specialty}")
         return hospitals
     
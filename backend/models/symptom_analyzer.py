@@ -1,44 +1,1022 @@
 from flask import current_app
+import copy
 import json
-import re
 import os
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
+from contextlib import contextmanager
 from datetime import datetime
+from functools import wraps
+from threading import Lock, local
+from types import SimpleNamespace
 import logging
+from models.symptom_record import SymptomMatch, SymptomRecord
 from utils.azure_openai_service import analyze_symptoms_with_azure_ai
+from utils.keyword_automaton import KeywordAutomaton
+from utils.knowledge_snapshot import (
+    DEFAULT_SNAPSHOT_PATH, code_fingerprint, load_snapshot_section, section_version, source_fingerprint
+)
+from utils.result_cache import LRUCache
+from utils.semantic_cache import SemanticCache
+from utils.stage_timing import stage
+from utils.suggest_index import SuggestionIndex
+from utils.symspell import SymSpellIndex
+from utils.tfidf_retriever import CharNgramRetriever
+from utils.triage_classifier import TriageClassifier, log_ai_outcome
+from utils.typing_session import MatchStream, TypingSession
+from utils.text_normalizer import (
+    WORD_PATTERN, is_kannada_script, negated_positions, normalize_term, normalize_text, tokenize
+)
+from utils.transliteration import phonetic_key, romanize_kannada
+from utils.word_list import load_word_list
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Language code -> symptom field holding the regional-language term. The
+# catalogue only has Kannada terms; Hindi and Tamil input is left to Azure
+# OpenAI until symptoms.json gains hindi/tamil fields.
+REGIONAL_TERM_FIELDS = {
+    'kn': 'kannada'
+}
+
+# Shortest keyword prefix that still counts as a shared token ("cough" in "coughing")
+MIN_TOKEN_PREFIX = 3
+
+# Match score tiers: whole-word keyword/term hit, partial hit, typo-corrected hit
+EXACT_MATCH_SCORE = 10
+PARTIAL_MATCH_SCORE = 7
+FUZZY_MATCH_SCORE = 5
+RETRIEVAL_MATCH_SCORE = 3
+
+# Typo correction: tokens shorter than this are never corrected, and tokens
+# of at least FUZZY_LONG_TOKEN characters may be two edits away when a
+# single keyword token is closest
+FUZZY_MIN_TOKEN_LENGTH = 4
+FUZZY_LONG_TOKEN = 8
+
+# Real words are never "corrected" into a symptom keyword ("sneezing" is not
+# a typo of "wheezing", nor "cash" of "rash")
+COMMON_WORDS_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'common_words.json')
+
+# Analysis result cache (keyed on cleaned text, language and dataset version)
+ANALYSIS_CACHE_SIZE = int(os.getenv('SYMPTOM_CACHE_SIZE', '1024'))
+ANALYSIS_CACHE_TTL_SECONDS = float(os.getenv('SYMPTOM_CACHE_TTL_SECONDS', '3600'))
+
+# TF-IDF retrieval fallback: minimum cosine similarity, and how close to the
+# best hit further hits must be to be reported alongside it
+RETRIEVAL_MIN_SCORE = float(os.getenv('SYMPTOM_RETRIEVAL_MIN_SCORE', '0.3'))
+RETRIEVAL_RELATIVE_SCORE = 0.85
+RETRIEVAL_TOP_K = 3
+
+# Text no keyword matched is triaged locally, without Azure OpenAI, when its
+# best retrieval hit is at least this similar and the classifier agrees
+RETRIEVAL_LOCAL_MIN_SCORE = float(os.getenv('SYMPTOM_RETRIEVAL_LOCAL_MIN_SCORE', '0.35'))
+
+# Qualifiers shared by catalogue keywords that say nothing about which
+# symptom is meant ("no problems" is not Urination Problems, "blocked nose"
+# not Choking). A retrieval hit needs a shared catalogue token other than
+# these, or a red flag named in the text.
+RETRIEVAL_GENERIC_TOKENS = frozenset([
+    'abnormal', 'acute', 'altered', 'attack', 'between', 'blocked', 'blow', 'changes',
+    'changing', 'chronic', 'clearly', 'complications', 'continuous', 'control', 'crack',
+    'dark', 'decreased', 'degree', 'difficulty', 'discomfort', 'double', 'down', 'during',
+    'emergency', 'energy', 'excessive', 'exposure', 'extreme', 'fast', 'fit', 'flashing',
+    'food', 'frequent', 'general', 'growth', 'hard', 'heavy', 'high', 'infrequent',
+    'intense', 'irregular', 'keep', 'lack', 'lights', 'loose', 'losing', 'loss', 'lower',
+    'move', 'movements', 'new', 'one', 'out', 'pass', 'passed', 'passing', 'persistent',
+    'pressure', 'problem', 'problems', 'productive', 'rapid', 'red', 'remember', 'seeing',
+    'sensation', 'severe', 'sharp', 'sick', 'sided', 'something', 'sound', 'spots',
+    'status', 'strength', 'stuck', 'sudden', 'suspicious', 'symptoms', 'taste', 'think',
+    'third', 'turn', 'unable', 'unbearable', 'uncontrolled', 'unexplained',
+    'unintentional', 'upset', 'worst', '102'
+])
+
+# Function words ignored when building retrieval queries
+RETRIEVAL_STOPWORDS = frozenset([
+    'have', 'having', 'with', 'since', 'from', 'there', 'their', 'they',
+    'this', 'that', 'what', 'when', 'very', 'much', 'some', 'also', 'been',
+    'feel', 'feeling', 'like', 'days', 'week', 'weeks', 'morning', 'night',
+    'today', 'yesterday', 'after', 'before', 'about', 'little', 'really',
+    'started', 'getting', 'sometimes', 'always', 'please', 'help', 'doctor',
+    'the', 'and', 'for', 'but', 'not', 'all', 'can', 'cannot', 'no', 'get', 'got',
+    'too', 'was', 'are', 'has', 'had', 'its', 'into', 'over', 'time', 'lot',
+    'i', 'a', 'my', 'me', 'is', 'am', 'it', 'in', 'on', 'of', 'to'
+])
+
+# Concurrent analyses (and therefore Azure calls) per batch request
+BATCH_MAX_WORKERS = int(os.getenv('SYMPTOM_BATCH_MAX_WORKERS', '8'))
+
+# How often analyze() checks symptoms.json for changes on disk
+DB_CHECK_INTERVAL_SECONDS = float(os.getenv('SYMPTOM_DB_CHECK_INTERVAL', '30'))
+
+# Local triage classifier artifact and the Azure OpenAI outcomes it learns from
+INSTANCE_DIR = os.path.join(os.path.dirname(__file__), '..', 'instance')
+TRIAGE_MODEL_PATH = os.getenv('TRIAGE_MODEL_PATH', os.path.join(INSTANCE_DIR, 'triage_classifier.json'))
+AI_OUTCOME_LOG_PATH = os.getenv('AI_OUTCOME_LOG_PATH', os.path.join(INSTANCE_DIR, 'ai_outcomes.jsonl'))
+
+# Outcome records contain the raw symptom text (health data), so logging is
+# opt-in; the log rotates to <path>.1 once it reaches AI_OUTCOME_LOG_MAX_BYTES
+AI_OUTCOME_LOGGING = os.getenv('AI_OUTCOME_LOGGING', 'false').lower() in ('1', 'true', 'yes')
+AI_OUTCOME_LOG_MAX_BYTES = int(os.getenv('AI_OUTCOME_LOG_MAX_BYTES', str(5 * 1024 * 1024)))
+
+# Queries with catalogue matches skip Azure OpenAI when the local classifier
+# agrees with the rule-based urgency at least this confidently
+LOCAL_TRIAGE_MIN_CONFIDENCE = float(os.getenv('LOCAL_TRIAGE_MIN_CONFIDENCE', '0.9'))
+
+# Race mode: when > 0, rule-based matching and Azure OpenAI run concurrently
+# and the rule result is returned if the AI answer misses this budget
+AI_LATENCY_BUDGET_MS = float(os.getenv('SYMPTOM_AI_LATENCY_BUDGET_MS', '0'))
+AI_MAX_WORKERS = int(os.getenv('SYMPTOM_AI_MAX_WORKERS', '8'))
+
+# Azure OpenAI answers, including answers that arrived late, reused for
+# reworded requests whose content words are at least this similar (Jaccard)
+AI_RESULT_CACHE_SIZE = int(os.getenv('SYMPTOM_AI_CACHE_SIZE', '2048'))
+AI_CACHE_SIMILARITY = {
+    'HIGH': float(os.getenv('SYMPTOM_AI_CACHE_SIMILARITY_HIGH', '0.9')),
+    'MEDIUM': float(os.getenv('SYMPTOM_AI_CACHE_SIMILARITY_MEDIUM', '0.8')),
+    'LOW': float(os.getenv('SYMPTOM_AI_CACHE_SIMILARITY_LOW', '0.7'))
+}
+
+# Derived state restored from / compiled into the knowledge snapshot
+SNAPSHOT_ATTRIBUTES = (
+    'symptoms_data', 'categories', 'symptom_positions', 'symptom_ids_by_name',
+    'symptoms_by_category', 'symptoms_by_specialty', 'category_payloads',
+    'matcher', 'token_index', 'spell_index', 'common_words', 'romanized_matcher',
+    'romanized_vocabulary', 'retriever', 'suggester', 'emergency_matcher', 'classifier',
+    'symptom_summaries', 'related_graph', 'specialty_names', 'specialty_rows'
+)
+
+# Classes and functions (beyond the analyzer's own module) that build or
+# make up the snapshot state; a snapshot compiled by other code is rebuilt
+SNAPSHOT_CODE = (
+    SymptomRecord, KeywordAutomaton, SymSpellIndex, CharNgramRetriever, SuggestionIndex,
+    TriageClassifier, normalize_text, romanize_kannada, load_word_list
+)
+
+# One loaded dataset: the snapshot state plus its version and the source
+# mtimes it was built from. They live on a single object, so a reload swaps
+# them all with one assignment.
+DATASET_ATTRIBUTES = SNAPSHOT_ATTRIBUTES + ('dataset_version', '_db_mtime')
+
+# Related-symptom graph: co-occurrence counts mined from search history by
+# scripts/mine_symptom_cooccurrence.py, plus a fixed weight for the edges
+# declared in related_symptoms. Mined-only edges need RELATED_MIN_COOCCURRENCE
+# searches; each symptom keeps its RELATED_MAX_NEIGHBOURS heaviest edges.
+COOCCURRENCE_PATH = os.getenv('SYMPTOM_COOCCURRENCE_PATH', os.path.join(INSTANCE_DIR, 'symptom_cooccurrence.json'))
+COOCCURRENCE_FORMAT_VERSION = 1
+RELATED_DECLARED_WEIGHT = 1
+RELATED_MIN_COOCCURRENCE = int(os.getenv('RELATED_MIN_COOCCURRENCE', '3'))
+RELATED_MAX_NEIGHBOURS = 10
+RELATED_SUGGESTION_LIMIT = 5
+
+# Symptom fields included in related-symptom lists
+RELATED_SUMMARY_FIELDS = ('id', 'name', 'kannada', 'urgency', 'urgency_score')
+
+# Emergency check latency budget: once spent, a check that already has an
+# emergency verdict skips the romanized pass; slower checks are logged.
+# It holds for inputs up to EMERGENCY_CHECK_MAX_CHARS (p99 about 0.15 ms at
+# 60 characters, 0.35 ms at 240 and 1.1 ms at 1000 on the bundled catalogue)
+EMERGENCY_CHECK_BUDGET_MS = float(os.getenv('EMERGENCY_CHECK_BUDGET_MS', '2'))
+
+# Lowest urgency score that is rated HIGH on its own
+HIGH_URGENCY_MIN_SCORE = 8
+
+# Red flags of at least this many words, listed only by HIGH-urgency
+# symptoms, make the emergency check positive without their symptom
+STANDALONE_RED_FLAG_MIN_WORDS = 2
+
+# Longest text the emergency check accepts, which bounds its worst case
+EMERGENCY_CHECK_MAX_CHARS = int(os.getenv('EMERGENCY_CHECK_MAX_CHARS', '1000'))
+
+# Urgency, specialties, description, first aid and red flags memoized per
+# matched-symptom set (cleared when the dataset is reloaded)
+AGGREGATION_CACHE_SIZE = int(os.getenv('SYMPTOM_AGGREGATION_CACHE_SIZE', '4096'))
+
+# As-you-type sessions: how many are kept, how long an idle one lives, and
+# the longest text a session accepts
+TYPING_SESSION_LIMIT = int(os.getenv('SYMPTOM_TYPING_SESSIONS', '10000'))
+TYPING_SESSION_TTL_SECONDS = float(os.getenv('SYMPTOM_TYPING_SESSION_TTL', '300'))
+TYPING_MAX_CHARS = 2000
+
+# Symptom fields returned for each matched symptom of a rule-based analysis
+# (match_score and matched_keywords are always included)
+MATCH_SUMMARY_FIELDS = (
+    'id', 'name', 'kannada', 'hindi', 'tamil', 'category', 'urgency', 'urgency_score', 'specialties'
+)
+
+# Number of specialties recommended per analysis
+SPECIALTY_LIMIT = 3
+
+# Symptom fields included in category browse payloads
+CATEGORY_SUMMARY_FIELDS = (
+    'id', 'name', 'kannada', 'hindi', 'tamil', 'urgency', 'urgency_score', 'specialties'
+)
+
+# Autocomplete: default and maximum number of suggestions, and the index
+# namespaces of plain terms and of romanized phonetic keys
+SUGGEST_DEFAULT_LIMIT = 8
+SUGGEST_MAX_LIMIT = 20
+SUGGEST_TERM_NAMESPACE = 't'
+SUGGEST_ROMANIZED_NAMESPACE = 'r'
+
+def _dataset_attribute(name):
+    """Property reading and writing `name` on the dataset the current thread uses"""
+    def get(self):
+        return getattr(getattr(self._local, 'dataset', None) or self._dataset, name)
+    
+    def set(self, value):
+        setattr(getattr(self._local, 'dataset', None) or self._dataset, name, value)
+    
+    return property(get, set)
+
+
+def _pins_dataset(method):
+    """Run a public method against one dataset even if a reload swaps it midway"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._pinned_dataset():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class SymptomAnalyzer:
     """Intelligent symptom analysis engine with multi-language support"""
     
-    def __init__(self, symptoms_db_path=None):
+    def __init__(self, symptoms_db_path=None, romanized_terms_path=None, snapshot_path=None):
+        data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
         if symptoms_db_path is None:
-            symptoms_db_path = os.path.join(
-                os.path.dirname(__file__), '..', 'data', 'symptoms.json'
-            )
+            symptoms_db_path = os.path.join(data_dir, 'symptoms.json')
+        if romanized_terms_path is None:
+            romanized_terms_path = os.path.join(data_dir, 'romanized_terms.json')
         self.symptoms_db_path = symptoms_db_path
-        self.symptoms_data = self._load_symptoms()
+        self.romanized_terms_path = romanized_terms_path
+        self.snapshot_path = DEFAULT_SNAPSHOT_PATH if snapshot_path is None else snapshot_path
+        self.code_version = code_fingerprint((type(self),) + SNAPSHOT_CODE)
+        self.result_cache = LRUCache(
+            maxsize=ANALYSIS_CACHE_SIZE,
+            ttl_seconds=ANALYSIS_CACHE_TTL_SECONDS
+        )
+        self.aggregation_cache = LRUCache(maxsize=AGGREGATION_CACHE_SIZE)
+        self.typing_sessions = LRUCache(
+            maxsize=TYPING_SESSION_LIMIT,
+            ttl_seconds=TYPING_SESSION_TTL_SECONDS
+        )
+        self.ai_result_cache = SemanticCache(
+            maxsize=AI_RESULT_CACHE_SIZE,
+            ttl_seconds=ANALYSIS_CACHE_TTL_SECONDS,
+            thresholds=AI_CACHE_SIMILARITY,
+            default_threshold=AI_CACHE_SIMILARITY['HIGH']
+        )
+        self._ai_executor = ThreadPoolExecutor(max_workers=AI_MAX_WORKERS, thread_name_prefix='azure-triage')
+        self._pending_ai_calls = {}
+        self._ai_lock = Lock()
+        self.race_stats = {'ai_won': 0, 'rules_won': 0, 'ai_timeouts': 0, 'ai_cache_hits': 0}
+        self.symptom_popularity = Counter()
+        # Request threads count selections while others rank suggestions
+        self._popularity_lock = Lock()
+        self._local = local()
+        self._reload_lock = Lock()
+        self._last_update_check = time.monotonic()
+        self._dataset = None
+        self._dataset = self._load_dataset()
         logger.info(f"SymptomAnalyzer initialized with {len(self.symptoms_data)} symptoms")
     
+    def _load_dataset(self):
+        """
+        Build the symptom database and its derived indexes (snapshot or JSON)
+        
+        The dataset is built off to the side, pinned to the calling thread,
+        while other threads keep serving the current one.
+        
+        Returns:
+            SimpleNamespace: The dataset, installed by assigning it to _dataset
+        """
+        dataset = SimpleNamespace()
+        with self._pinned_dataset(dataset):
+            self._db_mtime = self._get_db_mtime()
+            self.dataset_version = self._compute_dataset_version()
+            
+            state = load_snapshot_section(
+                self.snapshot_path, 'symptom_analyzer', self.snapshot_version(), SNAPSHOT_ATTRIBUTES
+            )
+            if state is not None:
+                for name in SNAPSHOT_ATTRIBUTES:
+                    setattr(self, name, state[name])
+                logger.info(f"Loaded symptom indexes from knowledge snapshot (version {self.dataset_version})")
+                self.classifier = self._load_classifier(fallback=self.classifier)
+                return dataset
+            
+            self.symptoms_data, self.categories = self._load_symptoms()
+            self._build_catalogue_indexes()
+            self.matcher = self._build_matcher()
+            self.token_index = self._build_token_index()
+            self.spell_index = self._build_spell_index()
+            self.common_words = load_word_list(COMMON_WORDS_PATH)
+            self.romanized_matcher, self.romanized_vocabulary = self._build_romanized_index()
+            self.retriever = self._build_retriever()
+            self.suggester = self._build_suggester()
+            self.emergency_matcher = self._build_emergency_matcher()
+            self.classifier = self._load_classifier()
+            self.symptom_summaries, self.related_graph = self._build_related_graph()
+            self.specialty_names, self.specialty_rows = self._build_specialty_rows()
+        return dataset
+    
+    @contextmanager
+    def _pinned_dataset(self, dataset=None):
+        """
+        Serve this thread from one dataset until the block exits
+        
+        Nested blocks keep the outer dataset unless one is given (a reload
+        pins the dataset it is building).
+        """
+        previous = getattr(self._local, 'dataset', None)
+        if dataset is None:
+            dataset = previous or self._dataset
+        self._local.dataset = dataset
+        try:
+            yield dataset
+        finally:
+            self._local.dataset = previous
+    
+    def _build_catalogue_indexes(self):
+        """
+        Build id, name, category and specialty lookups into symptoms_data
+        
+        Categories used by symptoms but missing from the top-level
+        `categories` block are appended to it. Browse responses for the
+        category list and for each category are serialized once here.
+        """
+        self.symptom_positions = {}
+        self.symptom_ids_by_name = {}
+        self.symptoms_by_category = {category: [] for category in self.categories}
+        self.symptoms_by_specialty = {}
+        
+        for index, symptom in enumerate(self.symptoms_data):
+            self.symptom_positions.setdefault(symptom.get('id'), index)
+            self.symptom_ids_by_name.setdefault(symptom.get('name'), symptom.get('id'))
+            if symptom.get('category'):
+                self.symptoms_by_category.setdefault(symptom['category'], []).append(index)
+            for specialty in symptom.get('specialties', []):
+                self.symptoms_by_specialty.setdefault(specialty, []).append(index)
+        
+        self.categories = list(self.symptoms_by_category)
+        
+        self.category_payloads = {
+            None: json.dumps({
+                'success': True,
+                'categories': self.categories,
+                'symptom_counts': {
+                    category: len(indexes) for category, indexes in self.symptoms_by_category.items()
+                }
+            })
+        }
+        for category, indexes in self.symptoms_by_category.items():
+            self.category_payloads[category] = json.dumps({
+                'success': True,
+                'category': category,
+                'symptoms': [
+                    {field: self.symptoms_data[index][field]
+                     for field in CATEGORY_SUMMARY_FIELDS if field in self.symptoms_data[index]}
+                    for index in indexes
+                ],
+                'total': len(indexes)
+            })
+    
+    @_pins_dataset
+    def snapshot_state(self):
+        """Dataset and derived indexes to compile into the knowledge snapshot"""
+        return {name: getattr(self, name) for name in SNAPSHOT_ATTRIBUTES}
+    
+    def snapshot_version(self):
+        """Snapshot section version: the data files plus the code that indexes them"""
+        return section_version(self.dataset_version, self.code_version)
+    
+    def _source_paths(self):
+        """Data files the analyzer is built from"""
+        return [self.symptoms_db_path, self.romanized_terms_path, COOCCURRENCE_PATH, COMMON_WORDS_PATH]
+    
+    def reload(self):
+        """
+        Reload the symptom database and invalidate cached analyses
+        
+        Requests keep using the current dataset while the new one is built,
+        then it is swapped in with a single assignment. Concurrent reloads
+        wait for each other.
+        """
+        with self._reload_lock:
+            self._swap_dataset()
+    
+    def _swap_dataset(self):
+        """Build and install a new dataset (the caller holds _reload_lock)"""
+        dataset = self._load_dataset()
+        self._dataset = dataset
+        self._last_update_check = time.monotonic()
+        self.result_cache.clear()
+        self.aggregation_cache.clear()
+        self.typing_sessions.clear()
+        logger.info(f"Symptom database reloaded (version {dataset.dataset_version})")
+    
+    def _get_db_mtime(self):
+        """Modification times of the data files (None for missing files)"""
+        mtimes = []
+        for path in self._source_paths():
+            try:
+                mtimes.append(os.path.getmtime(path))
+            except OSError:
+                mtimes.append(None)
+        return tuple(mtimes)
+    
+    def _compute_dataset_version(self):
+        """Short content hash of the data files"""
+        return source_fingerprint(self._source_paths())
+    
+    def _refresh_if_changed(self):
+        """Reload the database if the file changed (checked at most every interval)"""
+        now = time.monotonic()
+        if now - self._last_update_check < DB_CHECK_INTERVAL_SECONDS:
+            return
+        self._last_update_check = now
+        
+        if self._get_db_mtime() == self._dataset._db_mtime:
+            return
+        # Another thread is already reloading; keep serving the current dataset
+        if not self._reload_lock.acquire(blocking=False):
+            return
+        try:
+            if self._get_db_mtime() != self._dataset._db_mtime:
+                logger.info("Symptom database changed on disk, reloading")
+                self._swap_dataset()
+        finally:
+            self._reload_lock.release()
+    
+    def cache_stats(self):
+        """Hit/miss/eviction counters of the analysis cache"""
+        with self._ai_lock:
+            race_stats = dict(self.race_stats)
+        return {
+            **self.result_cache.stats(),
+            'dataset_version': self.dataset_version,
+            'aggregations': self.aggregation_cache.stats(),
+            'typing_sessions': self.typing_sessions.stats(),
+            'ai_results': self.ai_result_cache.stats(),
+            'ai_race': {'latency_budget_ms': AI_LATENCY_BUDGET_MS, **race_stats}
+        }
+    
     def _load_symptoms(self):
-        """Load symptoms database from JSON file"""
+        """
+        Load symptoms database from JSON file
+        
+        Returns:
+            tuple: (symptoms list, category names)
+        """
         try:
             with open(self.symptoms_db_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-                symptoms = data.get('symptoms', [])
-                logger.info(f"Successfully loaded {len(symptoms)} symptoms from database")
-                return symptoms
+                symptoms = [SymptomRecord(symptom) for symptom in data.get('symptoms', [])]
+                categories = data.get('categories', [])
+                logger.info(f"Successfully loaded {len(symptoms)} symptoms in {len(categories)} categories from database")
+                return symptoms, categories
         except FileNotFoundError:
             logger.error(f"Symptoms file not found: {self.symptoms_db_path}")
-            return []
+            return [], []
         except json.JSONDecodeError as e:
             logger.error(f"Error parsing symptoms JSON: {e}")
-            return []
+            return [], []
         except Exception as e:
             logger.error(f"Unexpected error loading symptoms: {e}")
+            return [], []
+    
+    def _build_matcher(self):
+        """Compile keywords and regional terms into a single automaton"""
+        matcher = KeywordAutomaton()
+        
+        for index, symptom in enumerate(self.symptoms_data):
+            # Regional-language terms: (symptom index, -1, term, language code)
+            for lang_code, field in REGIONAL_TERM_FIELDS.items():
+                term = symptom.get(field)
+                if term:
+                    term = normalize_term(term)
+                    matcher.add(term, (index, -1, term, lang_code))
+            
+            # English keywords: (symptom index, keyword position, keyword, 'en'),
+            # cleaned like user input ("blood in stool" is matched as "blood stool")
+            for position, keyword in enumerate(symptom.get('keywords', [])):
+                phrase = normalize_text(keyword)
+                if phrase:
+                    matcher.add(phrase, (index, position, keyword, 'en'))
+        
+        matcher.build()
+        logger.info(f"Compiled {matcher.pattern_count} symptom terms into keyword automaton")
+        return matcher
+    
+    def _build_token_index(self):
+        """Build token -> symptom indexes inverted index over keywords and terms"""
+        index = {}
+        
+        for symptom_index, symptom in enumerate(self.symptoms_data):
+            terms = list(symptom.get('keywords', []))
+            terms.extend(
+                symptom[field] for field in REGIONAL_TERM_FIELDS.values() if symptom.get(field)
+            )
+            for term in terms:
+                for token in tokenize(normalize_term(term)):
+                    index.setdefault(token, set()).add(symptom_index)
+        
+        logger.info(f"Built symptom token index with {len(index)} tokens")
+        return {token: frozenset(ids) for token, ids in index.items()}
+    
+    def _load_romanized_terms(self):
+        """Load curated romanized terms (symptom id -> list of terms)"""
+        try:
+            with open(self.romanized_terms_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('terms', {})
+        except FileNotFoundError:
+            logger.warning(f"Romanized terms file not found: {self.romanized_terms_path}")
+            return {}
+        except json.JSONDecodeError as e:
+            logger.error(f"Error parsing romanized terms JSON: {e}")
+            return {}
+    
+    def _build_romanized_index(self):
+        """
+        Compile romanized regional terms into an automaton over phonetic keys
+        
+        Terms come from transliterating each symptom's Kannada field plus
+        the curated table in romanized_terms.json. Curated terms made only
+        of English words are skipped: they belong in the keywords, and a
+        romanized hit lets a query skip Azure OpenAI.
+        
+        Returns:
+            tuple: (KeywordAutomaton, set of phonetic-key tokens)
+        """
+        curated_terms = self._load_romanized_terms()
+        matcher = KeywordAutomaton()
+        vocabulary = set()
+        
+        for index, symptom in enumerate(self.symptoms_data):
+            variants = []
+            for variant in curated_terms.get(symptom.get('id'), []):
+                if all(self._is_english_word(token) for token in tokenize(normalize_text(variant))):
+                    logger.warning(f"Skipping English romanized term '{variant}' of {symptom.get('id')}")
+                    continue
+                variants.append(variant)
+            if symptom.get('kannada'):
+                variants.append(romanize_kannada(normalize_term(symptom['kannada'])))
+            
+            for variant in variants:
+                key = self._romanized_key(normalize_text(variant))
+                if key:
+                    matcher.add(key, (index, variant))
+                    vocabulary.update(key.split())
+        
+        matcher.build()
+        logger.info(f"Compiled {matcher.pattern_count} romanized terms into phonetic automaton")
+        return matcher, vocabulary
+    
+    def _romanized_key(self, text):
+        """Phonetic key of normalized text; non-Latin words become separators"""
+        return ' '.join(
+            phonetic_key(token) if token.isascii() else '|'
+            for token in tokenize(text)
+        )
+    
+    def _is_english_word(self, token):
+        """Common English word or catalogue keyword word"""
+        return token in self.common_words or token in self.token_index
+    
+    def _has_transliterated_term(self, text):
+        """
+        True when the text names a romanized regional term through a word
+        that is not English ("pet dard", not "bad stomach ache")
+        
+        A phonetic key can coincide with an English word's, so a romanized
+        hit alone does not show the text was transliterated.
+        """
+        if not self._match_romanized(text):
+            return False
+        return any(
+            token.isascii() and not self._is_english_word(token)
+            and phonetic_key(token) in self.romanized_vocabulary
+            for token in tokenize(text)
+        )
+    
+    def _match_romanized(self, text):
+        """
+        Find romanized regional terms ("tale novu", "sir dard") in the text
+        
+        Returns:
+            dict: symptom index -> matched romanized term
+        """
+        hits = {}
+        for _, _, payload, whole_word in self.romanized_matcher.iter_matches(self._romanized_key(text)):
+            if whole_word:
+                index, variant = payload
+                hits.setdefault(index, variant)
+        return hits
+    
+    @_pins_dataset
+    def classifier_training_samples(self):
+        """
+        Catalogue training samples for the local triage classifier
+        
+        Returns:
+            list: (normalized text, urgency, specialties) for every symptom
+            name, keyword, regional term and curated romanized term
+        """
+        curated_terms = self._load_romanized_terms()
+        samples = []
+        
+        for symptom in self.symptoms_data:
+            texts = [symptom.get('name', ''), *symptom.get('keywords', [])]
+            texts += [symptom.get(field) for field in REGIONAL_TERM_FIELDS.values()]
+            texts += curated_terms.get(symptom.get('id'), [])
+            
+            for text in texts:
+                if text:
+                    samples.append((
+                        normalize_text(text),
+                        symptom.get('urgency'),
+                        symptom.get('specialties', [])
+                    ))
+        
+        return samples
+    
+    def _load_classifier(self, fallback=None):
+        """
+        Load the trained triage classifier
+        
+        Falls back to `fallback` (the catalogue-only model compiled into the
+        knowledge snapshot), then to training one from the catalogue.
+        """
+        classifier = TriageClassifier.load(TRIAGE_MODEL_PATH)
+        if classifier and classifier.metadata.get('dataset_version') == self.dataset_version:
+            logger.info(f"Loaded triage classifier trained at {classifier.metadata.get('trained_at')} "
+                       f"({classifier.metadata.get('sample_count')} samples)")
+            return classifier
+        
+        if fallback is not None:
+            return fallback
+        
+        if classifier:
+            logger.warning("Triage classifier artifact is stale, retraining from the catalogue")
+        
+        classifier = TriageClassifier().fit(self.classifier_training_samples(), self.dataset_version)
+        logger.info(f"Trained triage classifier on {classifier.metadata['sample_count']} catalogue samples")
+        return classifier
+    
+    def _build_suggester(self):
+        """Index names, keywords, regional terms and romanized terms for autocomplete"""
+        curated_terms = self._load_romanized_terms()
+        terms = []
+        
+        for symptom in self.symptoms_data:
+            symptom_id = symptom.get('id')
+            urgency_score = symptom.get('urgency_score', 1)
+            
+            for term in [symptom.get('name', ''), *symptom.get('keywords', [])]:
+                terms.append((SUGGEST_TERM_NAMESPACE, normalize_term(term), term, 'en', symptom_id, urgency_score))
+            
+            for lang_code, field in REGIONAL_TERM_FIELDS.items():
+                if symptom.get(field):
+                    terms.append((SUGGEST_TERM_NAMESPACE, normalize_term(symptom[field]), symptom[field],
+                                  lang_code, symptom_id, urgency_score))
+            
+            variants = list(curated_terms.get(symptom_id, []))
+            if symptom.get('kannada'):
+                variants.append(romanize_kannada(normalize_term(symptom['kannada'])))
+            for variant in variants:
+                key = self._romanized_key(normalize_text(variant))
+                terms.append((SUGGEST_ROMANIZED_NAMESPACE, key, variant, 'romanized', symptom_id, urgency_score))
+        
+        suggester = SuggestionIndex().build(terms)
+        logger.info(f"Built autocomplete index with {len(suggester)} keys")
+        return suggester
+    
+    def _build_emergency_matcher(self):
+        """
+        Compile symptom terms and red flags for the emergency check
+        
+        Each distinct phrase is added once with the payload (symptom indexes,
+        (symptom index, red flag) pairs, standalone), so a phrase shared by
+        many symptoms costs one hit and one boundary check per occurrence.
+        Terms and red flags are cleaned like user input, which drops short
+        words and punctuation. A red flag is standalone when it has at least
+        STANDALONE_RED_FLAG_MIN_WORDS words and only HIGH-urgency symptoms
+        list it ("Not breathing"), as opposed to qualifiers such as "Fever"
+        or "Sweating".
+        """
+        term_symptoms = {}
+        flag_symptoms = {}
+        
+        for index, symptom in enumerate(self.symptoms_data):
+            terms = [symptom.get('name', ''), *symptom.get('keywords', [])]
+            terms += [symptom.get(field) for field in REGIONAL_TERM_FIELDS.values()]
+            for term in terms:
+                phrase = normalize_text(term)
+                if phrase:
+                    term_symptoms.setdefault(phrase, {})[index] = None
+            
+            for flag in symptom.get('red_flags', []):
+                if flag:
+                    flag_symptoms.setdefault(normalize_text(flag), {})[(index, flag)] = None
+        
+        matcher = KeywordAutomaton()
+        for phrase in term_symptoms.keys() | flag_symptoms.keys():
+            flags = tuple(flag_symptoms.get(phrase, ()))
+            standalone = bool(flags) and len(tokenize(phrase)) >= STANDALONE_RED_FLAG_MIN_WORDS and all(
+                self.symptoms_data[index].get('urgency') == 'HIGH' for index, _ in flags
+            )
+            matcher.add(phrase, (tuple(term_symptoms.get(phrase, ())), flags, standalone))
+        
+        matcher.build()
+        logger.info(f"Compiled {matcher.pattern_count} terms and red flags into emergency matcher")
+        return matcher
+    
+    def _load_cooccurrence(self):
+        """
+        Load symptom co-occurrence counts mined from search history
+        
+        Returns:
+            dict: (symptom id, symptom id) -> number of searches matching both,
+            each pair stored once with the ids in sorted order
+        """
+        try:
+            with open(COOCCURRENCE_PATH, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not read symptom co-occurrence counts: {e}")
+            return {}
+        
+        if data.get('format_version') != COOCCURRENCE_FORMAT_VERSION:
+            logger.warning("Ignoring symptom co-occurrence counts of another format")
+            return {}
+        
+        return {tuple(sorted((a, b))): count for a, b, count in data.get('pairs', [])}
+    
+    def _resolve_related_terms(self):
+        """
+        Resolve every symptom's related_symptoms strings to symptom indexes
+        
+        A string resolves to the symptom whose name or keyword it equals, or
+        else to the one symptom whose name or keyword contains all of its
+        words with the fewest extra words ("fever" -> High Fever). Strings
+        that are ambiguous ("pain") or name nothing in the catalogue are
+        left unresolved.
+        
+        Returns:
+            list: Resolved symptom indexes per symptom, in declared order
+        """
+        exact = {}
+        postings = {}
+        for index, symptom in enumerate(self.symptoms_data):
+            for term in [symptom.get('name', ''), *symptom.get('keywords', [])]:
+                term = normalize_term(term)
+                if not term:
+                    continue
+                exact.setdefault(term, index)
+                words = frozenset(term.split())
+                for word in words:
+                    postings.setdefault(word, []).append((words, index))
+        
+        resolved_terms = {}
+        resolved = []
+        unresolved = 0
+        for index, symptom in enumerate(self.symptoms_data):
+            neighbours = []
+            for term in symptom.get('related_symptoms', []):
+                term = normalize_term(term)
+                if term not in resolved_terms:
+                    resolved_terms[term] = exact.get(term)
+                    words = frozenset(term.split())
+                    if resolved_terms[term] is None and words:
+                        # Scan the shortest posting list for terms containing every word
+                        extra_words = {}
+                        for candidate, candidate_index in min((postings.get(w, []) for w in words), key=len):
+                            if words <= candidate:
+                                extra = len(candidate) - len(words)
+                                if extra < extra_words.get(candidate_index, extra + 1):
+                                    extra_words[candidate_index] = extra
+                        if extra_words:
+                            fewest = min(extra_words.values())
+                            best = [i for i, extra in extra_words.items() if extra == fewest]
+                            if len(best) == 1:
+                                resolved_terms[term] = best[0]
+                
+                neighbour = resolved_terms[term]
+                if neighbour is None or neighbour == index:
+                    unresolved += neighbour is None
+                    continue
+                if neighbour not in neighbours:
+                    neighbours.append(neighbour)
+            resolved.append(neighbours)
+        
+        if unresolved:
+            logger.info(f"{unresolved} related_symptoms entries name no catalogue symptom")
+        return resolved
+    
+    def _build_related_graph(self):
+        """
+        Build the weighted related-symptom adjacency index
+        
+        Edge weight is the number of searches that matched both symptoms,
+        plus RELATED_DECLARED_WEIGHT when the catalogue lists the neighbour
+        in related_symptoms.
+        
+        Returns:
+            tuple: (summary dict per symptom position, tuple of
+            (neighbour position, weight) per symptom position, heaviest first)
+        """
+        summaries = [
+            {field: symptom[field] for field in RELATED_SUMMARY_FIELDS if field in symptom}
+            for symptom in self.symptoms_data
+        ]
+        
+        weights = [Counter() for _ in self.symptoms_data]
+        for index, neighbours in enumerate(self._resolve_related_terms()):
+            for neighbour in neighbours:
+                weights[index][neighbour] += RELATED_DECLARED_WEIGHT
+        
+        mined_edges = 0
+        for (a, b), count in self._load_cooccurrence().items():
+            index_a = self.symptom_positions.get(a)
+            index_b = self.symptom_positions.get(b)
+            if index_a is None or index_b is None or index_a == index_b:
+                continue
+            # Mined counts only strengthen declared edges unless they are frequent
+            for index, neighbour in ((index_a, index_b), (index_b, index_a)):
+                if neighbour in weights[index] or count >= RELATED_MIN_COOCCURRENCE:
+                    weights[index][neighbour] += count
+                    mined_edges += 1
+        
+        graph = [
+            tuple(sorted(
+                edges.items(),
+                key=lambda edge: (-edge[1], -self.symptoms_data[edge[0]].get('urgency_score', 0), edge[0])
+            )[:RELATED_MAX_NEIGHBOURS])
+            for edges in weights
+        ]
+        logger.info(f"Built related-symptom graph with {sum(map(len, graph))} edges "
+                   f"({mined_edges} weighted by search history)")
+        return summaries, graph
+    
+    def _build_specialty_rows(self):
+        """
+        Build the sparse symptom -> specialty rows used to rank specialties
+        
+        Specialty names are interned to column ids in order of first use.
+        A symptom lists a handful of the catalogue's specialties, so each
+        row keeps only those: its distinct specialties in the order the
+        symptom lists them, with how often it lists each.
+        
+        Returns:
+            tuple: (specialty name per column, per symptom a tuple of
+            (column, count) pairs)
+        """
+        columns = {}
+        rows = []
+        for symptom in self.symptoms_data:
+            counts = {}
+            for specialty in symptom.get('specialties', []):
+                column = columns.setdefault(specialty, len(columns))
+                counts[column] = counts.get(column, 0) + 1
+            rows.append(tuple(counts.items()))
+        
+        logger.info(f"Built symptom -> specialty rows: {len(rows)} symptoms, {len(columns)} specialties")
+        return tuple(columns), tuple(rows)
+    
+    def _build_retriever(self):
+        """Fit the character n-gram TF-IDF index over names, keywords and descriptions"""
+        documents = [
+            normalize_text(' '.join(
+                [symptom.get('name', ''), *symptom.get('keywords', [])] + [symptom.get('description', '')]
+            ))
+            for symptom in self.symptoms_data
+        ]
+        retriever = CharNgramRetriever().fit(documents)
+        logger.info(f"Built TF-IDF retrieval index with {len(retriever.vocabulary)} n-grams")
+        return retriever
+    
+    def _retrieve_symptoms(self, text):
+        """
+        Closest catalogue symptoms by TF-IDF similarity, for text no keyword matched
+        
+        Character n-grams alone also find "rash" in "I paid cash", so a hit
+        is kept only when the text shares a non-negated catalogue token of
+        that symptom (other than RETRIEVAL_GENERIC_TOKENS) or names one of
+        its red flags or a standalone red flag.
+        """
+        tokens = tokenize(text)
+        query = ' '.join(token for token in tokens if token not in RETRIEVAL_STOPWORDS)
+        results = self.retriever.query(query, top_k=RETRIEVAL_TOP_K, min_score=RETRIEVAL_MIN_SCORE)
+        if not results:
             return []
+        
+        supported = self._token_symptoms(tokens)
+        results = [
+            (index, score) for index, score in results
+            if index in supported or self._names_red_flag(text, {index})
+        ]
+        if not results:
+            logger.info("Retrieval hits share no symptom term with the text, ignoring them")
+            return []
+        
+        best_score = results[0][1]
+        return [
+            SymptomMatch(self.symptoms_data[index], RETRIEVAL_MATCH_SCORE, [], similarity=round(score, 3))
+            for index, score in results
+            if score >= best_score * RETRIEVAL_RELATIVE_SCORE
+        ]
     
+    def _token_symptoms(self, tokens):
+        """Symptoms whose catalogue tokens the text uses outside a negation"""
+        token_index = self.token_index
+        negated = negated_positions(tokens)
+        symptoms = set()
+        for position, token in enumerate(tokens):
+            if position in negated or token in RETRIEVAL_STOPWORDS or token in RETRIEVAL_GENERIC_TOKENS:
+                continue
+            if token in token_index:
+                symptoms.update(token_index[token])
+                continue
+            # Inflected forms ("coughs", "vomited")
+            for length in range(len(token) - 1, MIN_TOKEN_PREFIX - 1, -1):
+                if token[:length] in token_index and token[:length] not in RETRIEVAL_GENERIC_TOKENS:
+                    symptoms.update(token_index[token[:length]])
+                    break
+        return symptoms
+    
+    def _build_spell_index(self):
+        """Precompute the typo-correction deletes index over English keyword tokens"""
+        spell_index = SymSpellIndex(max_edit_distance=2)
+        
+        for symptom in self.symptoms_data:
+            for keyword in symptom.get('keywords', []):
+                for token in tokenize(normalize_term(keyword)):
+                    if len(token) >= FUZZY_MIN_TOKEN_LENGTH and token.isascii():
+                        spell_index.add_word(token)
+        
+        logger.info(f"Built typo index: {len(spell_index)} words, "
+                   f"{spell_index.delete_count} delete keys")
+        return spell_index
+    
+    def _correct_typos(self, text):
+        """
+        Replace unknown tokens with their closest keyword token
+        
+        Keyword tokens, common English words (and their inflections) and
+        romanized regional terms are left alone. Tokens are corrected one
+        edit away, or two for tokens of FUZZY_LONG_TOKEN characters and
+        more when exactly one keyword token is closest.
+        
+        Returns:
+            tuple: (corrected text, {typo: correction}) - the mapping is
+            empty when nothing was corrected
+        """
+        corrections = {}
+        
+        for token in set(tokenize(text)):
+            if (len(token) < FUZZY_MIN_TOKEN_LENGTH or not token.isascii()
+                    or token in self.token_index or token in self.common_words
+                    or phonetic_key(token) in self.romanized_vocabulary):
+                continue
+            
+            if len(token) >= FUZZY_LONG_TOKEN:
+                correction = self.spell_index.lookup(token, 2, unique=True)
+            else:
+                correction = self.spell_index.lookup(token, 1)
+            if correction:
+                corrections[token] = correction[0]
+        
+        if not corrections:
+            return text, corrections
+        
+        corrected = WORD_PATTERN.sub(lambda m: corrections.get(m.group(0), m.group(0)), text)
+        return corrected, corrections
+    
+    def _candidate_symptoms(self, text):
+        """Return indexes of symptoms sharing at least one token with the text"""
+        candidates = set()
+        token_index = self.token_index
+        
+        for token in set(tokenize(text)):
+            postings = token_index.get(token)
+            if postings:
+                candidates.update(postings)
+            
+            # Inflected forms ("fevers", "coughing") share a keyword prefix
+            for length in range(MIN_TOKEN_PREFIX, len(token)):
+                postings = token_index.get(token[:length])
+                if postings:
+                    candidates.update(postings)
+        
+        return candidates
+    
+    @_pins_dataset
     def analyze(self, text, language='en'):
         """
         Main analysis function
@@ -59,96 +1037,463 @@ class SymptomAnalyzer:
                 'symptom_details': []
             }
         """
-        logger.info(f"Analyzing symptoms: '{text[:50]}...' (language: {language})")
+        logger.info(f"Analyzing symptoms: '{text[:50]}...' (language: {language})")
+        
+        # Clean and prepare text
+        with stage('clean'):
+            cleaned_text = self._clean_text(text)
+        
+        if not cleaned_text:
+            logger.warning("Empty text provided for analysis")
+            return self._empty_result()
+        
+        # Serve repeated queries from the cache
+        self._refresh_if_changed()
+        cache_key = (cleaned_text, language, self.dataset_version)
+        cached_result = self.result_cache.get(cache_key)
+        if cached_result is not None:
+            logger.info("Serving symptom analysis from cache")
+            self._record_popularity(cached_result)
+            return self._fresh_copy(cached_result)
+        
+        result = self._analyze_cleaned(cleaned_text, language)
+        result['you_may_also_have'] = self._related_suggestions(result)
+        self._record_popularity(result)
+        
+        # A rule result that beat a slow AI call is not cached, so the next
+        # request picks up the AI answer once it lands
+        if not result.get('race', {}).get('ai_timed_out'):
+            self.result_cache.set(cache_key, result)
+        return self._fresh_copy(result)
+    
+    def analyze_batch(self, texts, language='en', max_workers=None, postprocess=None):
+        """
+        Analyze many symptom descriptions concurrently
+        
+        Descriptions that are identical after cleaning are analyzed once.
+        Results are yielded as each analysis completes, not in input order.
+        
+        Args:
+            texts (list): Symptom descriptions
+            language (str): Language code (en, kn, hi, ta)
+            max_workers (int): Concurrent analyses, defaults to BATCH_MAX_WORKERS
+            postprocess (callable): Applied to each result inside its worker
+                (e.g. translation), so slow per-result calls overlap too
+        
+        Yields:
+            tuple: (index into texts, result dict or None if analysis failed)
+        """
+        groups = {}
+        for index, text in enumerate(texts):
+            groups.setdefault(self._clean_text(text), []).append(index)
+        
+        if not groups:
+            return
+        
+        workers = max(1, min(max_workers or BATCH_MAX_WORKERS, len(groups)))
+        logger.info(f"Analyzing batch of {len(texts)} descriptions "
+                   f"({len(groups)} unique, {workers} workers)")
+        
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='symptom-batch')
+        try:
+            futures = {
+                executor.submit(self._analyze_batch_item, texts[indexes[0]], language, postprocess): indexes
+                for indexes in groups.values()
+            }
+            
+            for future in as_completed(futures):
+                indexes = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Batch analysis failed for item {indexes[0]}: {e}")
+                    result = None
+                
+                for position, index in enumerate(indexes):
+                    if result is None or position == 0:
+                        yield index, result
+                    else:
+                        yield index, self._fresh_copy(result)
+        finally:
+            # Consumer may stop early (e.g. client disconnected mid-stream)
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _analyze_batch_item(self, text, language, postprocess):
+        """One batch analysis, post-processed in the worker thread"""
+        result = self.analyze(text, language)
+        if postprocess is not None:
+            result = postprocess(result)
+        return result
+    
+    def _matched_symptom_ids(self, result):
+        """Ids of a result's matched symptoms (rule results hold dicts, AI results names)"""
+        symptom_ids = []
+        for symptom in result.get('matched_symptoms', []):
+            if isinstance(symptom, dict):
+                symptom_id = symptom.get('id')
+            else:
+                symptom_id = self.symptom_ids_by_name.get(symptom)
+            if symptom_id:
+                symptom_ids.append(symptom_id)
+        return symptom_ids
+    
+    def _record_popularity(self, result):
+        """Count matched symptoms, used to rank autocomplete suggestions"""
+        symptom_ids = self._matched_symptom_ids(result)
+        with self._popularity_lock:
+            for symptom_id in symptom_ids:
+                self.symptom_popularity[symptom_id] += 1
+    
+    def _related_suggestions(self, result, limit=RELATED_SUGGESTION_LIMIT):
+        """
+        "You may also have" list for an analysis result
+        
+        Sums the edge weights from every matched symptom in the related
+        graph, leaving out symptoms that were matched themselves.
+        
+        Returns:
+            list: Symptom summaries, most strongly related first
+        """
+        matched = {self.symptom_positions.get(symptom_id) for symptom_id in self._matched_symptom_ids(result)}
+        matched.discard(None)
+        
+        weights = Counter()
+        for index in matched:
+            for neighbour, weight in self.related_graph[index]:
+                if neighbour not in matched:
+                    weights[neighbour] += weight
+        
+        ranked = sorted(
+            weights.items(),
+            key=lambda edge: (-edge[1], -self.symptoms_data[edge[0]].get('urgency_score', 0), edge[0])
+        )
+        return [dict(self.symptom_summaries[index]) for index, _ in ranked[:limit]]
+    
+    def _fresh_copy(self, result):
+        """Copy a cached result so callers can mutate it, with a new timestamp"""
+        result = copy.deepcopy(result)
+        result['timestamp'] = datetime.utcnow().isoformat()
+        return result
+    
+    def _analyze_cleaned(self, cleaned_text, language):
+        """Run local, AI and rule-based analysis on already-cleaned text"""
+        with stage('match'):
+            matched_symptoms = self._match_symptoms(cleaned_text, language)
+        
+        # Kannada-script queries, and transliterated Kannada or Hindi ones,
+        # that match catalogue terms are answered locally
+        if matched_symptoms and (is_kannada_script(cleaned_text) or self._has_transliterated_term(cleaned_text)):
+            logger.info("Regional-language symptoms matched locally, skipping Azure OpenAI")
+            return self._rule_based_result(matched_symptoms)
+        
+        # Text no keyword matched is compared with the closest catalogue
+        # symptoms instead
+        retrieved = [] if matched_symptoms else self._retrieve_symptoms(cleaned_text)
+        
+        # Confident local triage that agrees with the rules needs no cloud
+        # call, provided the model learnt from Azure OpenAI outcomes (a
+        # catalogue-only model just echoes the rules) and no matched term
+        # is negated ("I don't have chest pain")
+        if self.classifier.trained_on_outcomes and \
+                (matched_symptoms or (retrieved and retrieved[0].similarity >= RETRIEVAL_LOCAL_MIN_SCORE)) and \
+                not self._negates_catalogue_term(cleaned_text):
+            prediction = self.classifier.predict(cleaned_text)
+            if prediction and prediction['confidence'] >= LOCAL_TRIAGE_MIN_CONFIDENCE:
+                if matched_symptoms:
+                    result = self._rule_based_result(matched_symptoms)
+                else:
+                    result = self._retrieval_result(cleaned_text, retrieved)
+                if result['urgency_level'] == prediction['urgency']:
+                    logger.info(f"Local triage confident ({prediction['confidence']:.3f}), skipping Azure OpenAI")
+                    result['triage_source'] = 'local_model'
+                    result['local_confidence'] = round(prediction['confidence'], 3)
+                    return result
+        
+        # Azure OpenAI answer for the same or a reworded text, possibly one
+        # that arrived after a previous request had given up on it. Never
+        # below what the rules already found, and never for wording that
+        # adds or drops a symptom term
+        rule_urgency = self._rule_based_result(matched_symptoms)['urgency_level'] if matched_symptoms else None
+        cached = self.ai_result_cache.get(
+            self._content_tokens(cleaned_text),
+            min_urgency=rule_urgency,
+            protected=self._is_catalogue_token
+        )
+        if cached is not None:
+            ai_result, similarity = cached
+            logger.info(f"Serving Azure OpenAI answer from cache (similarity {similarity:.2f})")
+            self._count_race('ai_cache_hits')
+            result = self._ai_based_result(ai_result, matched_symptoms)
+            result['ai_cache_similarity'] = round(similarity, 3)
+            return result
+        
+        if AI_LATENCY_BUDGET_MS > 0:
+            return self._race_ai_and_rules(cleaned_text, matched_symptoms, retrieved)
+        
+        # Try Azure OpenAI for intelligent analysis
+        ai_result = self._call_azure(cleaned_text)
+        if ai_result:
+            return self._ai_based_result(ai_result, matched_symptoms)
+        
+        # Fallback to rule-based analysis
+        return self._rule_fallback_result(cleaned_text, matched_symptoms, retrieved)
+    
+    def _race_ai_and_rules(self, cleaned_text, matched_symptoms, retrieved=None):
+        """
+        Run Azure OpenAI and the rule engine concurrently under the latency budget
         
-        # Clean and prepare text
-        cleaned_text = self._clean_text(text)
+        The rule result is built while the AI call is in flight. If the AI
+        answer misses the budget the rule result wins; the AI call keeps
+        running and its answer is cached for the next identical request.
+        """
+        started = time.perf_counter()
+        future = self._submit_ai_call(cleaned_text)
+        rule_result = self._rule_fallback_result(cleaned_text, matched_symptoms, retrieved)
         
-        if not cleaned_text:
-            logger.warning("Empty text provided for analysis")
-            return self._empty_result()
+        remaining = AI_LATENCY_BUDGET_MS / 1000 - (time.perf_counter() - started)
+        ai_result = None
+        timed_out = False
+        try:
+            with stage('azure'):
+                ai_result = future.result(timeout=max(0.0, remaining))
+        except FutureTimeoutError:
+            timed_out = True
+            logger.info(f"Azure OpenAI missed the {AI_LATENCY_BUDGET_MS:.0f} ms budget, using rule-based result")
+        
+        if ai_result:
+            result = self._ai_based_result(ai_result, matched_symptoms)
+            winner = 'azure_openai'
+        else:
+            result = rule_result
+            winner = 'rule_based'
+        
+        self._count_race('ai_won' if winner == 'azure_openai' else 'rules_won')
+        if timed_out:
+            self._count_race('ai_timeouts')
+        
+        result['race'] = {
+            'winner': winner,
+            'ai_timed_out': timed_out,
+            'budget_ms': AI_LATENCY_BUDGET_MS,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)
+        }
+        return result
+    
+    def _submit_ai_call(self, cleaned_text):
+        """Start (or join an in-flight) background Azure OpenAI call for the text"""
+        with self._ai_lock:
+            future = self._pending_ai_calls.get(cleaned_text)
+            if future is None:
+                future = self._ai_executor.submit(self._call_azure, cleaned_text)
+                self._pending_ai_calls[cleaned_text] = future
+                future.add_done_callback(lambda _, key=cleaned_text: self._finish_ai_call(key))
+        return future
+    
+    def _finish_ai_call(self, cleaned_text):
+        with self._ai_lock:
+            self._pending_ai_calls.pop(cleaned_text, None)
+    
+    def _count_race(self, counter):
+        with self._ai_lock:
+            self.race_stats[counter] += 1
+    
+    def _call_azure(self, cleaned_text):
+        """
+        Call Azure OpenAI, caching and logging successful answers
         
-        # Try Azure OpenAI first for intelligent analysis
+        Returns:
+            dict: AI answer with urgency, specialties and explanation, or None
+        """
         ai_result = None
         try:
             logger.info("Attempting Azure OpenAI analysis...")
-            ai_result = analyze_symptoms_with_azure_ai(cleaned_text)
+            with stage('azure'):
+                ai_result = analyze_symptoms_with_azure_ai(cleaned_text)
             if ai_result:
                 logger.info(f"Azure OpenAI analysis successful: urgency={ai_result.get('urgency')}")
         except Exception as e:
             logger.warning(f"Azure OpenAI analysis failed, falling back to rule-based: {e}")
         
-        # If AI analysis succeeded, combine with rule-based first aid
-        if ai_result and ai_result.get('urgency'):
-            # Match symptoms for first aid tips
-            matched_symptoms = self._match_symptoms(cleaned_text, language)
-            
-            # Map AI urgency to score
-            urgency_map = {'HIGH': 9, 'MEDIUM': 5, 'LOW': 2}
-            urgency_score = urgency_map.get(ai_result['urgency'], 5)
-            
-            # Collect first aid and red flags from rule-based system
-            first_aid = self._collect_first_aid(matched_symptoms) if matched_symptoms else ['Rest and monitor symptoms', 'Stay hydrated']
-            red_flags = self._collect_red_flags(matched_symptoms) if matched_symptoms else []
-            
-            result = {
-                'urgency_level': ai_result['urgency'],
-                'urgency_score': urgency_score,
-                'matched_symptoms': [s['name'] for s in matched_symptoms] if matched_symptoms else [],
-                'recommended_specialties': ai_result.get('specialties', ['General Medicine']),
-                'recommendation': ai_result.get('explanation', 'Please consult a healthcare professional.'),
-                'first_aid_tips': first_aid,
-                'red_flags': red_flags,
-                'ai_powered': True,
-                'timestamp': datetime.utcnow().isoformat()
-            }
-            
-            logger.info(f"AI-powered analysis complete: Urgency={ai_result['urgency']}, Specialties={ai_result.get('specialties')}")
-            return result
+        if not ai_result or not ai_result.get('urgency'):
+            return None
         
-        # Fallback to rule-based analysis
+        self.ai_result_cache.set(self._content_tokens(cleaned_text), ai_result, ai_result['urgency'])
+        
+        # Outcomes become training data for the local classifier
+        if AI_OUTCOME_LOGGING and AI_OUTCOME_LOG_PATH:
+            log_ai_outcome(AI_OUTCOME_LOG_PATH, cleaned_text, ai_result['urgency'],
+                           ai_result.get('specialties', ['General Medicine']),
+                           max_bytes=AI_OUTCOME_LOG_MAX_BYTES)
+        return ai_result
+    
+    def _is_catalogue_token(self, token):
+        """Whether a token is, or inflects, a symptom keyword or term"""
+        token_index = self.token_index
+        if token in token_index:
+            return True
+        return any(token[:length] in token_index for length in range(MIN_TOKEN_PREFIX, len(token)))
+    
+    def _negates_catalogue_term(self, cleaned_text):
+        """Whether a negation cue precedes a symptom keyword or term in the text"""
+        tokens = tokenize(cleaned_text)
+        return any(self._is_catalogue_token(tokens[position]) for position in negated_positions(tokens))
+    
+    def _content_tokens(self, cleaned_text):
+        """Content words of the text, the key of the AI answer cache"""
+        tokens = tokenize(cleaned_text)
+        return frozenset(token for token in tokens if token not in RETRIEVAL_STOPWORDS) or frozenset(tokens)
+    
+    def _ai_based_result(self, ai_result, matched_symptoms):
+        """Combine an Azure OpenAI answer with rule-based first aid and red flags"""
+        # Map AI urgency to score
+        urgency_map = {'HIGH': 9, 'MEDIUM': 5, 'LOW': 2}
+        urgency_score = urgency_map.get(ai_result['urgency'], 5)
+        
+        # Collect first aid and red flags from rule-based system
+        if matched_symptoms:
+            aggregate = self._aggregate(matched_symptoms)
+            first_aid = list(aggregate['first_aid_tips'])
+            red_flags = list(aggregate['red_flags'])
+        else:
+            first_aid = ['Rest and monitor symptoms', 'Stay hydrated']
+            red_flags = []
+        
+        result = {
+            'urgency_level': ai_result['urgency'],
+            'urgency_score': urgency_score,
+            'matched_symptoms': [s['name'] for s in matched_symptoms] if matched_symptoms else [],
+            'recommended_specialties': ai_result.get('specialties', ['General Medicine']),
+            'recommendation': ai_result.get('explanation', 'Please consult a healthcare professional.'),
+            'first_aid_tips': first_aid,
+            'red_flags': red_flags,
+            'ai_powered': True,
+            'triage_source': 'azure_openai',
+            'timestamp': datetime.utcnow().isoformat()
+        }
+        
+        logger.info(f"AI-powered analysis complete: Urgency={ai_result['urgency']}, Specialties={ai_result.get('specialties')}")
+        return result
+    
+    def _rule_fallback_result(self, cleaned_text, matched_symptoms, retrieved=None):
+        """
+        Rule-based result, falling back to TF-IDF retrieval when no keyword matched
+        
+        Args:
+            cleaned_text (str): Cleaned input text
+            matched_symptoms (list): Keyword matches
+            retrieved (list): Retrieval hits already computed for the text, if any
+        """
         logger.info("Using rule-based analysis")
-        # Match symptoms
-        matched_symptoms = self._match_symptoms(cleaned_text, language)
         
-        if not matched_symptoms:
+        if matched_symptoms:
+            return self._rule_based_result(matched_symptoms)
+        
+        # No keyword hit: fall back to TF-IDF retrieval over the catalogue
+        if retrieved is None:
+            retrieved = self._retrieve_symptoms(cleaned_text)
+        if not retrieved:
             logger.info("No symptoms matched")
             return self._empty_result()
         
-        logger.info(f"Matched {len(matched_symptoms)} symptoms")
-        
-        # Calculate urgency
-        urgency, urgency_score = self._calculate_urgency(matched_symptoms)
-        
-        # Get recommended specialties
-        specialties = self._get_specialties(matched_symptoms)
+        logger.info(f"Retrieved {len(retrieved)} symptoms by text similarity")
+        return self._retrieval_result(cleaned_text, retrieved)
+    
+    def _retrieval_result(self, cleaned_text, retrieved):
+        """
+        Rule-based result for symptoms found only by text similarity
         
-        # Generate description
-        description = self._generate_description(matched_symptoms, urgency)
+        Similar wording is weaker evidence than a keyword: "headache" is
+        closest to Severe Headache without being one. Such results are
+        rated at most MEDIUM unless the text also names one of the
+        retrieved symptoms' red flags, or a standalone red flag.
+        """
+        indexes = {self.symptom_positions.get(symptom.get('id')) for symptom in retrieved}
+        return self._rule_based_result(retrieved, allow_high=self._names_red_flag(cleaned_text, indexes))
+    
+    def _names_red_flag(self, cleaned_text, indexes):
+        """Whether the text names a red flag of the given symptoms or a standalone one"""
+        for _, _, (_, flags, standalone), whole_word in self.emergency_matcher.iter_matches(cleaned_text):
+            if whole_word and flags and (standalone or any(index in indexes for index, _ in flags)):
+                return True
+        return False
+    
+    def _rule_based_result(self, matched_symptoms, allow_high=True):
+        """
+        Build the analysis result from matched catalogue symptoms
         
-        # Collect first aid tips
-        first_aid = self._collect_first_aid(matched_symptoms)
+        Args:
+            matched_symptoms (list): Matched symptoms
+            allow_high (bool): False to rate the result at most MEDIUM
+        """
+        logger.info(f"Matched {len(matched_symptoms)} symptoms")
         
-        # Collect red flags
-        red_flags = self._collect_red_flags(matched_symptoms)
+        # Urgency, specialties, description, first aid and red flags depend
+        # only on which symptoms matched and how well
+        aggregate = self._aggregate(matched_symptoms, allow_high)
         
         result = {
-            'urgency_level': urgency,
-            'urgency_score': urgency_score,
-            'matched_symptoms': matched_symptoms,
-            'recommended_specialties': specialties,
-            'recommendation': description,
-            'first_aid_tips': first_aid,
-            'red_flags': red_flags,
+            'urgency_level': aggregate['urgency_level'],
+            'urgency_score': aggregate['urgency_score'],
+            'matched_symptoms': [symptom.summary(MATCH_SUMMARY_FIELDS) for symptom in matched_symptoms],
+            'recommended_specialties': list(aggregate['recommended_specialties']),
+            'recommendation': aggregate['recommendation'],
+            'first_aid_tips': list(aggregate['first_aid_tips']),
+            'red_flags': list(aggregate['red_flags']),
             'ai_powered': False,
+            'triage_source': 'rule_based',
             'timestamp': datetime.utcnow().isoformat()
         }
         
-        logger.info(f"Analysis complete: Urgency={urgency}, Score={urgency_score}, "
-                   f"Symptoms={len(matched_symptoms)}, Specialties={specialties}")
+        logger.info(f"Analysis complete: Urgency={result['urgency_level']}, Score={result['urgency_score']}, "
+                   f"Symptoms={len(matched_symptoms)}, Specialties={result['recommended_specialties']}")
         
         return result
     
+    def _aggregate(self, matched_symptoms, allow_high=True):
+        """
+        Memoized rule-based aggregation of a matched-symptom set
+        
+        Keyed on the set of (symptom id, match_score) and allow_high.
+        Symptoms are put in the order _match_symptoms ranks them (match
+        score, urgency score, catalogue position), so a set always
+        aggregates the same way. Without allow_high a HIGH rating is
+        lowered to MEDIUM.
+        
+        Returns:
+            dict: urgency_level, urgency_score, recommended_specialties,
+            recommendation, first_aid_tips and red_flags (shared, do not mutate)
+        """
+        key = (
+            self.dataset_version,
+            frozenset((s.get('id'), s.get('match_score')) for s in matched_symptoms),
+            allow_high
+        )
+        aggregate = self.aggregation_cache.get(key)
+        if aggregate is not None:
+            return aggregate
+        
+        ordered = sorted(
+            matched_symptoms,
+            key=lambda s: (
+                -(s.get('match_score') or 0),
+                -s.get('urgency_score', 0),
+                self.symptom_positions.get(s.get('id'), 0)
+            )
+        )
+        urgency, urgency_score = self._calculate_urgency(ordered)
+        if urgency == 'HIGH' and not allow_high:
+            urgency, urgency_score = 'MEDIUM', min(urgency_score, HIGH_URGENCY_MIN_SCORE - 1)
+        aggregate = {
+            'urgency_level': urgency,
+            'urgency_score': urgency_score,
+            'recommended_specialties': self._get_specialties(ordered),
+            'recommendation': self._generate_description(ordered, urgency),
+            'first_aid_tips': self._collect_first_aid(ordered),
+            'red_flags': self._collect_red_flags(ordered)
+        }
+        self.aggregation_cache.set(key, aggregate)
+        return aggregate
+    
     def _empty_result(self):
         """Return default result when no symptoms matched"""
         return {
@@ -159,81 +1504,37 @@ class SymptomAnalyzer:
             'recommendation': 'No specific symptoms identified. Please describe your symptoms in more detail or consult a general physician.',
             'first_aid_tips': ['Rest and monitor symptoms', 'Stay hydrated', 'Maintain a healthy diet'],
             'red_flags': [],
+            'you_may_also_have': [],
             'ai_powered': False,
+            'triage_source': 'rule_based',
             'timestamp': datetime.utcnow().isoformat()
         }
     
     def _clean_text(self, text):
-        """Clean and normalize input text"""
-        if not text:
-            return ""
-        
-        # Convert to lowercase
-        text = text.lower().strip()
-        
-        # Remove special characters but keep spaces and basic punctuation
-        text = re.sub(r'[^\w\s,.]', ' ', text)
-        
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-        
-        # Remove very short words (likely noise)
-        words = text.split()
-        words = [w for w in words if len(w) > 2 or w in ['i', 'a']]
-        text = ' '.join(words)
-        
-        return text
+        """Clean and normalize input text (script-aware, see utils.text_normalizer)"""
+        return normalize_text(text)
     
     def _match_symptoms(self, text, language):
         """Match user input against symptom database"""
-        matched = []
         text_lower = text.lower()
+        scores = self._score_text(text_lower, language)
         
-        for symptom in self.symptoms_data:
-            match_score = 0
-            matched_keywords = []
-            
-            # Check language-specific terms
-            if language == 'kn' and 'kannada' in symptom:
-                kannada_term = symptom['kannada'].lower()
-                if kannada_term in text_lower:
-                    match_score = 10
-                    matched_keywords.append(kannada_term)
-            elif language == 'hi' and 'hindi' in symptom:
-                hindi_term = symptom['hindi'].lower()
-                if hindi_term in text_lower:
-                    match_score = 10
-                    matched_keywords.append(hindi_term)
-            elif language == 'ta' and 'tamil' in symptom:
-                tamil_term = symptom['tamil'].lower()
-                if tamil_term in text_lower:
-                    match_score = 10
-                    matched_keywords.append(tamil_term)
-            
-            # Check English keywords
-            keywords = symptom.get('keywords', [])
-            for keyword in keywords:
-                keyword_lower = keyword.lower()
-                
-                # Exact word match (highest priority)
-                word_pattern = r'\b' + re.escape(keyword_lower) + r'\b'
-                if re.search(word_pattern, text_lower):
-                    match_score = max(match_score, 10)
-                    matched_keywords.append(keyword)
-                    break
-                
-                # Partial match
-                elif keyword_lower in text_lower:
-                    match_score = max(match_score, 7)
-                    matched_keywords.append(keyword)
-            
-            # Add to matched if score > 0
-            if match_score > 0:
-                matched.append({
-                    **symptom,
-                    'match_score': match_score,
-                    'matched_keywords': matched_keywords
-                })
+        # Typo-corrected pass for symptoms the literal text did not reach
+        corrected_text, corrections = self._correct_typos(text_lower)
+        if corrections:
+            logger.info(f"Corrected typos: {corrections}")
+            for index, (_, matched_keywords) in self._score_text(corrected_text, language).items():
+                if index not in scores:
+                    scores[index] = (FUZZY_MATCH_SCORE, matched_keywords)
+        
+        return self._rank_matches(scores)
+    
+    def _rank_matches(self, scores):
+        """Matched symptom dicts from per-index scores, best match first"""
+        matched = [
+            SymptomMatch(self.symptoms_data[index], match_score, matched_keywords)
+            for index, (match_score, matched_keywords) in sorted(scores.items())
+        ]
         
         # Remove duplicates based on symptom ID
         seen = set()
@@ -252,6 +1553,79 @@ class SymptomAnalyzer:
         
         return unique_matched
     
+    def _score_text(self, text, language):
+        """
+        Score keyword and term hits for every candidate symptom
+        
+        Returns:
+            dict: symptom index -> (match_score, matched_keywords)
+        """
+        # Romanized regional terms are looked up on phonetic keys
+        term_hits = self._match_romanized(text)
+        
+        # Prune to symptoms sharing a token with the input before scanning
+        candidates = self._candidate_symptoms(text) | term_hits.keys()
+        if not candidates:
+            return {}
+        
+        # Single pass over the text collects every keyword and term hit
+        keyword_hits = {}
+        for _, _, payload, whole_word in self.matcher.iter_matches(text):
+            index, position, keyword, source = payload
+            if index not in candidates:
+                continue
+            if source != 'en':
+                # Regional terms identify their own script, whatever the UI language
+                term_hits[index] = keyword
+                continue
+            
+            hits = keyword_hits.setdefault(index, {})
+            hits[position] = hits.get(position, False) or whole_word
+        
+        return self._score_hits(term_hits, keyword_hits)
+    
+    def _score_hits(self, term_hits, keyword_hits):
+        """
+        Score the term and keyword hits of candidate symptoms
+        
+        Args:
+            term_hits (dict): symptom index -> matched regional term
+            keyword_hits (dict): symptom index -> {keyword position: whole-word hit}
+        
+        Returns:
+            dict: symptom index -> (match_score, matched_keywords)
+        """
+        scores = {}
+        for index in term_hits.keys() | keyword_hits.keys():
+            match_score = 0
+            matched_keywords = []
+            
+            # Check language-specific terms
+            if index in term_hits:
+                match_score = EXACT_MATCH_SCORE
+                matched_keywords.append(term_hits[index])
+            
+            # Check English keywords in catalogue order
+            keywords = self.symptoms_data[index].get('keywords', [])
+            hits = keyword_hits.get(index, {})
+            for position in sorted(hits):
+                keyword = keywords[position]
+                
+                # Exact word match (highest priority)
+                if hits[position]:
+                    match_score = max(match_score, EXACT_MATCH_SCORE)
+                    matched_keywords.append(keyword)
+                    break
+                
+                # Partial match
+                match_score = max(match_score, PARTIAL_MATCH_SCORE)
+                matched_keywords.append(keyword)
+            
+            if match_score > 0:
+                scores[index] = (match_score, matched_keywords)
+        
+        return scores
+    
     def _calculate_urgency(self, matched_symptoms):
         """Calculate overall urgency level and score"""
         if not matched_symptoms:
@@ -272,7 +1646,7 @@ class SymptomAnalyzer:
             return 'HIGH', 10
         
         # Single high urgency symptom with high score
-        if max_urgency >= 8:
+        if max_urgency >= HIGH_URGENCY_MIN_SCORE:
             return 'HIGH', max_urgency
         
         # Multiple symptoms with medium-high urgency
@@ -295,34 +1669,39 @@ class SymptomAnalyzer:
         return 'LOW', max_urgency
     
     def _get_specialties(self, matched_symptoms):
-        """Extract and prioritize medical specialties"""
+        """
+        Extract and prioritize medical specialties
+        
+        Each symptom adds its match score, weighted by urgency, to every
+        specialty it lists; the SPECIALTY_LIMIT heaviest are returned. Ties
+        go to the specialty listed first (earliest symptom, then list order).
+        """
+        positions = [self.symptom_positions.get(symptom.get('id')) for symptom in matched_symptoms]
+        if not positions or None in positions:
+            return self._get_specialties_by_name(matched_symptoms)
+        
+        # Weight by match score and urgency. Columns are inserted in order
+        # of first appearance, so the stable sort breaks ties by it.
+        scores = {}
+        for symptom, position in zip(matched_symptoms, positions):
+            weight = symptom.get('match_score', 1) * (1 + symptom.get('urgency_score', 1) / 10)
+            for column, count in self.specialty_rows[position]:
+                scores[column] = scores.get(column, 0) + weight * count
+        
+        ranked = sorted(scores.items(), key=lambda item: -item[1])[:SPECIALTY_LIMIT]
+        return [self.specialty_names[column] for column, _ in ranked] or ['General Medicine']
+    
+    def _get_specialties_by_name(self, matched_symptoms):
+        """Specialty ranking for symptoms outside the catalogue (no matrix row)"""
         specialties_dict = {}
         
         for symptom in matched_symptoms:
-            # Weight by match score and urgency
             weight = symptom.get('match_score', 1) * (1 + symptom.get('urgency_score', 1) / 10)
-            
             for specialty in symptom.get('specialties', []):
-                if specialty in specialties_dict:
-                    specialties_dict[specialty] += weight
-                else:
-                    specialties_dict[specialty] = weight
-        
-        # Sort by weighted score
-        sorted_specialties = sorted(
-            specialties_dict.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-        
-        # Return top 3 specialties
-        result = [s[0] for s in sorted_specialties[:3]]
-        
-        # Always include General Medicine if no specialties found
-        if not result:
-            result = ['General Medicine']
+                specialties_dict[specialty] = specialties_dict.get(specialty, 0) + weight
         
-        return result
+        sorted_specialties = sorted(specialties_dict.items(), key=lambda x: x[1], reverse=True)
+        return [s[0] for s in sorted_specialties[:SPECIALTY_LIMIT]] or ['General Medicine']
     
     def _generate_description(self, matched_symptoms, urgency):
         """Generate human-readable description"""
@@ -412,17 +1791,377 @@ class SymptomAnalyzer:
         
         return flags[:5]
     
+    @_pins_dataset
+    def emergency_check(self, text):
+        """
+        Fast emergency verdict for SOS flows
+        
+        Runs only the precompiled emergency matcher and the romanized term
+        matcher: no Azure OpenAI call, no typo correction, no caching. The
+        input is an emergency when it names a HIGH-urgency symptom, names
+        any symptom together with one of that symptom's red flags, or names
+        a standalone red flag ("not breathing", "no pulse") on its own. A
+        standalone flag of a single symptom brings that symptom's first aid
+        along.
+        
+        Text is limited to EMERGENCY_CHECK_MAX_CHARS characters. When the
+        keyword pass alone has spent EMERGENCY_CHECK_BUDGET_MS and already
+        found an emergency, the romanized pass is skipped.
+        
+        Args:
+            text (str): Symptom description
+        
+        Returns:
+            dict: is_emergency, urgency_level, urgency_score,
+            matched_symptoms (names), matched_red_flags, first_aid_tips,
+            red_flags and within_budget
+        
+        Raises:
+            ValueError: If the text is not a string or is longer than
+            EMERGENCY_CHECK_MAX_CHARS
+        """
+        if not isinstance(text, str):
+            raise ValueError('Symptoms description must be a string')
+        if len(text) > EMERGENCY_CHECK_MAX_CHARS:
+            raise ValueError(f'Text too long for emergency check (max {EMERGENCY_CHECK_MAX_CHARS} characters)')
+        
+        started = time.perf_counter()
+        cleaned_text = self._clean_text(text)
+        
+        matched = set()
+        flag_hits = {}
+        standalone = set()
+        for _, _, (indexes, flags, alone), whole_word in self.emergency_matcher.iter_matches(cleaned_text):
+            if not whole_word:
+                continue
+            matched.update(indexes)
+            for index, flag in flags:
+                flag_hits.setdefault(flag, set()).add(index)
+                if alone:
+                    standalone.add(flag)
+        
+        urgent = bool(standalone) or any(self.symptoms_data[index].get('urgency') == 'HIGH' for index in matched)
+        within_budget = (time.perf_counter() - started) * 1000 <= EMERGENCY_CHECK_BUDGET_MS
+        if within_budget or not urgent:
+            matched.update(self._match_romanized(cleaned_text))
+        
+        # Red flags count with their symptom named, standalone ones on
+        # their own; a standalone flag of a single symptom brings that
+        # symptom along ("no pulse" -> Unconsciousness)
+        flag_hits = {
+            flag: indexes for flag, indexes in flag_hits.items()
+            if flag in standalone or indexes & matched
+        }
+        for flag in standalone:
+            if len(flag_hits[flag]) == 1:
+                matched.update(flag_hits[flag])
+        
+        symptoms = sorted(
+            (self.symptoms_data[index] for index in matched),
+            key=lambda s: s.get('urgency_score', 0),
+            reverse=True
+        )
+        matched_red_flags = sorted(flag_hits, key=lambda flag: (min(flag_hits[flag]), flag))
+        aggregate = self._aggregate(symptoms)
+        is_emergency = bool(matched_red_flags) or any(s.get('urgency') == 'HIGH' for s in symptoms)
+        
+        urgency_score = aggregate['urgency_score']
+        if is_emergency:
+            urgency_level = 'HIGH'
+            urgency_score = max(urgency_score, HIGH_URGENCY_MIN_SCORE)
+        elif symptoms:
+            urgency_level = symptoms[0].get('urgency', 'LOW')
+        else:
+            urgency_level = 'LOW'
+        
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        within_budget = elapsed_ms <= EMERGENCY_CHECK_BUDGET_MS
+        if not within_budget:
+            logger.warning(f"Emergency check took {elapsed_ms:.2f} ms (budget {EMERGENCY_CHECK_BUDGET_MS} ms)")
+        
+        return {
+            'is_emergency': is_emergency,
+            'urgency_level': urgency_level,
+            'urgency_score': urgency_score,
+            'matched_symptoms': [s.get('name') for s in symptoms],
+            'matched_red_flags': matched_red_flags,
+            'first_aid_tips': list(aggregate['first_aid_tips']),
+            'red_flags': list(aggregate['red_flags']),
+            'within_budget': within_budget
+        }
+    
+    @_pins_dataset
+    def analyze_typing(self, session_id, text):
+        """
+        Incremental rule-based analysis of text that is still being typed
+        
+        The session keeps the matcher state of the text seen so far, so a
+        call only scans the characters appended since the previous one. Text
+        that does not extend the previous text (an edit or deletion), an
+        unknown or expired session and a dataset reload start the session
+        over; the matches are the same either way, only slower to compute.
+        
+        Args:
+            session_id (str): Session id from a previous call, None to open one
+            text (str): Entire text typed so far
+        
+        Returns:
+            dict: session_id, reset (the client should drop its list and use
+            `added`), added (symptoms newly matched or matched differently),
+            removed (ids no longer matched), and the provisional
+            urgency_level, urgency_score and matched_count
+        """
+        if len(text) > TYPING_MAX_CHARS:
+            raise ValueError(f'Text too long for live analysis (max {TYPING_MAX_CHARS} characters)')
+        
+        self._refresh_if_changed()
+        session_id = session_id or uuid.uuid4().hex
+        session = self.typing_sessions.get(session_id)
+        reset = session is None or session.dataset_version != self.dataset_version
+        if reset:
+            session = TypingSession(self.dataset_version)
+        
+        with session.lock:
+            if not text.startswith(session.raw_text):
+                session.clear()
+                reset = True
+            if reset:
+                session.reported = {}
+            session.raw_text = text
+            
+            # Words followed by whitespace are final; the last one may still change
+            tail_start = len(text)
+            while tail_start > session.committed_length and not text[tail_start - 1].isspace():
+                tail_start -= 1
+            if tail_start > session.committed_length:
+                session.literal, session.corrected = self._advance_typing(
+                    session.literal, session.corrected, text[session.committed_length:tail_start]
+                )
+                session.committed_length = tail_start
+            literal, corrected = self._advance_typing(
+                session.literal, session.corrected, text[tail_start:], overlay=True
+            )
+            
+            scores = self._stream_scores(literal)
+            if corrected is not None:
+                for index, (_, matched_keywords) in self._stream_scores(corrected).items():
+                    if index not in scores:
+                        scores[index] = (FUZZY_MATCH_SCORE, matched_keywords)
+            matched = self._rank_matches(scores)
+            
+            current = {
+                symptom.get('id'): (symptom['match_score'], tuple(symptom['matched_keywords']))
+                for symptom in matched
+            }
+            added = [
+                symptom.summary(RELATED_SUMMARY_FIELDS)
+                for symptom in matched
+                if session.reported.get(symptom.get('id')) != current[symptom.get('id')]
+            ]
+            removed = [symptom_id for symptom_id in session.reported if symptom_id not in current]
+            session.reported = current
+        
+        # Re-inserting renews the session's time to live
+        self.typing_sessions.set(session_id, session)
+        
+        if matched:
+            aggregate = self._aggregate(matched)
+            urgency_level, urgency_score = aggregate['urgency_level'], aggregate['urgency_score']
+        else:
+            urgency_level, urgency_score = 'LOW', 1
+        
+        return {
+            'session_id': session_id,
+            'reset': reset,
+            'added': added,
+            'removed': removed,
+            'urgency_level': urgency_level,
+            'urgency_score': urgency_score,
+            'matched_count': len(matched)
+        }
+    
+    def _advance_typing(self, literal, corrected, raw_text, overlay=False):
+        """
+        Feed newly typed raw text to a session's literal and corrected streams
+        
+        Normalization and typo correction work word by word, so cleaning the
+        new words on their own gives the same text as cleaning everything.
+        
+        Args:
+            literal (MatchStream): Stream of the text as typed
+            corrected (MatchStream): Stream of the typo-corrected text, or None
+            raw_text (str): Raw text starting at a word boundary
+            overlay (bool): Extend overlays, leaving the given streams as they are
+        
+        Returns:
+            tuple: (literal, corrected) streams including the new text
+        """
+        piece = self._clean_text(raw_text).lower()
+        if not piece:
+            return literal, corrected
+        
+        corrected_piece, corrections = self._correct_typos(piece)
+        if corrections and corrected is None:
+            # Up to the first correction the corrected text is the literal one
+            corrected = MatchStream()
+            self._extend_stream(corrected, literal.text)
+        elif overlay and corrected is not None:
+            corrected = corrected.overlay()
+        if overlay:
+            literal = literal.overlay()
+        
+        self._extend_stream(literal, piece)
+        if corrected is not None:
+            self._extend_stream(corrected, corrected_piece)
+        return literal, corrected
+    
+    def _extend_stream(self, stream, piece):
+        """Append normalized words to a stream, scanning only the new characters"""
+        if not piece:
+            return
+        
+        start = len(stream.text)
+        stream.text = f'{stream.text} {piece}' if stream.text else piece
+        stream.state, hits = self.matcher.resume(stream.text, start, stream.state)
+        for _, _, (index, position, keyword, source), whole_word in hits:
+            if source != 'en':
+                stream.regional_hits[index] = keyword
+                continue
+            keyword_hits = stream.keyword_hits.setdefault(index, {})
+            keyword_hits[position] = keyword_hits.get(position, False) or whole_word
+        
+        romanized_key = self._romanized_key(piece)
+        if romanized_key:
+            start = len(stream.romanized_key)
+            stream.romanized_key = f'{stream.romanized_key} {romanized_key}' if stream.romanized_key else romanized_key
+            stream.romanized_state, hits = self.romanized_matcher.resume(
+                stream.romanized_key, start, stream.romanized_state
+            )
+            for _, _, (index, variant), whole_word in hits:
+                if whole_word and not any(index in layer.romanized_hits for layer in stream.layers()):
+                    stream.romanized_hits[index] = variant
+        
+        stream.candidates.update(self._candidate_symptoms(piece))
+    
+    def _stream_scores(self, stream):
+        """Score a stream's hits the way _score_text scores the whole text"""
+        layers = stream.layers()
+        
+        def is_candidate(index):
+            return any(index in layer.candidates or index in layer.romanized_hits for layer in layers)
+        
+        term_hits = {}
+        for layer in layers:
+            for index, term in layer.romanized_hits.items():
+                term_hits.setdefault(index, term)
+        
+        keyword_hits = {}
+        for layer in layers:
+            for index, term in layer.regional_hits.items():
+                if is_candidate(index):
+                    term_hits[index] = term
+            for index, hits in layer.keyword_hits.items():
+                if is_candidate(index):
+                    merged = keyword_hits.setdefault(index, {})
+                    for position, whole_word in hits.items():
+                        merged[position] = merged.get(position, False) or whole_word
+        
+        return self._score_hits(term_hits, keyword_hits)
+    
+    @_pins_dataset
+    def suggest(self, text, limit=SUGGEST_DEFAULT_LIMIT):
+        """
+        Autocomplete what the user has typed so far
+        
+        Args:
+            text (str): Partial input, in English, a regional script or romanized
+            limit (int): Maximum number of suggestions
+        
+        Returns:
+            list: {'symptom_id', 'name', 'term', 'source', 'urgency'} best first,
+            ranked by urgency and how often the symptom is matched
+        """
+        prefix = ' '.join(normalize_term(text).split())
+        if not prefix:
+            return []
+        
+        prefixes = [(SUGGEST_TERM_NAMESPACE, prefix)]
+        if prefix.isascii():
+            prefixes.append((SUGGEST_ROMANIZED_NAMESPACE, self._romanized_key(prefix)))
+        
+        # Rank against a consistent copy; selections keep being counted
+        with self._popularity_lock:
+            popularity = dict(self.symptom_popularity)
+        
+        suggestions = self.suggester.suggest(
+            prefixes,
+            limit=max(1, min(limit, SUGGEST_MAX_LIMIT)),
+            popularity=popularity
+        )
+        
+        for suggestion in suggestions:
+            symptom = self.symptoms_data[self.symptom_positions[suggestion['symptom_id']]]
+            suggestion['name'] = symptom.get('name')
+            suggestion['urgency'] = symptom.get('urgency')
+        return suggestions
+    
+    @_pins_dataset
     def get_symptom_by_id(self, symptom_id):
         """Get detailed symptom information by ID"""
-        for symptom in self.symptoms_data:
-            if symptom.get('id') == symptom_id:
-                return symptom
-        return None
+        index = self.symptom_positions.get(symptom_id)
+        return self.symptoms_data[index].to_dict() if index is not None else None
+    
+    @_pins_dataset
+    def get_related_symptoms(self, symptom_id):
+        """
+        Symptoms related to one symptom, from the precomputed graph
+        
+        Returns:
+            list: Symptom summaries with their edge weight, heaviest first,
+            or None for an unknown symptom id
+        """
+        index = self.symptom_positions.get(symptom_id)
+        if index is None:
+            return None
+        return [
+            {**self.symptom_summaries[neighbour], 'weight': weight}
+            for neighbour, weight in self.related_graph[index]
+        ]
+    
+    @_pins_dataset
+    def get_categories(self):
+        """Get all symptom category names"""
+        return self.categories
+    
+    @_pins_dataset
+    def get_symptoms_by_category(self, category):
+        """Get all symptoms in a category"""
+        return [self.symptoms_data[index].to_dict() for index in self.symptoms_by_category.get(category, [])]
+    
+    @_pins_dataset
+    def get_symptoms_by_specialty(self, specialty):
+        """Get all symptoms treated by a specialty"""
+        return [self.symptoms_data[index].to_dict() for index in self.symptoms_by_specialty.get(specialty, [])]
+    
+    @_pins_dataset
+    def get_category_payload(self, category=None):
+        """
+        Pre-serialized browse response
+        
+        Args:
+            category (str): Category name, or None for the category list
+        
+        Returns:
+            str: JSON response body, or None for an unknown category
+        """
+        return self.category_payloads.get(category)
     
+    @_pins_dataset
     def get_all_symptoms(self):
         """Get all symptoms in database"""
-        return self.symptoms_data
+        return [symptom.to_dict() for symptom in self.symptoms_data]
     
+    @_pins_dataset
     def search_symptoms(self, query, limit=10):
         """Search symptoms by keyword"""
         query_lower = query.lower()
@@ -440,7 +2179,11 @@ class SymptomAnalyzer:
                     results.append(symptom)
                     break
         
-        return results[:limit]
+        return [symptom.to_dict() for symptom in results[:limit]]
+
+
+for _name in DATASET_ATTRIBUTES:
+    setattr(SymptomAnalyzer, _name, _dataset_attribute(_name))
 
 
 # Global analyzer instance
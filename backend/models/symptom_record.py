@@ -0,0 +1,199 @@
+"""
+Symptom catalogue records
+Immutable slot-based symptom records and the match objects that reference them
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class _Missing:
+    """Marks an absent record field; pickles by reference so snapshots keep it"""
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        return '_MISSING'
+
+    def __repr__(self):
+        return '<missing>'
+
+
+_MISSING = _Missing()
+
+
+def _freeze(value: Any) -> Any:
+    """Lists become tuples, so shared records cannot be changed in place"""
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Tuples become lists again for JSON responses and API consumers"""
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class _FrozenSlots(Mapping):
+    """Read-only mapping over fixed slots; attributes cannot be reassigned"""
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self):
+        return f'{type(self).__name__}({dict(self)!r})'
+
+
+class SymptomRecord(_FrozenSlots):
+    """
+    One catalogue symptom, loaded once and shared by every analysis
+
+    Behaves as a read-only dict of the symptoms.json record (`record['name']`,
+    `record.get('keywords', [])`) with list fields stored as tuples. Fields
+    outside FIELDS are kept too. Use to_dict() for a plain, mutable copy.
+    """
+
+    FIELDS = (
+        'id', 'name', 'kannada', 'hindi', 'tamil', 'category', 'keywords', 'specialties',
+        'urgency', 'urgency_score', 'description', 'first_aid', 'red_flags', 'related_symptoms'
+    )
+    _FIELD_SET = frozenset(FIELDS)
+
+    __slots__ = FIELDS + ('_extra',)
+
+    def __init__(self, data: Dict[str, Any]):
+        for field in self.FIELDS:
+            object.__setattr__(self, field, _freeze(data[field]) if field in data else _MISSING)
+        extra = tuple((key, _freeze(value)) for key, value in data.items() if key not in self._FIELD_SET)
+        object.__setattr__(self, '_extra', extra)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELD_SET:
+            value = getattr(self, key)
+            if value is not _MISSING:
+                return value
+        else:
+            for name, value in self._extra:
+                if name == key:
+                    return value
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._FIELD_SET:
+            value = getattr(self, key)
+            return default if value is _MISSING else value
+        for name, value in self._extra:
+            if name == key:
+                return value
+        return default
+
+    def __contains__(self, key) -> bool:
+        if key in self._FIELD_SET:
+            return getattr(self, key) is not _MISSING
+        return any(name == key for name, _ in self._extra)
+
+    def __iter__(self) -> Iterator[str]:
+        for field in self.FIELDS:
+            if getattr(self, field) is not _MISSING:
+                yield field
+        for name, _ in self._extra:
+            yield name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __reduce__(self):
+        # Snapshots pickle the slot values, not a rebuilt dict
+        return _restore_record, (tuple(getattr(self, name) for name in self.__slots__),)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict copy of the full record, as stored in symptoms.json"""
+        return {key: _thaw(value) for key, value in self.items()}
+
+
+def _restore_record(values: Tuple) -> SymptomRecord:
+    record = SymptomRecord.__new__(SymptomRecord)
+    for name, value in zip(SymptomRecord.__slots__, values):
+        object.__setattr__(record, name, value)
+    return record
+
+
+class SymptomMatch(_FrozenSlots):
+    """
+    A catalogue symptom matched by an analysis
+
+    References the shared record instead of copying it and reads as that
+    record plus match_score, matched_keywords and (for retrieval matches)
+    similarity.
+    """
+
+    OWN_FIELDS = ('match_score', 'matched_keywords', 'similarity')
+
+    __slots__ = ('symptom',) + OWN_FIELDS
+
+    def __init__(self, symptom: SymptomRecord, match_score: int,
+                 matched_keywords: List[str], similarity: Optional[float] = None):
+        object.__setattr__(self, 'symptom', symptom)
+        object.__setattr__(self, 'match_score', match_score)
+        object.__setattr__(self, 'matched_keywords', matched_keywords)
+        object.__setattr__(self, 'similarity', similarity)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.OWN_FIELDS:
+            value = getattr(self, key)
+            if value is None:
+                raise KeyError(key)
+            return value
+        return self.symptom[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self.OWN_FIELDS:
+            value = getattr(self, key)
+            return default if value is None else value
+        return self.symptom.get(key, default)
+
+    def __contains__(self, key) -> bool:
+        if key in self.OWN_FIELDS:
+            return getattr(self, key) is not None
+        return key in self.symptom
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.symptom
+        for field in self.OWN_FIELDS:
+            if getattr(self, field) is not None:
+                yield field
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def summary(self, fields: Iterable[str]) -> Dict[str, Any]:
+        """
+        Response payload of the match
+
+        Args:
+            fields: Record fields to include (missing ones are left out)
+
+        Returns:
+            dict: Those fields plus match_score, matched_keywords and,
+            when set, similarity
+        """
+        symptom = self.symptom
+        payload = {field: _thaw(symptom[field]) for field in fields if field in symptom}
+        payload['match_score'] = self.match_score
+        payload['matched_keywords'] = list(self.matched_keywords)
+        if self.similarity is not None:
+            payload['similarity'] = self.similarity
+        return payload
@@ -3,6 +3,7 @@ from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identi
 from models.user_model import db, User, SearchHistory, Favorite
 from utils.email_sender import email_sender
 from utils.analytics import analytics
+from utils.stage_timing import stage
 from datetime import timedelta
 import re
 import logging
@@ -316,8 +317,9 @@ def add_search_history():
             specialties=data.get('specialties')
         )
         
-        db.session.add(history)
-        db.session.commit()
+        with stage('history'):
+            db.session.add(history)
+            db.session.commit()
         
         logger.info(f"Search history added for user: {user_id}")
         
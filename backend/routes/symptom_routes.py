@@ -1,15 +1,56 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models.symptom_analyzer import get_symptom_analyzer
 from models.user_model import db, SearchHistory
 from utils.analytics import analytics
 from utils.azure_translator_service import translate_to_kannada, translate_list
+from utils.stage_timing import stage
+import json
 import logging
+import os
 import time
 
 symptom_bp = Blueprint('symptoms', __name__)
 logger = logging.getLogger(__name__)
 
+# Maximum number of descriptions accepted by /analyze-batch
+BATCH_MAX_SIZE = int(os.getenv('SYMPTOM_BATCH_MAX_SIZE', '500'))
+
+
+def translate_analysis_to_kannada(analysis_result):
+    """Translate the user-facing fields of an analysis result in place"""
+    try:
+        logger.info("Translating analysis result to Kannada...")
+        # Translate recommendation
+        if analysis_result.get('recommendation'):
+            analysis_result['recommendation'] = translate_to_kannada(analysis_result['recommendation'])
+        
+        # Translate specialties
+        if analysis_result.get('recommended_specialties'):
+            analysis_result['recommended_specialties'] = translate_list(
+                analysis_result['recommended_specialties'], 'kn'
+            )
+        
+        # Translate first aid tips
+        if analysis_result.get('first_aid_tips'):
+            analysis_result['first_aid_tips'] = translate_list(
+                analysis_result['first_aid_tips'], 'kn'
+            )
+        
+        # Translate red flags
+        if analysis_result.get('red_flags'):
+            analysis_result['red_flags'] = translate_list(
+                analysis_result['red_flags'], 'kn'
+            )
+        
+        logger.info("Translation to Kannada completed")
+    except Exception as trans_error:
+        logger.warning(f"Translation failed, keeping English: {trans_error}")
+        # Continue with English results if translation fails
+    
+    return analysis_result
+
+
 @symptom_bp.route('/analyze', methods=['POST'])
 def analyze_symptoms():
     """Analyze user symptoms and recommend specialties"""
@@ -33,39 +74,14 @@ def analyze_symptoms():
         
         # Translate to Kannada if requested
         if language == 'kn':
-            try:
-                logger.info("Translating analysis result to Kannada...")
-                # Translate recommendation
-                if analysis_result.get('recommendation'):
-                    analysis_result['recommendation'] = translate_to_kannada(analysis_result['recommendation'])
-                
-                # Translate specialties
-                if analysis_result.get('recommended_specialties'):
-                    analysis_result['recommended_specialties'] = translate_list(
-                        analysis_result['recommended_specialties'], 'kn'
-                    )
-                
-                # Translate first aid tips
-                if analysis_result.get('first_aid_tips'):
-                    analysis_result['first_aid_tips'] = translate_list(
-                        analysis_result['first_aid_tips'], 'kn'
-                    )
-                
-                # Translate red flags
-                if analysis_result.get('red_flags'):
-                    analysis_result['red_flags'] = translate_list(
-                        analysis_result['red_flags'], 'kn'
-                    )
-                
-                logger.info("Translation to Kannada completed")
-            except Exception as trans_error:
-                logger.warning(f"Translation failed, keeping English: {trans_error}")
-                # Continue with English results if translation fails
+            with stage('translate'):
+                translate_analysis_to_kannada(analysis_result)
         
         # Track analytics
         response_time = (time.time() - start_time) * 1000  # milliseconds
         urgency = analysis_result.get('urgency', 'MEDIUM')
-        analytics.track_symptom_search(symptoms_text, urgency, response_time, language)
+        with stage('analytics'):
+            analytics.track_symptom_search(symptoms_text, urgency, response_time, language)
         
         logger.info(f"Symptom analysis completed: {len(analysis_result['matched_symptoms'])} symptoms matched, {response_time:.2f}ms")
         
@@ -78,12 +94,73 @@ def analyze_symptoms():
         logger.error(f"Error analyzing symptoms: {e}")
         return jsonify({'error': str(e)}), 500
 
+@symptom_bp.route('/analyze-batch', methods=['POST'])
+def analyze_symptoms_batch():
+    """
+    Analyze many symptom descriptions in one request
+    
+    Streams one NDJSON line per description as each analysis completes:
+    {"index": 0, "symptoms": "...", "analysis": {...}}
+    """
+    start_time = time.time()
+    data = request.get_json(silent=True) or {}
+    
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    
+    texts = data.get('symptoms')
+    language = data.get('language', 'en')
+    
+    # Validate input
+    if not isinstance(texts, list) or not texts:
+        return jsonify({'error': 'A non-empty list of symptom descriptions is required'}), 400
+    
+    if len(texts) > BATCH_MAX_SIZE:
+        return jsonify({'error': f'Batch size exceeds the limit of {BATCH_MAX_SIZE} descriptions'}), 400
+    
+    if not all(isinstance(text, str) for text in texts):
+        return jsonify({'error': 'Every symptom description must be a string'}), 400
+    
+    analyzer = get_symptom_analyzer()
+    
+    # Translate inside the analysis workers so Azure round-trips overlap
+    postprocess = translate_analysis_to_kannada if language == 'kn' else None
+    
+    def generate():
+        tracked = []
+        for index, analysis_result in analyzer.analyze_batch(texts, language, postprocess=postprocess):
+            if analysis_result is None:
+                yield json.dumps({'index': index, 'error': 'Analysis failed'}) + '\n'
+                continue
+            
+            tracked.append((texts[index], analysis_result.get('urgency_level', 'MEDIUM')))
+            yield json.dumps({
+                'index': index,
+                'symptoms': texts[index],
+                'analysis': analysis_result
+            }, ensure_ascii=False) + '\n'
+        
+        # One analytics write for the whole batch
+        response_time = (time.time() - start_time) * 1000
+        try:
+            analytics.track_symptom_batch(tracked, response_time, language)
+        except Exception as e:
+            logger.warning(f"Could not track batch analytics: {e}")
+        
+        logger.info(f"Batch symptom analysis completed: {len(texts)} descriptions, {response_time:.2f}ms")
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @symptom_bp.route('/list', methods=['GET'])
 def list_symptoms():
     """Get list of all available symptoms"""
     try:
         analyzer = get_symptom_analyzer()
-        symptoms = analyzer.get_all_symptoms()
+        specialty = request.args.get('specialty')
+        if specialty:
+            symptoms = analyzer.get_symptoms_by_specialty(specialty)
+        else:
+            symptoms = analyzer.get_all_symptoms()
         
         return jsonify({
             'success': True,
@@ -119,6 +196,28 @@ def search_symptoms():
         logger.error(f"Error searching symptoms: {e}")
         return jsonify({'error': str(e)}), 500
 
+@symptom_bp.route('/suggest', methods=['GET'])
+def suggest_symptoms():
+    """Autocomplete symptom terms as the user types"""
+    try:
+        query = request.args.get('q', '')
+        limit = int(request.args.get('limit', 8))
+        
+        analyzer = get_symptom_analyzer()
+        suggestions = analyzer.suggest(query, limit)
+        
+        return jsonify({
+            'success': True,
+            'query': query,
+            'suggestions': suggestions
+        }), 200
+        
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    except Exception as e:
+        logger.error(f"Error suggesting symptoms: {e}")
+        return jsonify({'error': str(e)}), 500
+
 @symptom_bp.route('/<symptom_id>', methods=['GET'])
 def get_symptom_details(symptom_id):
     """Get detailed information about a specific symptom"""
@@ -137,47 +236,113 @@ def get_symptom_details(symptom_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@symptom_bp.route('/categories', methods=['GET'])
-def get_categories():
-    """Get all symptom categories"""
+@symptom_bp.route('/<symptom_id>/related', methods=['GET'])
+def get_related_symptoms(symptom_id):
+    """Get symptoms that commonly occur together with a symptom"""
     try:
-        categories = analyzer.symptoms_data.get('categories', [])
+        analyzer = get_symptom_analyzer()
+        related = analyzer.get_related_symptoms(symptom_id)
+        
+        if related is None:
+            return jsonify({'error': 'Symptom not found'}), 404
         
         return jsonify({
             'success': True,
-            'categories': categories
+            'symptom_id': symptom_id,
+            'related': related
         }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@symptom_bp.route('/categories', methods=['GET'])
+def get_categories():
+    """Get all symptom categories"""
+    try:
+        analyzer = get_symptom_analyzer()
+        return Response(analyzer.get_category_payload(), mimetype='application/json'), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@symptom_bp.route('/categories/<category>', methods=['GET'])
+def get_category_symptoms(category):
+    """Get the symptoms of one category"""
+    try:
+        analyzer = get_symptom_analyzer()
+        payload = analyzer.get_category_payload(category)
+        
+        if payload is None:
+            return jsonify({'error': 'Category not found'}), 404
+        
+        return Response(payload, mimetype='application/json'), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@symptom_bp.route('/analyze-live', methods=['POST'])
+def analyze_live():
+    """
+    As-you-type analysis of a growing description
+    
+    Send the whole text on every keystroke together with the session_id
+    returned by the previous call; only the newly typed characters are
+    scanned. Returns the change in matched symptoms and the provisional
+    urgency (rule-based only: no Azure OpenAI call, no search history).
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        text = data.get('symptoms')
+        session_id = data.get('session_id')
+        
+        if not isinstance(text, str):
+            return jsonify({'error': 'Symptoms text is required'}), 400
+        if session_id is not None and not isinstance(session_id, str):
+            return jsonify({'error': 'session_id must be a string'}), 400
+        
+        analyzer = get_symptom_analyzer()
+        try:
+            result = analyzer.analyze_typing(session_id, text)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify({'success': True, **result}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @symptom_bp.route('/emergency-check', methods=['POST'])
 def check_emergency():
-    """Quick emergency symptom check"""
+    """
+    Quick emergency symptom check for SOS flows
+    
+    Local keyword and red-flag matching only: no Azure OpenAI call, no
+    search history write and no translation.
+    """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True) or {}
         
-        if not data.get('symptoms'):
+        if not isinstance(data, dict) or not data.get('symptoms'):
             return jsonify({'error': 'Symptoms description is required'}), 400
         
-        symptoms_text = data['symptoms']
-        language = data.get('language', 'english')
-        
-        # Analyze symptoms
-        analysis_result = analyzer.analyze_symptoms(symptoms_text, language)
-        
-        # Check if emergency
-        is_emergency = analysis_result['requires_emergency']
-        urgency_level = analysis_result['urgency_level']
+        analyzer = get_symptom_analyzer()
+        try:
+            result = analyzer.emergency_check(data['symptoms'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        is_emergency = result['is_emergency']
         
         return jsonify({
             'success': True,
             'is_emergency': is_emergency,
-            'urgency_level': urgency_level,
-            'urgency_score': analysis_result['urgency_score'],
+            'urgency_level': result['urgency_level'],
+            'urgency_score': result['urgency_score'],
+            'matched_symptoms': result['matched_symptoms'],
+            'matched_red_flags': result['matched_red_flags'],
             'message': 'Seek immediate medical attention' if is_emergency else 'Consult a doctor soon',
-            'first_aid': analysis_result['first_aid_tips'],
-            'red_flags': analysis_result['red_flags']
+            'first_aid': result['first_aid_tips'],
+            'red_flags': result['red_flags'],
+            'within_budget': result['within_budget']
         }), 200
         
     except Exception as e:
@@ -0,0 +1,64 @@
+"""
+Build the knowledge snapshot
+
+Loads the symptom catalogue and hospital database from JSON, builds every
+derived index (keyword automaton, token/typo/romanized indexes, TF-IDF
+retriever, autocomplete index, triage classifier, related-symptom graph,
+hospital id map and specialty bitsets) and compiles them into the binary snapshot workers load at startup. Run it as
+part of the deploy build, after any data file or index code changes; stale
+sections are detected by a hash of the data files and of the code that builds
+them, and rebuilt from JSON at runtime.
+
+Usage (from the backend directory):
+    python scripts/build_knowledge_snapshot.py [--output PATH]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from models.hospital_matcher import HospitalMatcher
+from models.symptom_analyzer import SymptomAnalyzer
+from utils.knowledge_snapshot import DEFAULT_SNAPSHOT_PATH, load_snapshot_section, write_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--output', default=DEFAULT_SNAPSHOT_PATH, help='snapshot path')
+    args = parser.parse_args()
+
+    # Build from JSON, ignoring any existing snapshot
+    started = time.perf_counter()
+    analyzer = SymptomAnalyzer(snapshot_path='')
+    matcher = HospitalMatcher(snapshot_path='')
+    build_ms = (time.perf_counter() - started) * 1000
+
+    header = write_snapshot(args.output, {
+        'symptom_analyzer': (analyzer.snapshot_version(), analyzer.snapshot_state()),
+        'hospital_matcher': (matcher.snapshot_version(), matcher.snapshot_state())
+    })
+
+    # Time a cold load of each section the way workers do it
+    load_ms = {}
+    for name, version in (('symptom_analyzer', analyzer.snapshot_version()),
+                          ('hospital_matcher', matcher.snapshot_version())):
+        started = time.perf_counter()
+        if load_snapshot_section(args.output, name, version) is None:
+            sys.exit(f"Snapshot section {name} failed to load back")
+        load_ms[name] = round((time.perf_counter() - started) * 1000, 2)
+
+    print(json.dumps({
+        'output': os.path.abspath(args.output),
+        'size_bytes': os.path.getsize(args.output),
+        'json_build_ms': round(build_ms, 2),
+        'snapshot_load_ms': load_ms,
+        **header
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+"""
+Build the labelled triage regression corpus
+
+Writes benchmarks/triage_corpus.jsonl: a few thousand symptom descriptions in
+English, Kannada, Hindi, Tamil, romanized and misspelled English, each made of
+one to three catalogue symptoms, followed by the hand-written cases of
+benchmarks/triage_handwritten.jsonl.
+
+Generated labels come from the catalogue, not from the analyzer: the expected
+urgency is the most urgent described symptom's level, and the expected
+specialties are the union of their specialties. Since the en, kn and
+romanized phrases are the terms the analyzer indexes, those slices only show
+that catalogue phrasings (and their typos) are still recognised.
+
+The hand-written slices are labelled by hand and do not come from the
+catalogue: independent (lay descriptions of real complaints), benign
+(everyday complaints that need no doctor), vague (too little detail to
+triage above LOW or MEDIUM) and negative (no current symptom, or no
+medical content at all; expected LOW with no specialties).
+
+The output is deterministic for a given seed, catalogue and hand-written
+file; regenerate it (and the baseline of benchmarks/triage_regression.py)
+when either changes.
+
+Usage (from the backend directory):
+    python scripts/build_triage_corpus.py [--output PATH] [--seed 11] [--handwritten PATH]
+"""
+
+import argparse
+import json
+import os
+import random
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+BENCH_DIR = os.path.join(os.path.dirname(__file__), '..', 'benchmarks')
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'triage_corpus.jsonl')
+HANDWRITTEN_PATH = os.path.join(BENCH_DIR, 'triage_handwritten.jsonl')
+
+URGENCY_RANK = {'LOW': 0, 'MEDIUM': 1, 'HIGH': 2}
+
+# Descriptions per slice
+SLICE_SIZES = {
+    'en': 1000,
+    'misspelled': 700,
+    'kn': 600,
+    'romanized': 600,
+    'hi': 300,
+    'ta': 300
+}
+
+# Sentence templates per slice; {0}, {1}, {2} are symptom phrases
+TEMPLATES = {
+    'en': [
+        '{0}',
+        'I have {0} since yesterday',
+        'suffering from {0} for two days',
+        'my mother has {0} and {1}',
+        '{0} and {1} since morning',
+        'I have {0}, {1} and {2}',
+        'my son has {0} with {1}'
+    ],
+    'kn': [
+        '{0}',
+        'ನನಗೆ {0} ಇದೆ',
+        'ಎರಡು ದಿನಗಳಿಂದ {0}',
+        '{0} ಮತ್ತು {1}',
+        'ನನಗೆ {0} ಮತ್ತು {1} ಇದೆ'
+    ],
+    'hi': [
+        '{0}',
+        'मुझे {0} है',
+        'दो दिन से {0}',
+        '{0} और {1}',
+        'मुझे {0} और {1} है'
+    ],
+    'ta': [
+        '{0}',
+        'எனக்கு {0} இருக்கிறது',
+        'இரண்டு நாட்களாக {0}',
+        '{0} மற்றும் {1}',
+        'எனக்கு {0} மற்றும் {1} இருக்கிறது'
+    ],
+    'romanized': [
+        '{0}',
+        'mujhe {0} hai',
+        'nanage {0} ide',
+        '{0} aur {1}',
+        '{0} mattu {1}'
+    ]
+}
+TEMPLATES['misspelled'] = TEMPLATES['en']
+
+# Hand-written Hindi and Tamil phrases (the catalogue has no hindi/tamil
+# fields yet), keyed by symptom id
+HINDI_TERMS = {
+    'symp_001': ['सीने में दर्द', 'छाती में दर्द'],
+    'symp_003': ['तेज़ सिर दर्द', 'सिर में तेज़ दर्द'],
+    'symp_006': ['सांस लेने में तकलीफ', 'सांस फूलना'],
+    'symp_007': ['लगातार खांसी'],
+    'symp_010': ['पेट में तेज़ दर्द'],
+    'symp_011': ['उल्टी'],
+    'symp_012': ['दस्त'],
+    'symp_014': ['जी मिचलाना'],
+    'symp_017': ['बहुत खून बह रहा है'],
+    'symp_018': ['बेहोशी'],
+    'symp_020': ['ज़हर खा लिया'],
+    'symp_022': ['हड्डी टूट गई'],
+    'symp_024': ['कमर दर्द', 'पीठ दर्द'],
+    'symp_025': ['जोड़ों में दर्द'],
+    'symp_029': ['तेज़ बुखार'],
+    'symp_030': ['थकान'],
+    'symp_043': ['गले में दर्द'],
+    'symp_047': ['दौरा पड़ा'],
+    'symp_050': ['चक्कर आना']
+}
+TAMIL_TERMS = {
+    'symp_001': ['நெஞ்சு வலி'],
+    'symp_003': ['கடுமையான தலைவலி'],
+    'symp_006': ['மூச்சு விடுவதில் சிரமம்', 'மூச்சுத் திணறல்'],
+    'symp_007': ['தொடர் இருமல்'],
+    'symp_010': ['கடுமையான வயிற்று வலி'],
+    'symp_011': ['வாந்தி'],
+    'symp_012': ['வயிற்றுப்போக்கு'],
+    'symp_014': ['குமட்டல்'],
+    'symp_017': ['அதிக இரத்தப்போக்கு'],
+    'symp_018': ['மயக்கம்'],
+    'symp_022': ['எலும்பு முறிவு'],
+    'symp_024': ['முதுகு வலி'],
+    'symp_025': ['மூட்டு வலி'],
+    'symp_029': ['அதிக காய்ச்சல்'],
+    'symp_030': ['சோர்வு'],
+    'symp_043': ['தொண்டை வலி'],
+    'symp_047': ['வலிப்பு'],
+    'symp_050': ['தலைச்சுற்றல்']
+}
+
+
+def misspell(phrase, rng):
+    """Drop, swap or double one letter of the phrase's longest word"""
+    words = phrase.split()
+    position = max(range(len(words)), key=lambda i: len(words[i]))
+    word = words[position]
+    if len(word) < 5:
+        return phrase
+
+    i = rng.randrange(1, len(word) - 1)
+    edit = rng.choice(('drop', 'swap', 'double'))
+    if edit == 'drop':
+        word = word[:i] + word[i + 1:]
+    elif edit == 'swap':
+        word = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    else:
+        word = word[:i] + word[i] + word[i:]
+    words[position] = word
+    return ' '.join(words)
+
+
+def phrase_table(symptoms, romanized_terms):
+    """Slice -> symptom id -> phrases describing it"""
+    table = {slice_name: {} for slice_name in SLICE_SIZES}
+    for symptom in symptoms:
+        keywords = symptom.get('keywords', [])
+        table['en'][symptom['id']] = keywords
+        table['misspelled'][symptom['id']] = [keyword for keyword in keywords if len(max(keyword.split(), key=len)) >= 5]
+        if symptom.get('kannada'):
+            table['kn'][symptom['id']] = [symptom['kannada']]
+    table['romanized'] = romanized_terms
+    table['hi'] = HINDI_TERMS
+    table['ta'] = TAMIL_TERMS
+    return {name: {sid: phrases for sid, phrases in rows.items() if phrases} for name, rows in table.items()}
+
+
+def build_corpus(symptoms, romanized_terms, seed=11):
+    by_id = {symptom['id']: symptom for symptom in symptoms}
+    table = phrase_table(symptoms, romanized_terms)
+    rng = random.Random(seed)
+    corpus = []
+
+    for slice_name, size in SLICE_SIZES.items():
+        phrases = table[slice_name]
+        symptom_ids = sorted(sid for sid in phrases if sid in by_id)
+        seen = set()
+        attempts = 0
+        while len(seen) < size and attempts < size * 50:
+            attempts += 1
+            template = rng.choice(TEMPLATES[slice_name])
+            count = template.count('{')
+            chosen = rng.sample(symptom_ids, count)
+            parts = [rng.choice(phrases[sid]) for sid in chosen]
+            if slice_name == 'misspelled':
+                parts[0] = misspell(parts[0], rng)
+            text = template.format(*parts)
+            if text in seen:
+                continue
+            seen.add(text)
+
+            described = [by_id[sid] for sid in chosen]
+            urgency = max((s.get('urgency', 'LOW') for s in described), key=URGENCY_RANK.get)
+            specialties = []
+            for symptom in described:
+                for specialty in symptom.get('specialties', []):
+                    if specialty not in specialties:
+                        specialties.append(specialty)
+
+            corpus.append({
+                'id': f'{slice_name}-{len(seen):04d}',
+                'slice': slice_name,
+                'text': text,
+                'symptom_ids': chosen,
+                'urgency': urgency,
+                'specialties': specialties
+            })
+    return corpus
+
+
+def load_handwritten(path):
+    """Hand-labelled cases, in the corpus format without symptom ids"""
+    with open(path, encoding='utf-8') as f:
+        cases = [json.loads(line) for line in f if line.strip()]
+    for case in cases:
+        case.setdefault('symptom_ids', [])
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='corpus path (JSON lines)')
+    parser.add_argument('--seed', type=int, default=11)
+    parser.add_argument('--handwritten', default=HANDWRITTEN_PATH, help='hand-labelled cases (JSON lines)')
+    args = parser.parse_args()
+
+    with open(os.path.join(DATA_DIR, 'symptoms.json'), encoding='utf-8') as f:
+        symptoms = json.load(f)['symptoms']
+    with open(os.path.join(DATA_DIR, 'romanized_terms.json'), encoding='utf-8') as f:
+        romanized_terms = json.load(f)['terms']
+
+    corpus = build_corpus(symptoms, romanized_terms, seed=args.seed) + load_handwritten(args.handwritten)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        for case in corpus:
+            f.write(json.dumps(case, ensure_ascii=False) + '\n')
+
+    slices = {}
+    for case in corpus:
+        slices[case['slice']] = slices.get(case['slice'], 0) + 1
+    print(json.dumps({'output': os.path.abspath(args.output), 'cases': len(corpus), 'slices': slices}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
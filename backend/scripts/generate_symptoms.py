@@ -0,0 +1,281 @@
+"""
+Generate a synthetic symptom catalogue
+Deterministic symptoms.json of any size in the production schema
+
+Symptoms are composed from a body site, a sensation, an optional modifier
+and an optional onset ("Sudden Severe Chest Pain", "Knee Swelling After
+Injury"), each with its Kannada rendering and an urgency contribution, so
+the catalogue has realistic overlap between keywords, a spread of
+urgencies and categories, and Kannada names for every entry. The same
+count and seed always produce the same file.
+
+Usage (from the backend directory):
+    python scripts/generate_symptoms.py --count 10000 --output /tmp/symptoms_10k.json [--seed 7] [--no-base]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+from itertools import product
+
+SYMPTOMS_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'symptoms.json')
+
+# (English, Kannada, category, specialties, base urgency score)
+SITES = [
+    ('chest', 'ಎದೆ', 'Cardiac', ['Cardiology', 'Emergency Medicine'], 6),
+    ('heart', 'ಹೃದಯ', 'Cardiac', ['Cardiology'], 6),
+    ('head', 'ತಲೆ', 'Neurological', ['Neurology'], 4),
+    ('neck', 'ಕುತ್ತಿಗೆ', 'Musculoskeletal', ['Orthopedics'], 3),
+    ('back', 'ಬೆನ್ನು', 'Musculoskeletal', ['Orthopedics'], 3),
+    ('lower back', 'ಕೆಳಬೆನ್ನು', 'Musculoskeletal', ['Orthopedics', 'Sports Medicine'], 3),
+    ('shoulder', 'ಭುಜ', 'Musculoskeletal', ['Orthopedics'], 3),
+    ('arm', 'ತೋಳು', 'Musculoskeletal', ['Orthopedics'], 3),
+    ('wrist', 'ಮಣಿಕಟ್ಟು', 'Musculoskeletal', ['Orthopedics'], 2),
+    ('hand', 'ಕೈ', 'Musculoskeletal', ['Orthopedics'], 2),
+    ('knee', 'ಮೊಣಕಾಲು', 'Musculoskeletal', ['Orthopedics', 'Sports Medicine'], 3),
+    ('leg', 'ಕಾಲು', 'Musculoskeletal', ['Orthopedics'], 3),
+    ('foot', 'ಪಾದ', 'Musculoskeletal', ['Orthopedics'], 2),
+    ('joint', 'ಕೀಲು', 'Musculoskeletal', ['Rheumatology'], 3),
+    ('muscle', 'ಸ್ನಾಯು', 'Musculoskeletal', ['Orthopedics'], 2),
+    ('abdomen', 'ಹೊಟ್ಟೆ', 'Gastrointestinal', ['Gastroenterology', 'General Surgery'], 4),
+    ('stomach', 'ಜಠರ', 'Gastrointestinal', ['Gastroenterology'], 4),
+    ('throat', 'ಗಂಟಲು', 'ENT', ['ENT'], 3),
+    ('ear', 'ಕಿವಿ', 'ENT', ['ENT'], 3),
+    ('nose', 'ಮೂಗು', 'ENT', ['ENT'], 2),
+    ('eye', 'ಕಣ್ಣು', 'Ophthalmology', ['Ophthalmology'], 4),
+    ('skin', 'ಚರ್ಮ', 'Dermatology', ['Dermatology'], 2),
+    ('scalp', 'ನೆತ್ತಿ', 'Dermatology', ['Dermatology'], 2),
+    ('lung', 'ಶ್ವಾಸಕೋಶ', 'Respiratory', ['Pulmonology'], 5),
+    ('kidney', 'ಮೂತ್ರಪಿಂಡ', 'Urological', ['Nephrology', 'Urology'], 4),
+    ('bladder', 'ಮೂತ್ರಕೋಶ', 'Urological', ['Urology'], 3),
+    ('pelvis', 'ಸೊಂಟ', "Women's Health", ['Gynecology'], 4),
+    ('jaw', 'ದವಡೆ', 'General', ['General Medicine'], 3),
+    ('mouth', 'ಬಾಯಿ', 'General', ['General Medicine'], 2),
+    ('tooth', 'ಹಲ್ಲು', 'General', ['General Medicine'], 2)
+]
+
+# (English, Kannada, urgency delta, synonym)
+SENSATIONS = [
+    ('pain', 'ನೋವು', 1, 'ache'),
+    ('swelling', 'ಊತ', 0, 'puffiness'),
+    ('burning', 'ಉರಿ', 1, 'burning sensation'),
+    ('itching', 'ತುರಿಕೆ', -1, 'itchiness'),
+    ('numbness', 'ಮರಗಟ್ಟುವಿಕೆ', 1, 'loss of feeling'),
+    ('stiffness', 'ಬಿಗಿತ', 0, 'tightness'),
+    ('cramps', 'ಸೆಳೆತ', 0, 'spasms'),
+    ('bleeding', 'ರಕ್ತಸ್ರಾವ', 3, 'blood loss'),
+    ('weakness', 'ದೌರ್ಬಲ್ಯ', 1, 'feebleness'),
+    ('tingling', 'ಜುಮ್ಮೆನಿಸುವಿಕೆ', 0, 'pins and needles'),
+    ('redness', 'ಕೆಂಪು', -1, 'inflammation'),
+    ('pressure', 'ಒತ್ತಡ', 1, 'heaviness'),
+    ('throbbing', 'ಮಿಡಿತ', 1, 'pulsing pain'),
+    ('tenderness', 'ಸೂಕ್ಷ್ಮತೆ', 0, 'soreness'),
+    ('discharge', 'ಸ್ರಾವ', 0, 'fluid leak'),
+    ('rash', 'ದದ್ದು', -1, 'eruption')
+]
+
+# (English, Kannada, urgency delta); the empty modifier keeps plain names
+MODIFIERS = [
+    ('', '', 0),
+    ('severe', 'ತೀವ್ರ', 2),
+    ('mild', 'ಸೌಮ್ಯ', -2),
+    ('sharp', 'ಚುಚ್ಚುವ', 1),
+    ('dull', 'ಮಂದ', -1),
+    ('recurring', 'ಮರುಕಳಿಸುವ', 0),
+    ('constant', 'ನಿರಂತರ', 1),
+    ('radiating', 'ಹರಡುವ', 1),
+    ('intermittent', 'ಆಗಾಗ್ಗೆ', 0),
+    ('crushing', 'ಹಿಂಡುವ', 2),
+    ('stabbing', 'ಇರಿಯುವ', 1),
+    ('slight', 'ಸ್ವಲ್ಪ', -2),
+    ('localized', 'ಸ್ಥಳೀಯ', 0)
+]
+
+# (English, Kannada, urgency delta, English precedes the name)
+ONSETS = [
+    ('', '', 0, True),
+    ('sudden', 'ಹಠಾತ್', 2, True),
+    ('chronic', 'ದೀರ್ಘಕಾಲದ', -1, True),
+    ('after injury', 'ಗಾಯದ ನಂತರ', 1, False),
+    ('at night', 'ರಾತ್ರಿಯ', 0, False),
+    ('after eating', 'ಊಟದ ನಂತರ', 0, False),
+    ('during exercise', 'ವ್ಯಾಯಾಮದ ಸಮಯದಲ್ಲಿ', 1, False),
+    ('on waking', 'ಎಚ್ಚರವಾದಾಗ', 0, False),
+    ('in children', 'ಮಕ್ಕಳಲ್ಲಿ', 1, False)
+]
+
+FIRST_AID = {
+    'Cardiac': ['Sit down and rest immediately', 'Loosen tight clothing', 'Call emergency services immediately',
+                'Do not drive yourself to hospital', 'Stay calm and breathe slowly'],
+    'Neurological': ['Rest in a quiet, dark room', 'Note when the symptoms started', 'Avoid screens and bright light',
+                     'Do not drive until assessed', 'Stay hydrated'],
+    'Musculoskeletal': ['Rest the affected area', 'Apply ice for 15-20 minutes', 'Keep the area elevated',
+                        'Avoid lifting heavy objects', 'Use a compression bandage if swollen'],
+    'Gastrointestinal': ['Sip water or oral rehydration solution', 'Eat small, bland meals', 'Avoid spicy and oily food',
+                         'Rest and avoid strenuous activity', 'Avoid alcohol'],
+    'ENT': ['Gargle with warm salt water', 'Avoid inserting objects into the ear or nose', 'Stay hydrated',
+            'Use steam inhalation', 'Rest your voice'],
+    'Ophthalmology': ['Do not rub the eye', 'Rinse gently with clean water', 'Avoid wearing contact lenses',
+                      'Protect the eye from bright light', 'Do not use eye drops without advice'],
+    'Dermatology': ['Keep the area clean and dry', 'Avoid scratching', 'Wear loose cotton clothing',
+                    'Apply a cool compress', 'Avoid new soaps or cosmetics'],
+    'Respiratory': ['Sit upright', 'Use prescribed inhaler if available', 'Avoid smoke and dust',
+                    'Breathe slowly through pursed lips', 'Seek fresh air'],
+    'Urological': ['Drink plenty of water', 'Do not hold urine for long', 'Avoid caffeine',
+                   'Apply a warm compress to the lower back', 'Note any change in urine colour'],
+    "Women's Health": ['Rest lying on your side', 'Apply a warm compress to the lower abdomen', 'Stay hydrated',
+                       'Note the timing of symptoms', 'Avoid strenuous activity'],
+    'General': ['Rinse the mouth with warm salt water', 'Avoid very hot or cold food', 'Rest and stay hydrated',
+                'Monitor your symptoms', 'Avoid self-medication']
+}
+
+RED_FLAGS = {
+    'Cardiac': ['Pain spreading to arm, neck, or jaw', 'Shortness of breath', 'Sweating', 'Fainting',
+                'Irregular heartbeat'],
+    'Neurological': ['Weakness on one side of the body', 'Slurred speech', 'Confusion', 'Loss of consciousness',
+                     'Worst headache of life'],
+    'Musculoskeletal': ['Visible deformity', 'Unable to bear weight', 'Loss of sensation', 'High fever',
+                        'Severe swelling'],
+    'Gastrointestinal': ['Vomiting blood', 'Black or bloody stools', 'Rigid abdomen', 'High fever',
+                         'Signs of dehydration'],
+    'ENT': ['Difficulty breathing', 'Difficulty swallowing', 'Sudden hearing loss', 'High fever',
+            'Bleeding that will not stop'],
+    'Ophthalmology': ['Sudden vision loss', 'Chemical exposure', 'Severe eye pain', 'Seeing flashes of light',
+                      'Eye injury'],
+    'Dermatology': ['Rapidly spreading rash', 'Swelling of face or lips', 'Blistering skin', 'High fever',
+                    'Difficulty breathing'],
+    'Respiratory': ['Blue lips or fingernails', 'Unable to speak in full sentences', 'Chest pain',
+                    'Coughing up blood', 'Confusion'],
+    'Urological': ['Blood in urine', 'Unable to pass urine', 'High fever with chills', 'Severe flank pain',
+                   'Vomiting'],
+    "Women's Health": ['Heavy bleeding', 'Severe abdominal pain', 'Fainting', 'High fever',
+                       'Pain during pregnancy'],
+    'General': ['Swelling of the face', 'Difficulty opening the mouth', 'High fever', 'Difficulty swallowing',
+                'Bleeding that will not stop']
+}
+
+
+def _urgency(score):
+    if score >= 8:
+        return 'HIGH'
+    if score >= 5:
+        return 'MEDIUM'
+    return 'LOW'
+
+
+def _compose(site, sensation, modifier, onset):
+    """Name, Kannada name, keywords and urgency score of one combination"""
+    site_en, site_kn, _, _, base = site
+    sensation_en, sensation_kn, sensation_delta, synonym = sensation
+    modifier_en, modifier_kn, modifier_delta = modifier
+    onset_en, onset_kn, onset_delta, onset_first = onset
+
+    core = ' '.join(part for part in (modifier_en, site_en, sensation_en) if part)
+    if onset_en:
+        name = f'{onset_en} {core}' if onset_first else f'{core} {onset_en}'
+    else:
+        name = core
+    kannada = ' '.join(part for part in (onset_kn, modifier_kn, site_kn, sensation_kn) if part)
+
+    keywords = [
+        name,
+        f'{site_en} {sensation_en}',
+        f'{sensation_en} in {site_en}',
+        f'{site_en} {synonym}',
+        f'{synonym} in {site_en}'
+    ]
+    if modifier_en:
+        keywords.append(f'{modifier_en} {sensation_en}')
+    if onset_en:
+        keywords.append(f'{site_en} {sensation_en} {onset_en}' if not onset_first else f'{onset_en} {sensation_en}')
+
+    score = max(1, min(10, base + sensation_delta + modifier_delta + onset_delta))
+    return name, kannada, list(dict.fromkeys(keywords)), score
+
+
+def generate_symptoms(count, seed=7, include_base=True):
+    """
+    Build a catalogue of `count` symptoms
+
+    Args:
+        count: Number of symptoms in the catalogue
+        seed: Random seed; the same count and seed give the same catalogue
+        include_base: Start with the real data/symptoms.json entries
+
+    Returns:
+        dict: {'symptoms': [...], 'categories': [...]} in the symptoms.json schema
+    """
+    with open(SYMPTOMS_PATH, 'r', encoding='utf-8') as f:
+        base = json.load(f)
+
+    rng = random.Random(seed)
+    symptoms = list(base['symptoms'])[:count] if include_base else []
+    combinations = list(product(range(len(SITES)), range(len(SENSATIONS)),
+                                range(len(MODIFIERS)), range(len(ONSETS))))
+    rng.shuffle(combinations)
+
+    names_by_site = {}
+    generated = []
+    while len(symptoms) + len(generated) < count:
+        position = len(generated)
+        site_index, sensation_index, modifier_index, onset_index = combinations[position % len(combinations)]
+        site = SITES[site_index]
+        _, _, category, specialties, _ = site
+        name, kannada, keywords, score = _compose(
+            site, SENSATIONS[sensation_index], MODIFIERS[modifier_index], ONSETS[onset_index]
+        )
+
+        # Catalogues larger than the combination space repeat names as types
+        repeat = position // len(combinations)
+        if repeat:
+            name = f'{name} type {repeat + 1}'
+            keywords[0] = name
+
+        title = name.title()
+        names_by_site.setdefault(site_index, []).append(name)
+        generated.append({
+            'id': f'synth_{position + 1:06d}',
+            'name': title,
+            'kannada': kannada,
+            'keywords': keywords,
+            'specialties': list(specialties),
+            'urgency': _urgency(score),
+            'urgency_score': score,
+            'category': category,
+            'description': f'{title} may point to a {category.lower()} condition and should be assessed '
+                           f'in {specialties[0]}.',
+            'first_aid': rng.sample(FIRST_AID[category], rng.randint(3, 5)),
+            'red_flags': rng.sample(RED_FLAGS[category], rng.randint(3, 5)),
+            '_site': site_index
+        })
+
+    for symptom in generated:
+        siblings = names_by_site[symptom.pop('_site')]
+        related = rng.sample(siblings, min(len(siblings), rng.randint(2, 4)))
+        symptom['related_symptoms'] = [name for name in related if name != symptom['name'].lower()]
+
+    return {'symptoms': symptoms + generated, 'categories': list(base['categories'])}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--count', type=int, required=True, help='number of symptoms')
+    parser.add_argument('--output', help='output path (default: stdout)')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--no-base', action='store_true',
+                        help='generate every symptom instead of starting from data/symptoms.json')
+    args = parser.parse_args()
+
+    catalogue = generate_symptoms(args.count, seed=args.seed, include_base=not args.no_base)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(catalogue, f, ensure_ascii=False, indent=2)
+        print(f"Wrote {len(catalogue['symptoms'])} symptoms to {args.output}")
+    else:
+        json.dump(catalogue, sys.stdout, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
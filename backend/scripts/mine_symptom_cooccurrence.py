@@ -0,0 +1,73 @@
+"""
+Mine symptom co-occurrence from search history
+
+Runs every stored SearchHistory description through the rule-based
+matcher (no Azure OpenAI calls) and counts how often each pair of catalogue
+symptoms is matched by the same search. The analyzer weights its
+related-symptom graph with these counts; it picks up a new file through
+its usual data-file change check. Run it periodically, e.g. nightly.
+
+Usage (from the backend directory):
+    python scripts/mine_symptom_cooccurrence.py [--output PATH] [--batch-size 1000]
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from datetime import datetime
+from itertools import combinations
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import app
+from models.symptom_analyzer import COOCCURRENCE_FORMAT_VERSION, COOCCURRENCE_PATH, SymptomAnalyzer
+from models.user_model import SearchHistory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--output', default=COOCCURRENCE_PATH, help='co-occurrence counts path')
+    parser.add_argument('--batch-size', type=int, default=1000, help='rows fetched per query')
+    args = parser.parse_args()
+
+    analyzer = SymptomAnalyzer(snapshot_path='')
+    pairs = Counter()
+    searches = 0
+    matched_searches = 0
+
+    with app.app_context():
+        rows = SearchHistory.query.with_entities(SearchHistory.symptoms).yield_per(args.batch_size)
+        for (text,) in rows:
+            searches += 1
+            cleaned_text = analyzer._clean_text(text or '')
+            if not cleaned_text:
+                continue
+            symptom_ids = sorted({
+                symptom['id'] for symptom in analyzer._match_symptoms(cleaned_text, 'en') if symptom.get('id')
+            })
+            if symptom_ids:
+                matched_searches += 1
+            pairs.update(combinations(symptom_ids, 2))
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'format_version': COOCCURRENCE_FORMAT_VERSION,
+            'generated_at': datetime.utcnow().isoformat(),
+            'dataset_version': analyzer.dataset_version,
+            'searches': searches,
+            'pairs': [[a, b, count] for (a, b), count in pairs.most_common()]
+        }, f)
+
+    print(json.dumps({
+        'output': os.path.abspath(args.output),
+        'searches': searches,
+        'matched_searches': matched_searches,
+        'pairs': len(pairs)
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Train the local triage classifier
+
+Fits the naive Bayes urgency/specialty model on the symptom catalogue
+plus every Azure OpenAI outcome logged so far (outcome logging is opt-in
+via AI_OUTCOME_LOGGING), and writes the versioned artifact the analyzer
+loads at startup. The analyzer only lets the model skip Azure OpenAI when
+it was trained on logged outcomes. The artifact records the dataset version
+it was trained against; the analyzer retrains from the catalogue alone if
+the catalogue has changed since.
+
+Usage (from the backend directory):
+    python scripts/train_triage_classifier.py [--output PATH] [--outcomes PATH] [--no-outcomes]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from models.symptom_analyzer import AI_OUTCOME_LOG_PATH, TRIAGE_MODEL_PATH, SymptomAnalyzer
+from utils.triage_classifier import TriageClassifier, load_ai_outcomes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--output', default=TRIAGE_MODEL_PATH, help='artifact path')
+    parser.add_argument('--outcomes', default=AI_OUTCOME_LOG_PATH, help='logged AI outcomes (JSONL)')
+    parser.add_argument('--no-outcomes', action='store_true', help='train on the catalogue only')
+    args = parser.parse_args()
+
+    analyzer = SymptomAnalyzer()
+    samples = analyzer.classifier_training_samples()
+    catalogue_count = len(samples)
+
+    if not args.no_outcomes and args.outcomes:
+        samples += load_ai_outcomes(args.outcomes)
+
+    classifier = TriageClassifier().fit(samples, analyzer.dataset_version)
+    classifier.metadata['catalogue_samples'] = catalogue_count
+    classifier.metadata['outcome_samples'] = len(samples) - catalogue_count
+    classifier.metadata['trained_on_outcomes'] = len(samples) > catalogue_count
+    classifier.save(args.output)
+
+    print(json.dumps({'output': os.path.abspath(args.output), **classifier.metadata}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -63,6 +63,36 @@ class Analytics:
             self.data['last_updated'] = datetime.utcnow().isoformat()
             self.save()
     
+    def track_symptom_batch(self, searches, response_time_ms, language='en'):
+        """
+        Track a batch of symptom searches with a single file write
+        
+        Args:
+            searches: List of (symptoms text, urgency) tuples
+            response_time_ms: Total time taken by the batch
+            language: Language code of the batch
+        """
+        if not searches:
+            return
+        
+        with self.lock:
+            self.data['total_searches'] += len(searches)
+            self.data['languages_used'][language] = self.data['languages_used'].get(language, 0) + len(searches)
+            self.data['avg_response_time_ms'].append(response_time_ms / len(searches))
+            
+            if len(self.data['avg_response_time_ms']) > 1000:
+                self.data['avg_response_time_ms'] = self.data['avg_response_time_ms'][-1000:]
+            
+            self.data['time_saved_minutes'] += 30 * len(searches)
+            
+            for symptoms, urgency in searches:
+                self.data['searches_by_urgency'][urgency] += 1
+                symptom_key = symptoms.lower()[:100]
+                self.data['top_symptoms'][symptom_key] = self.data['top_symptoms'].get(symptom_key, 0) + 1
+            
+            self.data['last_updated'] = datetime.utcnow().isoformat()
+            self.save()
+    
     def track_emergency_use(self):
         """Track emergency mode activation"""
         with self.lock:
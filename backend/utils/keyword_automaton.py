@@ -0,0 +1,163 @@
+"""
+Multi-pattern keyword matching for symptom text
+Aho-Corasick automaton with word-boundary aware hit reporting
+"""
+
+from typing import Any, Dict, Iterator, List, Tuple
+
+from utils.text_normalizer import is_word_char
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a fixed set of keywords
+
+    Patterns are added once at load time and compiled with `build()`.
+    A single left-to-right pass over the text then reports every
+    occurrence of every pattern, so the cost of a lookup depends on the
+    length of the text and the number of hits, not on the number of
+    patterns in the automaton.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[Tuple[int, Any]]] = [[]]
+        self._built = False
+        self.pattern_count = 0
+
+    def add(self, pattern: str, payload: Any) -> None:
+        """
+        Register a pattern with an arbitrary payload
+
+        Args:
+            pattern: Text to search for (matched case-sensitively)
+            payload: Value reported back with every hit of this pattern
+        """
+        if not pattern:
+            return
+
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+
+        self._outputs[state].append((len(pattern), payload))
+        self.pattern_count += 1
+        self._built = False
+
+    def build(self) -> None:
+        """Compute failure links and merge outputs along them (BFS order)"""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+
+                # States are visited in BFS order, so the failure target
+                # already carries the outputs of its own suffix chain.
+                if self._outputs[self._fail[next_state]]:
+                    self._outputs[next_state] = (
+                        self._outputs[next_state] + self._outputs[self._fail[next_state]]
+                    )
+
+        self._built = True
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, Any, bool]]:
+        """
+        Scan text once and yield every pattern occurrence
+
+        Args:
+            text: Text to scan
+
+        Yields:
+            (start, end, payload, whole_word) tuples where `whole_word`
+            is True when both ends of the hit sit on a `\\b` boundary
+        """
+        if not self._built:
+            self.build()
+
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        state = 0
+
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            if not outputs[state]:
+                continue
+
+            end = position + 1
+            for length, payload in outputs[state]:
+                start = end - length
+                yield start, end, payload, (
+                    _is_boundary(text, start) and _is_boundary(text, end)
+                )
+
+    def resume(self, text: str, start: int, state: int = 0) -> Tuple[int, List[Tuple[int, int, Any, bool]]]:
+        """
+        Continue a scan over text that has grown since the last call
+
+        Only text[start:] is consumed, starting from the state the previous
+        scan ended in; hits may begin before `start`. Boundaries are judged
+        against the whole text, with its end counting as a boundary.
+
+        Args:
+            text: Entire text so far
+            start: Number of characters already consumed
+            state: State returned by the previous call (0 for a new text)
+
+        Returns:
+            tuple: (state after the text, list of (start, end, payload,
+            whole_word) hits ending in the new characters)
+        """
+        if not self._built:
+            self.build()
+
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        hits = []
+
+        for position in range(start, len(text)):
+            char = text[position]
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            if outputs[state]:
+                end = position + 1
+                for length, payload in outputs[state]:
+                    hit_start = end - length
+                    hits.append((hit_start, end, payload, (
+                        _is_boundary(text, hit_start) and _is_boundary(text, end)
+                    )))
+
+        return state, hits
+
+
+def _is_boundary(text: str, index: int) -> bool:
+    """True when `index` sits between a word and a non-word character"""
+    before = index > 0 and is_word_char(text[index - 1])
+    after = index < len(text) and is_word_char(text[index])
+    return before != after
@@ -0,0 +1,171 @@
+"""
+Compiled knowledge snapshot
+Versioned binary file holding datasets and their precomputed indexes
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import struct
+import sys
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b'HBKS'
+
+# Bump when the file layout changes; older snapshots are ignored. Changes to
+# the code a section is built by are caught by its code fingerprint.
+SNAPSHOT_FORMAT_VERSION = 4
+
+# Magic, format version, header length
+_PREAMBLE = struct.Struct('<4sHI')
+
+DEFAULT_SNAPSHOT_PATH = os.getenv(
+    'KNOWLEDGE_SNAPSHOT_PATH',
+    os.path.join(os.path.dirname(__file__), '..', 'instance', 'knowledge.snapshot')
+)
+
+
+def source_fingerprint(paths: Iterable[str]) -> str:
+    """Short content hash of the source data files (missing files hash as such)"""
+    digest = hashlib.sha256()
+    for path in paths:
+        try:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(b'unavailable')
+    return digest.hexdigest()[:16]
+
+
+def code_fingerprint(objects: Iterable[Any]) -> str:
+    """
+    Short hash of the source of the modules defining the given classes or
+    functions
+
+    Pickled sections hold instances of these classes and indexes laid out by
+    this code; a section compiled by other code must not be loaded.
+    """
+    paths = sorted({sys.modules[obj.__module__].__file__ for obj in objects})
+    return source_fingerprint(paths)
+
+
+def section_version(dataset_version: str, code_version: str) -> str:
+    """Version a snapshot section is stored and looked up under"""
+    return f'{dataset_version}+{code_version}'
+
+
+def write_snapshot(path: str, sections: Dict[str, Tuple[str, Dict[str, Any]]]) -> Dict:
+    """
+    Write a snapshot file
+
+    Layout: preamble (magic, format version, header length), a JSON
+    header describing each section, then each section as a pickle. The
+    header records every section's offset, length, SHA-256 and the
+    dataset version it was compiled from, so a reader can validate and
+    load one section without touching the others.
+
+    Args:
+        path: Output file
+        sections: section name -> (section version, state dict)
+
+    Returns:
+        dict: The header that was written
+    """
+    payloads = []
+    header = {
+        'format_version': SNAPSHOT_FORMAT_VERSION,
+        'created_at': datetime.utcnow().isoformat(),
+        'sections': {}
+    }
+
+    offset = 0
+    for name, (dataset_version, state) in sections.items():
+        payload = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        header['sections'][name] = {
+            'dataset_version': dataset_version,
+            'offset': offset,
+            'length': len(payload),
+            'sha256': hashlib.sha256(payload).hexdigest()
+        }
+        payloads.append(payload)
+        offset += len(payload)
+
+    header_bytes = json.dumps(header).encode('utf-8')
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    # Write then rename, so workers never read a half-written snapshot
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(_PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        for payload in payloads:
+            f.write(payload)
+    os.replace(temp_path, path)
+
+    return header
+
+
+def load_snapshot_section(path: str, section: str, dataset_version: str,
+                          required: Iterable[str] = ()) -> Optional[Dict[str, Any]]:
+    """
+    Load one section if it is valid for the current dataset
+
+    Args:
+        path: Snapshot file
+        section: Section name
+        dataset_version: Section version of the data files and code the
+            caller would build from (see section_version)
+        required: State keys the caller needs (a snapshot built by an older
+            release may lack newer indexes)
+
+    Returns:
+        dict: The section's state, or None when the snapshot is missing,
+        of another format, compiled from other data or fails its checksum
+        (the caller then builds from JSON)
+    """
+    if not path:
+        return None
+
+    try:
+        with open(path, 'rb') as f:
+            magic, format_version, header_length = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+            if magic != SNAPSHOT_MAGIC or format_version != SNAPSHOT_FORMAT_VERSION:
+                logger.warning(f"Ignoring knowledge snapshot {path}: unsupported format")
+                return None
+
+            header = json.loads(f.read(header_length))
+            entry = header['sections'].get(section)
+            if entry is None:
+                return None
+            if entry['dataset_version'] != dataset_version:
+                logger.info(f"Knowledge snapshot section '{section}' is stale, building from JSON")
+                return None
+
+            f.seek(_PREAMBLE.size + header_length + entry['offset'])
+            payload = f.read(entry['length'])
+    except FileNotFoundError:
+        return None
+    except (OSError, struct.error, ValueError, KeyError) as e:
+        logger.warning(f"Could not read knowledge snapshot {path}: {e}")
+        return None
+
+    if hashlib.sha256(payload).hexdigest() != entry['sha256']:
+        logger.warning(f"Knowledge snapshot section '{section}' failed its checksum, building from JSON")
+        return None
+
+    try:
+        state = pickle.loads(payload)
+    except Exception as e:
+        logger.warning(f"Could not unpickle knowledge snapshot section '{section}': {e}")
+        return None
+
+    missing = [key for key in required if key not in state]
+    if missing:
+        logger.info(f"Knowledge snapshot section '{section}' lacks {missing}, building from JSON")
+        return None
+    return state
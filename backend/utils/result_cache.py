@@ -0,0 +1,97 @@
+"""
+Bounded in-process caching
+Thread-safe LRU cache with optional TTL and hit/miss/eviction counters
+"""
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """Least-recently-used cache with an optional time-to-live per entry"""
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: Optional[float] = None):
+        """
+        Args:
+            maxsize: Maximum number of entries kept before evicting the LRU one
+            ttl_seconds: Entry lifetime in seconds, None for no expiry
+        """
+        self.maxsize = max(1, int(maxsize))
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default on miss/expiry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Insert or refresh an entry, evicting the LRU entry when full"""
+        expires_at = None
+        if self.ttl_seconds is not None:
+            expires_at = time.monotonic() + self.ttl_seconds
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry and return its value"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            return entry[0] if entry is not None else default
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (
+                entry[1] is None or entry[1] > time.monotonic()
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
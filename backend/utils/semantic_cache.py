@@ -0,0 +1,219 @@
+"""
+Near-duplicate caching for AI triage answers
+MinHash signatures with LSH banding over symptom token sets
+"""
+
+import time
+import zlib
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Mersenne prime for the universal hash family (a * x + b) mod p
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_HASH_MASK = np.uint64((1 << 32) - 1)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Jaccard similarity of two token sets"""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """Fixed family of hash permutations producing MinHash signatures"""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        # Coefficients below 2**32 keep a * x + b within uint64 for 32-bit x
+        self.a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+
+    def signature(self, tokens: Iterable[str]) -> np.ndarray:
+        """MinHash signature (num_perm,) of a non-empty token set"""
+        hashes = np.fromiter(
+            (zlib.crc32(token.encode('utf-8')) for token in tokens),
+            dtype=np.uint64
+        )
+        permuted = (np.outer(hashes, self.a) + self.b) % _MERSENNE_PRIME
+        return (permuted & _HASH_MASK).min(axis=0)
+
+
+class SemanticCache:
+    """
+    Bounded near-duplicate cache keyed on token sets
+
+    Each entry's MinHash signature is split into `bands` bands; entries
+    sharing any band bucket with a query are candidates, and a candidate
+    is a hit when its exact Jaccard similarity with the query reaches the
+    threshold configured for the cached answer's urgency (so HIGH answers
+    can demand closer wording than LOW ones). When the caller knows the
+    query's own urgency the stricter of the two thresholds applies, and an
+    answer less urgent than the query is never served. Entries are evicted
+    least recently used first and expire after `ttl_seconds`.
+    """
+
+    def __init__(self, maxsize: int = 2048, ttl_seconds: Optional[float] = None,
+                 thresholds: Optional[Dict[str, float]] = None, default_threshold: float = 0.8,
+                 num_perm: int = 64, bands: int = 16,
+                 urgency_order: Sequence[str] = ('LOW', 'MEDIUM', 'HIGH')):
+        """
+        Args:
+            maxsize: Maximum number of cached answers
+            ttl_seconds: Entry lifetime in seconds, None for no expiry
+            thresholds: Minimum Jaccard similarity per urgency level
+            default_threshold: Threshold for urgency levels not in `thresholds`
+            num_perm: MinHash signature length (must be divisible by `bands`)
+            bands: Number of LSH bands
+            urgency_order: Urgency levels from least to most urgent
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.maxsize = max(1, int(maxsize))
+        self.ttl_seconds = ttl_seconds
+        self.thresholds = dict(thresholds or {})
+        self.default_threshold = default_threshold
+        self.bands = bands
+        self._urgency_rank = {urgency: rank for rank, urgency in enumerate(urgency_order)}
+        self.rows = num_perm // bands
+        self._hasher = MinHasher(num_perm)
+        self._entries: "OrderedDict[FrozenSet[str], tuple]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, bytes], set] = {}
+        self._lock = Lock()
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _band_keys(self, signature: np.ndarray):
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def _threshold(self, urgency: Optional[str]) -> float:
+        return self.thresholds.get(urgency, self.default_threshold)
+
+    def get(self, tokens: FrozenSet[str], min_urgency: Optional[str] = None,
+            protected: Optional[Callable[[str], bool]] = None) -> Optional[Tuple[Any, float]]:
+        """
+        Find the most similar cached answer
+
+        Args:
+            tokens: Token set of the query
+            min_urgency: Urgency the query is already known to have; cached
+                answers ranked below it are skipped and its threshold applies
+                when stricter than the cached answer's
+            protected: Predicate for tokens that must not differ between the
+                query and a cached entry (e.g. symptom terms)
+
+        Returns:
+            (value, similarity) of the best candidate above its threshold,
+            or None on miss
+        """
+        if not tokens:
+            return None
+
+        signature = self._hasher.signature(tokens)
+        now = time.monotonic()
+
+        with self._lock:
+            # Exact token-set repeat needs no LSH lookup
+            candidates = {tokens} if tokens in self._entries else set()
+            if not candidates:
+                for band_key in self._band_keys(signature):
+                    candidates.update(self._buckets.get(band_key, ()))
+
+            floor = self._urgency_rank.get(min_urgency, -1) if min_urgency is not None else None
+            best_key, best_similarity = None, 0.0
+            for key in candidates:
+                _, value, urgency, expires_at = self._entries[key]
+                if expires_at is not None and expires_at <= now:
+                    self._remove(key)
+                    self.expirations += 1
+                    continue
+                if floor is not None and self._urgency_rank.get(urgency, -1) < floor:
+                    continue
+                similarity = jaccard(tokens, key)
+                threshold = self._threshold(urgency)
+                if min_urgency is not None:
+                    threshold = max(threshold, self._threshold(min_urgency))
+                if similarity < threshold or similarity <= best_similarity:
+                    continue
+                if protected is not None and any(protected(token) for token in tokens ^ key):
+                    continue
+                best_key, best_similarity = key, similarity
+
+            if best_key is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(best_key)
+            self.hits += 1
+            if best_similarity < 1.0:
+                self.near_hits += 1
+            return self._entries[best_key][1], best_similarity
+
+    def set(self, tokens: FrozenSet[str], value: Any, urgency: Optional[str] = None) -> None:
+        """Cache an answer for a token set, evicting the LRU entry when full"""
+        if not tokens:
+            return
+
+        signature = self._hasher.signature(tokens)
+        expires_at = None
+        if self.ttl_seconds is not None:
+            expires_at = time.monotonic() + self.ttl_seconds
+
+        with self._lock:
+            if tokens in self._entries:
+                self._remove(tokens)
+            self._entries[tokens] = (signature, value, urgency, expires_at)
+            for band_key in self._band_keys(signature):
+                self._buckets.setdefault(band_key, set()).add(tokens)
+
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: FrozenSet[str]) -> None:
+        """Drop an entry and its bucket memberships (lock held)"""
+        signature = self._entries.pop(key)[0]
+        for band_key in self._band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl_seconds': self.ttl_seconds,
+                'buckets': len(self._buckets),
+                'thresholds': {**self.thresholds, 'default': self.default_threshold},
+                'hits': self.hits,
+                'near_duplicate_hits': self.near_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,213 @@
+"""
+Spatial index for geographic points
+KD-tree over unit-sphere coordinates for nearest-k and radius queries
+"""
+
+import heapq
+import math
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Earth's radius in kilometers, as used by the haversine distances
+EARTH_RADIUS_KM = 6371.0
+
+# Points per leaf; leaves are scanned with one vectorized distance pass
+LEAF_SIZE = 32
+
+# Relative slack on squared chord bounds, so float rounding near a
+# boundary can never prune a point the haversine distance would keep
+_BOUND_SLACK = 1e-9
+
+
+def _unit_vector(lat: float, lng: float) -> Tuple[float, float, float]:
+    """Cartesian coordinates of a point on the unit sphere"""
+    lat_rad = math.radians(lat)
+    lng_rad = math.radians(lng)
+    cos_lat = math.cos(lat_rad)
+    return (cos_lat * math.cos(lng_rad), cos_lat * math.sin(lng_rad), math.sin(lat_rad))
+
+
+def _chord_squared(distance_km: float) -> float:
+    """Squared straight-line (chord) distance on the unit sphere for a surface distance"""
+    angle = min(max(distance_km, 0.0) / EARTH_RADIUS_KM, math.pi)
+    return 4.0 * math.sin(angle / 2) ** 2
+
+
+class GeoIndex:
+    """
+    Static KD-tree over latitude/longitude points
+
+    Points are projected onto the unit sphere, where the straight-line
+    distance between two points grows monotonically with their great-circle
+    (haversine) distance. Nearest neighbours and radius members in 3-D are
+    therefore exactly those on the globe, without the distortion of a
+    lat/lng grid. Queries descend the tree and prune subtrees by the split
+    planes, so they visit O(log n) nodes for small k.
+
+    Items are the integer ids passed to the constructor (e.g. positions in
+    a list); the index never holds the objects themselves, so it pickles
+    into the knowledge snapshot as a few flat arrays.
+    """
+
+    def __init__(self, items: Sequence[int], lats: Sequence[float], lngs: Sequence[float]):
+        """
+        Args:
+            items: Id of every point
+            lats, lngs: Their latitudes and longitudes (finite, in degrees)
+        """
+        self.size = len(items)
+        order = np.arange(self.size)
+        lat_rad = np.radians(np.asarray(lats, dtype=np.float64))
+        lng_rad = np.radians(np.asarray(lngs, dtype=np.float64))
+        cos_lat = np.cos(lat_rad)
+        coordinates = np.column_stack((cos_lat * np.cos(lng_rad), cos_lat * np.sin(lng_rad), np.sin(lat_rad)))
+
+        # Flat node table: split dimension (-1 for leaves), split value,
+        # children, and for leaves the [start, end) range of points
+        self._dims: List[int] = []
+        self._splits: List[float] = []
+        self._children: List[Tuple[int, int]] = []
+        self._ranges: List[Tuple[int, int]] = []
+        if self.size:
+            self._build(coordinates, order)
+
+        # Points in tree order, so every leaf is one contiguous slice
+        self.points = coordinates[order]
+        self.items = np.asarray(items, dtype=np.int64)[order]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _build(self, coordinates: np.ndarray, order: np.ndarray) -> None:
+        """Split ranges of `order` in place on their widest dimension"""
+        stack = [(self._add_node(), 0, self.size)]
+        while stack:
+            node, start, end = stack.pop()
+            self._ranges[node] = (start, end)
+            if end - start <= LEAF_SIZE:
+                continue
+
+            block = coordinates[order[start:end]]
+            dim = int(np.argmax(block.max(axis=0) - block.min(axis=0)))
+            middle = (end - start) // 2
+            partition = np.argpartition(block[:, dim], middle)
+            order[start:end] = order[start:end][partition]
+
+            left, right = self._add_node(), self._add_node()
+            self._dims[node] = dim
+            self._splits[node] = float(coordinates[order[start + middle], dim])
+            self._children[node] = (left, right)
+            stack.append((left, start, start + middle))
+            stack.append((right, start + middle, end))
+
+    def _add_node(self) -> int:
+        self._dims.append(-1)
+        self._splits.append(0.0)
+        self._children.append((0, 0))
+        self._ranges.append((0, 0))
+        return len(self._dims) - 1
+
+    def nearest(self, lat: float, lng: float, k: int) -> List[int]:
+        """
+        The k points closest to a location
+
+        Args:
+            lat, lng: Query location
+            k: Number of points to return
+
+        Returns:
+            list: Item ids, nearest first (fewer than k when the index is smaller)
+        """
+        if k < 1 or not self.size:
+            return []
+
+        query = np.array(_unit_vector(lat, lng))
+        # Max-heap of the best k so far: (-squared chord, tree position)
+        best: List[Tuple[float, int]] = []
+        stack = [(0, 0.0)]
+
+        while stack:
+            node, bound = stack.pop()
+            if len(best) == k and bound > -best[0][0]:
+                continue
+
+            dim = self._dims[node]
+            if dim < 0:
+                start, end = self._ranges[node]
+                distances = ((self.points[start:end] - query) ** 2).sum(axis=1)
+                for position, distance in enumerate(distances.tolist(), start):
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, -position))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, -position))
+                continue
+
+            offset = float(query[dim]) - self._splits[node]
+            left, right = self._children[node]
+            near, far = (left, right) if offset < 0 else (right, left)
+            # Far side first, so the near side is searched first
+            stack.append((far, max(bound, offset * offset)))
+            stack.append((near, bound))
+
+        best.sort(reverse=True)
+        return [int(self.items[-position]) for _, position in best]
+
+    def within(self, lat: float, lng: float, radius_km: float) -> List[int]:
+        """
+        Points within a surface distance of a location
+
+        The bound is inclusive and slightly generous: callers that need an
+        exact cut-off re-check the haversine distance of the returned items.
+
+        Args:
+            lat, lng: Query location
+            radius_km: Search radius in kilometers
+
+        Returns:
+            list: Item ids in no particular order
+        """
+        if not self.size or not radius_km >= 0:
+            return []
+
+        query = np.array(_unit_vector(lat, lng))
+        limit = _chord_squared(radius_km) * (1 + _BOUND_SLACK) + _BOUND_SLACK
+        found: List[np.ndarray] = []
+        stack = [(0, 0.0)]
+
+        while stack:
+            node, bound = stack.pop()
+            if bound > limit:
+                continue
+
+            dim = self._dims[node]
+            if dim < 0:
+                start, end = self._ranges[node]
+                distances = ((self.points[start:end] - query) ** 2).sum(axis=1)
+                found.append(self.items[start:end][distances <= limit])
+                continue
+
+            offset = float(query[dim]) - self._splits[node]
+            left, right = self._children[node]
+            near, far = (left, right) if offset < 0 else (right, left)
+            stack.append((far, max(bound, offset * offset)))
+            stack.append((near, bound))
+
+        return np.concatenate(found).tolist() if found else []
+
+    def stats(self) -> dict:
+        """Size and shape of the tree, for health and benchmark output"""
+        leaves = sum(1 for dim in self._dims if dim < 0)
+        return {'points': self.size, 'nodes': len(self._dims), 'leaves': leaves, 'leaf_size': LEAF_SIZE}
+
+
+def build_geo_index(points: Iterable[Tuple[int, Optional[float], Optional[float]]]) -> GeoIndex:
+    """Index the points with finite coordinates (others cannot be located)"""
+    items, lats, lngs = [], [], []
+    for item, lat, lng in points:
+        if (isinstance(lat, (int, float)) and isinstance(lng, (int, float))
+                and math.isfinite(lat) and math.isfinite(lng)):
+            items.append(item)
+            lats.append(lat)
+            lngs.append(lng)
+    return GeoIndex(items, lats, lngs)
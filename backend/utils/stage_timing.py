@@ -0,0 +1,171 @@
+"""
+Per-stage request timing
+Monotonic stage timers, Server-Timing headers and in-process histograms
+"""
+
+import os
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from contextvars import ContextVar
+from threading import Lock
+from typing import Dict, Optional
+
+from flask import Flask, g
+
+STAGE_TIMING_ENABLED = os.getenv('STAGE_TIMING_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
+# Histogram bucket upper bounds in milliseconds (the last bucket is unbounded)
+BUCKET_BOUNDS_MS = (
+    0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000
+)
+
+# Stage durations (name -> ms) of the request being served, None outside
+# an instrumented request
+_current_stages: ContextVar[Optional[Dict[str, float]]] = ContextVar('current_stages', default=None)
+
+_NOT_TIMED = nullcontext()
+
+
+class StageHistogram:
+    """Fixed-bucket latency histogram of one stage"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, duration_ms: float) -> None:
+        self.counts[bisect_left(BUCKET_BOUNDS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of samples"""
+        threshold = fraction * self.count
+        seen = 0
+        for position, count in enumerate(self.counts):
+            seen += count
+            if seen >= threshold and count:
+                return BUCKET_BOUNDS_MS[position] if position < len(BUCKET_BOUNDS_MS) else self.max_ms
+        return self.max_ms
+
+    def stats(self) -> Dict:
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'p50_ms': self.percentile(0.50),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': round(self.max_ms, 3),
+            'buckets': {
+                (f'le_{bound}' if position < len(BUCKET_BOUNDS_MS) else 'inf'): count
+                for position, (bound, count) in enumerate(zip(BUCKET_BOUNDS_MS + (None,), self.counts))
+            }
+        }
+
+
+class StageTimings:
+    """Per-stage histograms aggregated over every instrumented request"""
+
+    def __init__(self):
+        self._histograms: Dict[str, StageHistogram] = {}
+        self._lock = Lock()
+
+    def record(self, durations: Dict[str, float]) -> None:
+        with self._lock:
+            for name, duration_ms in durations.items():
+                histogram = self._histograms.get(name)
+                if histogram is None:
+                    histogram = self._histograms[name] = StageHistogram()
+                histogram.record(duration_ms)
+
+    def stats(self) -> Dict:
+        """Return per-stage latency statistics for monitoring"""
+        with self._lock:
+            return {
+                'enabled': STAGE_TIMING_ENABLED,
+                'stages': {name: histogram.stats() for name, histogram in self._histograms.items()}
+            }
+
+
+class _Stage:
+    """Times one stage into the current request's durations"""
+
+    __slots__ = ('durations', 'name', 'started')
+
+    def __init__(self, durations: Dict[str, float], name: str):
+        self.durations = durations
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        # A stage entered several times per request (e.g. one translation
+        # per field) reports its total
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        self.durations[self.name] = self.durations.get(self.name, 0.0) + elapsed_ms
+        return False
+
+
+def stage(name: str):
+    """
+    Context manager timing a pipeline stage of the current request
+
+    Outside a timed request (timing disabled, scripts, worker threads) it
+    is a shared no-op context.
+    """
+    durations = _current_stages.get()
+    if durations is None:
+        return _NOT_TIMED
+    return _Stage(durations, name)
+
+
+def server_timing_header(durations: Dict[str, float]) -> str:
+    """Format stage durations as a Server-Timing header value"""
+    return ', '.join(f'{name};dur={duration_ms:.2f}' for name, duration_ms in durations.items())
+
+
+stage_timings = StageTimings()
+
+
+def init_app(app: Flask) -> None:
+    """
+    Time every request's stages and report them
+
+    Requests that ran at least one timed stage get a Server-Timing header
+    listing each stage and the request total, and their durations are added
+    to `stage_timings`. Nothing is registered when STAGE_TIMING_ENABLED is off.
+    """
+    if not STAGE_TIMING_ENABLED:
+        return
+
+    @app.before_request
+    def start_stage_timing():
+        g.stage_timing = (_current_stages.set({}), time.perf_counter())
+
+    @app.after_request
+    def report_stage_timing(response):
+        timing = g.pop('stage_timing', None)
+        if timing is None:
+            return response
+        token, started = timing
+        durations = _current_stages.get()
+        _current_stages.reset(token)
+
+        if durations:
+            durations['total'] = (time.perf_counter() - started) * 1000
+            response.headers['Server-Timing'] = server_timing_header(durations)
+            stage_timings.record(durations)
+        return response
+
+    @app.teardown_request
+    def discard_stage_timing(_):
+        # Requests that failed before after_request ran
+        timing = g.pop('stage_timing', None)
+        if timing is not None:
+            _current_stages.reset(timing[0])
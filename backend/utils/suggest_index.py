@@ -0,0 +1,241 @@
+"""
+As-you-type symptom suggestions
+Sorted-array prefix index over English, native-script and romanized terms
+"""
+
+import math
+from bisect import bisect_left, insort
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Prefixes matching more keys than this have their best entry per symptom
+# precomputed in static rank order; any other prefix ranks its whole key range
+RANGE_SCAN_LIMIT = 256
+
+# Symptoms kept per precomputed prefix; larger limits scan the key range.
+# Callers' limits (SUGGEST_MAX_LIMIT) stay below it, leaving room for the
+# popularity walk.
+PREFIX_TOP_LIMIT = 64
+
+# Ranking weight of popularity relative to urgency_score (1-10)
+POPULARITY_WEIGHT = 1.5
+POPULARITY_MAX_BOOST = 6.0
+
+# Sentinel above every key sharing a prefix
+_PREFIX_END = '\U0010ffff'
+
+
+class SuggestionIndex:
+    """
+    Prefix lookup over catalogue terms
+
+    Every term is indexed under its own start and under the start of each
+    later word ("chest pain" is found by "che" and by "pai"). Keys are kept
+    in one sorted list, so the keys beginning with a prefix form a
+    contiguous range located with two bisections. Each key starts with a
+    one-character namespace, so differently normalized terms (plain text,
+    romanized phonetic keys) share the list without matching each other's
+    queries. Suggestions are ranked by term-start matches first, then by
+    urgency plus a popularity boost, then by term length.
+    """
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.entries: List[int] = []
+        self.terms: List[Tuple[str, str, str, int]] = []
+        self.urgency_scores: Dict[str, float] = {}
+        self._top_by_prefix: Dict[str, List[int]] = {}
+        self._symptom_index: Dict[str, int] = {}
+        self._symptom_urgency = np.zeros(0)
+        self._position_symptoms = np.zeros(0, dtype=np.int32)
+
+    def build(self, terms: Sequence[Tuple[str, str, str, str, str, int]]) -> 'SuggestionIndex':
+        """
+        Index catalogue terms
+
+        Args:
+            terms: (namespace, lookup key, display term, source, symptom id,
+                urgency score) tuples; the lookup key is the normalized form
+                queries in that namespace are compared against
+        """
+        pairs = []
+        for namespace, key, term, source, symptom_id, urgency_score in terms:
+            words = key.split()
+            if not words:
+                continue
+            term_id = len(self.terms)
+            self.terms.append((term, source, symptom_id, len(term)))
+            self.urgency_scores[symptom_id] = float(urgency_score)
+            for position in range(len(words)):
+                # Entry id encodes the term and whether it starts mid-term
+                pairs.append((namespace + ' '.join(words[position:]), term_id * 2 + (position > 0)))
+
+        pairs.sort()
+        self.keys = [key for key, _ in pairs]
+        self.entries = [entry for _, entry in pairs]
+        self._index_symptom_positions()
+        self._precompute_large_prefixes()
+        return self
+
+    def _index_symptom_positions(self) -> None:
+        """Symptom of every key position, to find popular symptoms under a prefix"""
+        for symptom_id in self.urgency_scores:
+            self._symptom_index[symptom_id] = len(self._symptom_index)
+        self._symptom_urgency = np.array(list(self.urgency_scores.values()), dtype=np.float64)
+        self._position_symptoms = np.array(
+            [self._symptom_index[self.terms[entry // 2][2]] for entry in self.entries], dtype=np.int32
+        )
+
+    def _precompute_large_prefixes(self) -> None:
+        """
+        Store the best entry of the first PREFIX_TOP_LIMIT symptoms in the
+        range, in static rank order, for every prefix matching more than
+        RANGE_SCAN_LIMIT keys
+
+        A symptom's entries share its popularity, so its best entry stays
+        its best once popularity is added at query time. A symptom past the
+        cap can only overtake the stored ones by popularity, so at query
+        time only popular symptoms are looked up beyond it. Large ranges are
+        found level by level: a prefix can only match many keys if the
+        prefix one character shorter does too.
+        """
+        order = sorted(set(self.entries), key=lambda e: self._rank(e, None))
+        static_rank = {entry: rank for rank, entry in enumerate(order)}
+        ranks = np.array([static_rank[entry] for entry in self.entries], dtype=np.int64)
+
+        large = [(0, len(self.keys))]
+        length = 1
+        while large:
+            length += 1
+            next_large = []
+            for start, end in large:
+                position = start
+                while position < end:
+                    if len(self.keys[position]) < length:
+                        position += 1
+                        continue
+                    prefix = self.keys[position][:length]
+                    stop = bisect_left(self.keys, prefix + _PREFIX_END, position, end)
+                    if stop - position > RANGE_SCAN_LIMIT:
+                        self._top_by_prefix[prefix] = self._best_per_symptom(
+                            position + np.argsort(ranks[position:stop], kind='stable')
+                        )
+                        next_large.append((position, stop))
+                    position = stop
+            large = next_large
+
+    def _best_per_symptom(self, positions: np.ndarray) -> List[int]:
+        top, symptoms = [], set()
+        for position in positions:
+            entry = self.entries[position]
+            symptom_id = self.terms[entry // 2][2]
+            if symptom_id not in symptoms:
+                symptoms.add(symptom_id)
+                top.append(entry)
+                if len(top) >= PREFIX_TOP_LIMIT:
+                    break
+        return top
+
+    def _rank(self, entry: int, popularity: Optional[Mapping[str, int]]) -> Tuple:
+        term, _, symptom_id, term_length = self.terms[entry // 2]
+        score = self.urgency_scores[symptom_id]
+        if popularity:
+            count = popularity.get(symptom_id, 0)
+            if count:
+                score += min(POPULARITY_MAX_BOOST, POPULARITY_WEIGHT * math.log2(1 + count))
+        return (entry & 1, -score, term_length, term)
+
+    def _candidates(self, prefix: str, limit: int,
+                    popularity: Optional[Mapping[str, int]]) -> List[int]:
+        top = self._top_by_prefix.get(prefix)
+        if top is None or limit > PREFIX_TOP_LIMIT:
+            start = bisect_left(self.keys, prefix)
+            end = bisect_left(self.keys, prefix + _PREFIX_END, start)
+            return self.entries[start:end]
+        if not popularity:
+            return top[:limit]
+
+        # Walk the symptoms in static order until no later one could
+        # overtake the current limit-th best even with the largest boost
+        best = []
+        for entry in top:
+            symptom_id = self.terms[entry // 2][2]
+            if len(best) >= limit and \
+                    best[-1][0][:2] < (entry & 1, -(self.urgency_scores[symptom_id] + POPULARITY_MAX_BOOST)):
+                break
+            insort(best, (self._rank(entry, popularity), entry))
+            del best[limit:]
+        else:
+            if len(top) >= PREFIX_TOP_LIMIT:
+                for entry in self._popular_beyond(prefix, top, best[-1][0], popularity):
+                    insort(best, (self._rank(entry, popularity), entry))
+                    del best[limit:]
+        return [entry for _, entry in best]
+
+    def _popular_beyond(self, prefix: str, top: List[int], worst: Tuple,
+                        popularity: Mapping[str, int]) -> List[int]:
+        """Best entry under the prefix of each popular symptom past the stored ones that could rank above worst"""
+        indexes = np.fromiter((self._symptom_index.get(symptom_id, -1) for symptom_id in popularity),
+                              dtype=np.int64, count=len(popularity))
+        counts = np.fromiter(popularity.values(), dtype=np.float64, count=len(popularity))
+        known = (indexes >= 0) & (counts > 0)
+        indexes, counts = indexes[known], counts[known]
+        # A mid-term worst entry is beaten by any term-start entry
+        if worst[0] == 0:
+            scores = self._symptom_urgency[indexes] + \
+                np.minimum(POPULARITY_MAX_BOOST, POPULARITY_WEIGHT * np.log2(1 + counts))
+            indexes = indexes[scores >= -worst[1]]
+        stored = [self._symptom_index[self.terms[entry // 2][2]] for entry in top]
+        indexes = np.setdiff1d(indexes, stored)
+        if not len(indexes):
+            return []
+
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + _PREFIX_END, start)
+        positions = start + np.flatnonzero(np.isin(self._position_symptoms[start:end], indexes))
+
+        # A symptom's entries share its popularity, so its best entry in
+        # static order is its best
+        best: Dict[str, int] = {}
+        for position in positions:
+            entry = self.entries[position]
+            symptom_id = self.terms[entry // 2][2]
+            current = best.get(symptom_id)
+            if current is None or self._rank(entry, None) < self._rank(current, None):
+                best[symptom_id] = entry
+        return list(best.values())
+
+    def suggest(self, prefixes: Sequence[Tuple[str, str]], limit: int = 8,
+                popularity: Optional[Mapping[str, int]] = None) -> List[Dict]:
+        """
+        Suggest terms for what the user has typed so far
+
+        Args:
+            prefixes: (namespace, normalized input) pairs to look up, e.g.
+                the plain text and its romanized phonetic key
+            limit: Maximum number of suggestions (one per symptom)
+            popularity: symptom id -> selection count
+
+        Returns:
+            list of {'term', 'source', 'symptom_id'} best first
+        """
+        candidates = set()
+        for namespace, prefix in prefixes:
+            if prefix:
+                candidates.update(self._candidates(namespace + prefix, limit, popularity))
+
+        suggestions = []
+        seen = set()
+        for entry in sorted(candidates, key=lambda e: self._rank(e, popularity)):
+            term, source, symptom_id, _ = self.terms[entry // 2]
+            if symptom_id in seen:
+                continue
+            seen.add(symptom_id)
+            suggestions.append({'term': term, 'source': source, 'symptom_id': symptom_id})
+            if len(suggestions) >= limit:
+                break
+        return suggestions
+
+    def __len__(self) -> int:
+        return len(self.keys)
@@ -0,0 +1,159 @@
+"""
+Typo correction for symptom keywords
+SymSpell-style symmetric deletes index with bounded Damerau-Levenshtein checks
+"""
+
+from itertools import combinations
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+
+def edit_distance(source: str, target: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance (Damerau-Levenshtein with adjacent
+    transpositions), abandoned early once it exceeds max_distance
+
+    Args:
+        source, target: Strings to compare
+        max_distance: Largest distance of interest
+
+    Returns:
+        The distance, or max_distance + 1 if it is larger than max_distance
+    """
+    if source == target:
+        return 0
+    if abs(len(source) - len(target)) > max_distance:
+        return max_distance + 1
+
+    previous_previous = None
+    previous = list(range(len(target) + 1))
+
+    for i in range(1, len(source) + 1):
+        current = [i] + [0] * len(target)
+        row_minimum = i
+
+        for j in range(1, len(target) + 1):
+            cost = 0 if source[i - 1] == target[j - 1] else 1
+            value = min(
+                previous[j] + 1,          # deletion
+                current[j - 1] + 1,       # insertion
+                previous[j - 1] + cost    # substitution
+            )
+            if (previous_previous is not None and i > 1 and j > 1
+                    and source[i - 1] == target[j - 2]
+                    and source[i - 2] == target[j - 1]):
+                value = min(value, previous_previous[j - 2] + 1)  # transposition
+            current[j] = value
+            row_minimum = min(row_minimum, value)
+
+        if row_minimum > max_distance:
+            return max_distance + 1
+
+        previous_previous, previous = previous, current
+
+    distance = previous[len(target)]
+    return distance if distance <= max_distance else max_distance + 1
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """All strings obtained by deleting up to max_distance characters"""
+    results = {word}
+    for count in range(1, min(max_distance, len(word)) + 1):
+        for positions in combinations(range(len(word)), count):
+            skip = set(positions)
+            results.add(''.join(c for i, c in enumerate(word) if i not in skip))
+    return results
+
+
+class SymSpellIndex:
+    """
+    Precomputed deletes dictionary for constant-time typo lookup
+
+    Every vocabulary word is indexed under each string reachable by
+    deleting up to `max_edit_distance` characters. Looking up a misspelled
+    token only generates the deletes of that token and verifies the few
+    candidate words that share one, so lookup cost depends on the token
+    length, not on the vocabulary size.
+    """
+
+    def __init__(self, max_edit_distance: int = 2):
+        self.max_edit_distance = max_edit_distance
+        self._deletes: Dict[str, Set[str]] = {}
+        self._frequencies: Dict[str, int] = {}
+
+    def add_word(self, word: str, count: int = 1) -> None:
+        """Add a vocabulary word (repeated adds raise its frequency)"""
+        if not word:
+            return
+
+        if word in self._frequencies:
+            self._frequencies[word] += count
+            return
+
+        self._frequencies[word] = count
+        for deleted in _deletes(word, self.max_edit_distance):
+            self._deletes.setdefault(deleted, set()).add(word)
+
+    def add_words(self, words: Iterable[str]) -> None:
+        """Add every word of an iterable"""
+        for word in words:
+            self.add_word(word)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._frequencies
+
+    def __len__(self) -> int:
+        return len(self._frequencies)
+
+    @property
+    def delete_count(self) -> int:
+        """Number of distinct delete keys in the index"""
+        return len(self._deletes)
+
+    def lookup(self, term: str, max_distance: Optional[int] = None,
+               unique: bool = False) -> Optional[Tuple[str, int]]:
+        """
+        Find the closest vocabulary word to term
+
+        Args:
+            term: Possibly misspelled token
+            max_distance: Maximum edit distance (capped at the index maximum)
+            unique: Return None when several words share the smallest
+                distance, instead of breaking the tie
+
+        Returns:
+            (word, distance) for the best candidate, ties broken by word
+            frequency then alphabetically, or None if nothing is close enough
+        """
+        if max_distance is None:
+            max_distance = self.max_edit_distance
+        max_distance = min(max_distance, self.max_edit_distance)
+
+        if term in self._frequencies:
+            return term, 0
+
+        best = None
+        best_key = None
+        tied = False
+        checked = set()
+
+        for deleted in _deletes(term, max_distance):
+            for word in self._deletes.get(deleted, ()):
+                if word in checked:
+                    continue
+                checked.add(word)
+
+                distance = edit_distance(term, word, max_distance)
+                if distance > max_distance:
+                    continue
+
+                key = (distance, -self._frequencies[word], word)
+                if best_key is not None and distance == best_key[0]:
+                    tied = True
+                if best_key is None or key < best_key:
+                    if best_key is not None and distance < best_key[0]:
+                        tied = False
+                    best, best_key = (word, distance), key
+
+        if unique and tied:
+            return None
+        return best
@@ -0,0 +1,138 @@
+"""
+Script-aware text normalization for symptom matching
+Keeps Indic combining marks intact and strips invisible joiners
+"""
+
+import re
+import unicodedata
+from typing import List, Sequence, Set
+
+# Zero-width characters that keyboards insert inside Indic words
+ZERO_WIDTH_CHARS = '\u200b\u200c\u200d\u2060\ufeff'
+
+# Unicode block of Kannada, the only regional script the catalogue has terms in
+KANNADA_SCRIPT_RANGE = (0x0C80, 0x0CFF)
+
+# Punctuation kept by the cleaner (sentence structure for the AI prompt)
+KEPT_PUNCTUATION = ',.'
+
+WORD_PATTERN = re.compile(r'[^\s,.]+')
+
+# Short Latin words the cleaner keeps ("no pulse" must not become "pulse")
+KEPT_SHORT_WORDS = ('i', 'a', 'no')
+
+# Apostrophes as typed on phone and desktop keyboards
+APOSTROPHES = "'\u2018\u2019\u02bc"
+
+# Negative contractions ("can't", "doesn't"); expanded before short words
+# are dropped, so "can't breathe" does not turn into "can breathe"
+CONTRACTION_PATTERN = re.compile(rf"\b(\w*?)n[{APOSTROPHES}]t\b")
+IRREGULAR_CONTRACTIONS = {'ca': 'cannot', 'wo': 'will not', 'sha': 'shall not'}
+
+# Other apostrophes join the word ("father's" -> "fathers")
+_APOSTROPHE_PATTERN = re.compile(rf"(?<=\w)[{APOSTROPHES}](?=\w)")
+
+# "cant" is how "can't" is usually typed in a hurry
+_CANT_PATTERN = re.compile(r'\bcant\b')
+
+# Words that negate the terms after them ("no fever", "I do not have chest
+# pain"), how many words a cue reaches, and words that end its reach ("no
+# fever but a rash"). "cannot" is not a cue: "cannot breathe" is a symptom.
+NEGATION_CUES = frozenset(['no', 'not', 'never', 'without', 'none', 'nothing', 'neither', 'nor', 'denies'])
+NEGATION_SCOPE = 4
+NEGATION_TERMINATORS = frozenset(['but', 'however', 'although', 'though', 'except', 'still', 'now'])
+
+
+def is_word_char(char: str) -> bool:
+    """Letters, digits, underscore and combining marks (vowel signs, viramas)"""
+    return char.isalnum() or char == '_' or unicodedata.category(char)[0] == 'M'
+
+
+class _CleaningTable(dict):
+    """
+    str.translate table filled lazily per code point
+
+    Zero-width characters are deleted, word characters (including combining
+    marks), whitespace and kept punctuation map to themselves, everything
+    else becomes a space. Each code point is classified once per process.
+    """
+
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        if char in ZERO_WIDTH_CHARS:
+            value = None
+        elif is_word_char(char) or char.isspace() or char in KEPT_PUNCTUATION:
+            value = codepoint
+        else:
+            value = ' '
+        self[codepoint] = value
+        return value
+
+
+_CLEANING_TABLE = _CleaningTable()
+_TERM_TABLE = {ord(char): None for char in ZERO_WIDTH_CHARS}
+
+
+def normalize_term(term: str) -> str:
+    """Normalize a catalogue keyword or regional term (NFC, lowercase, no joiners)"""
+    if not term:
+        return ''
+    return unicodedata.normalize('NFC', term).translate(_TERM_TABLE).lower().strip()
+
+
+def _expand_contraction(match: re.Match) -> str:
+    """Replacement for one negative contraction"""
+    stem = match.group(1)
+    return IRREGULAR_CONTRACTIONS.get(stem) or f'{stem} not'
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize free-text user input for matching
+
+    NFC-normalizes, lowercases, expands negative contractions ("can't" ->
+    "cannot", "isn't" -> "is not") and joins other apostrophes, deletes
+    zero-width joiners, replaces punctuation and symbols with spaces
+    (keeping combining marks, commas and full stops), collapses whitespace
+    and drops one- and two-letter Latin words other than "i", "a" and the
+    negation "no".
+    """
+    if not text:
+        return ''
+
+    text = unicodedata.normalize('NFC', text).lower()
+    text = CONTRACTION_PATTERN.sub(_expand_contraction, text)
+    text = _CANT_PATTERN.sub('cannot', _APOSTROPHE_PATTERN.sub('', text))
+    text = text.translate(_CLEANING_TABLE)
+
+    words = [
+        word for word in text.split()
+        if len(word) > 2 or word in KEPT_SHORT_WORDS or not word.isascii()
+    ]
+    return ' '.join(words)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split normalized text into word tokens"""
+    return WORD_PATTERN.findall(text)
+
+
+def negated_positions(tokens: Sequence[str]) -> Set[int]:
+    """Positions of the tokens that follow a negation cue within its scope"""
+    negated = set()
+    remaining = 0
+    for position, token in enumerate(tokens):
+        if token in NEGATION_CUES:
+            remaining = NEGATION_SCOPE
+        elif token in NEGATION_TERMINATORS:
+            remaining = 0
+        elif remaining:
+            negated.add(position)
+            remaining -= 1
+    return negated
+
+
+def is_kannada_script(text: str) -> bool:
+    """True when the text contains Kannada-script characters"""
+    low, high = KANNADA_SCRIPT_RANGE
+    return any(low <= ord(char) <= high for char in text)
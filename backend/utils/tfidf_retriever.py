@@ -0,0 +1,130 @@
+"""
+Character n-gram TF-IDF retrieval
+Offline free-text lookup for symptom descriptions that match no keyword
+"""
+
+import math
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+def char_ngrams(text: str, n: int = 3) -> List[str]:
+    """Character n-grams of each word, padded with spaces at word edges"""
+    ngrams = []
+    for word in text.split():
+        padded = f' {word} '
+        if len(padded) <= n:
+            ngrams.append(padded)
+            continue
+        ngrams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+    return ngrams
+
+
+class CharNgramRetriever:
+    """
+    Cosine-similarity retrieval over a sparse TF-IDF matrix
+
+    The matrix is stored column-major (n-gram -> documents), like a
+    CSC matrix: for n-gram column c, `doc_ids[indptr[c]:indptr[c + 1]]`
+    are the documents containing it and `weights[...]` their L2-normalized
+    TF-IDF weights. A query only touches the columns of its own n-grams,
+    so lookup cost grows with the query length and the posting lengths.
+    """
+
+    def __init__(self, n: int = 3):
+        self.n = n
+        self.vocabulary: Dict[str, int] = {}
+        self.idf = np.zeros(0, dtype=np.float32)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.doc_ids = np.zeros(0, dtype=np.int32)
+        self.weights = np.zeros(0, dtype=np.float32)
+        self.document_count = 0
+
+    def fit(self, documents: Sequence[str]) -> 'CharNgramRetriever':
+        """
+        Build the TF-IDF matrix
+
+        Args:
+            documents: One normalized text per retrievable item
+        """
+        self.document_count = len(documents)
+        term_counts: List[Dict[int, int]] = []
+        document_frequency: Dict[int, int] = {}
+
+        for document in documents:
+            counts: Dict[int, int] = {}
+            for ngram in char_ngrams(document, self.n):
+                column = self.vocabulary.setdefault(ngram, len(self.vocabulary))
+                counts[column] = counts.get(column, 0) + 1
+            for column in counts:
+                document_frequency[column] = document_frequency.get(column, 0) + 1
+            term_counts.append(counts)
+
+        # Smoothed inverse document frequency
+        self.idf = np.array([
+            math.log((1 + self.document_count) / (1 + document_frequency[column])) + 1
+            for column in range(len(self.vocabulary))
+        ], dtype=np.float32)
+
+        # Row-wise sublinear TF-IDF, L2-normalized, then transposed to columns
+        postings: List[List[Tuple[int, float]]] = [[] for _ in self.vocabulary]
+        for doc_id, counts in enumerate(term_counts):
+            row = {
+                column: (1 + math.log(count)) * float(self.idf[column])
+                for column, count in counts.items()
+            }
+            norm = math.sqrt(sum(value * value for value in row.values())) or 1.0
+            for column, value in row.items():
+                postings[column].append((doc_id, value / norm))
+
+        lengths = np.array([len(p) for p in postings], dtype=np.int64)
+        self.indptr = np.concatenate(([0], np.cumsum(lengths)))
+        self.doc_ids = np.array([d for p in postings for d, _ in p], dtype=np.int32)
+        self.weights = np.array([w for p in postings for _, w in p], dtype=np.float32)
+        return self
+
+    def query(self, text: str, top_k: int = 3, min_score: float = 0.0) -> List[Tuple[int, float]]:
+        """
+        Rank documents by cosine similarity to the text
+
+        Args:
+            text: Normalized query text
+            top_k: Number of results
+            min_score: Drop results scoring below this similarity
+
+        Returns:
+            [(document index, similarity)] best first
+        """
+        if not self.document_count:
+            return []
+
+        counts: Dict[int, int] = {}
+        for ngram in char_ngrams(text, self.n):
+            column = self.vocabulary.get(ngram)
+            if column is not None:
+                counts[column] = counts.get(column, 0) + 1
+
+        if not counts:
+            return []
+
+        columns = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        query_weights = (1 + np.log(tf)) * self.idf[columns]
+        query_weights /= np.linalg.norm(query_weights) or 1.0
+
+        scores = np.zeros(self.document_count, dtype=np.float32)
+        for column, weight in zip(columns, query_weights):
+            start, end = self.indptr[column], self.indptr[column + 1]
+            # Document ids are unique within a column, so fancy-index add is safe
+            scores[self.doc_ids[start:end]] += weight * self.weights[start:end]
+
+        top_k = min(top_k, self.document_count)
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best])]
+
+        return [
+            (int(doc_id), float(scores[doc_id]))
+            for doc_id in best
+            if scores[doc_id] > 0 and scores[doc_id] >= min_score
+        ]
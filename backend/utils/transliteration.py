@@ -0,0 +1,124 @@
+"""
+Offline romanization for regional-language symptom terms
+Kannada script -> Latin transliteration and phonetic keys for romanized input
+"""
+
+from functools import lru_cache
+from typing import List
+
+# Phonetic keys memoized per word (user input reuses a small vocabulary)
+PHONETIC_KEY_CACHE_SIZE = 65536
+
+# Independent vowels
+KANNADA_VOWELS = {
+    'ಅ': 'a', 'ಆ': 'a', 'ಇ': 'i', 'ಈ': 'i', 'ಉ': 'u', 'ಊ': 'u',
+    'ಋ': 'ru', 'ೠ': 'ru', 'ಎ': 'e', 'ಏ': 'e', 'ಐ': 'ai',
+    'ಒ': 'o', 'ಓ': 'o', 'ಔ': 'au'
+}
+
+# Consonants (inherent "a" is added by the transliterator)
+KANNADA_CONSONANTS = {
+    'ಕ': 'k', 'ಖ': 'kh', 'ಗ': 'g', 'ಘ': 'gh', 'ಙ': 'n',
+    'ಚ': 'ch', 'ಛ': 'chh', 'ಜ': 'j', 'ಝ': 'jh', 'ಞ': 'n',
+    'ಟ': 't', 'ಠ': 'th', 'ಡ': 'd', 'ಢ': 'dh', 'ಣ': 'n',
+    'ತ': 't', 'ಥ': 'th', 'ದ': 'd', 'ಧ': 'dh', 'ನ': 'n',
+    'ಪ': 'p', 'ಫ': 'ph', 'ಬ': 'b', 'ಭ': 'bh', 'ಮ': 'm',
+    'ಯ': 'y', 'ರ': 'r', 'ಱ': 'r', 'ಲ': 'l', 'ವ': 'v',
+    'ಶ': 'sh', 'ಷ': 'sh', 'ಸ': 's', 'ಹ': 'h', 'ಳ': 'l', 'ೞ': 'l'
+}
+
+# Dependent vowel signs (replace the inherent "a")
+KANNADA_VOWEL_SIGNS = {
+    'ಾ': 'a', 'ಿ': 'i', 'ೀ': 'i', 'ು': 'u', 'ೂ': 'u',
+    'ೃ': 'ru', 'ೄ': 'ru', 'ೆ': 'e', 'ೇ': 'e', 'ೈ': 'ai',
+    'ೊ': 'o', 'ೋ': 'o', 'ೌ': 'au'
+}
+
+KANNADA_VIRAMA = '್'
+KANNADA_ANUSVARA = 'ಂ'
+KANNADA_VISARGA = 'ಃ'
+KANNADA_NUKTA = '಼'
+
+# Anusvara is written "m" before labials and at word end, "n" elsewhere
+KANNADA_LABIALS = frozenset('ಪಫಬಭಮ')
+
+# Spelling variants collapsed by phonetic_key, applied in order
+# ("thale" / "tale", "bukhaar" / "bukhar", "jeeva" / "jiva", "novvu" / "novu")
+PHONETIC_REPLACEMENTS = [
+    ('ee', 'i'), ('oo', 'u'),
+    ('chh', 'c'), ('ch', 'c'), ('sh', 's'), ('kh', 'k'), ('gh', 'g'),
+    ('jh', 'j'), ('th', 't'), ('dh', 'd'), ('ph', 'f'), ('bh', 'b'),
+    ('w', 'v'), ('z', 'j'), ('q', 'k')
+]
+
+
+def romanize_kannada(text: str) -> str:
+    """
+    Transliterate Kannada script to plain ASCII
+
+    Long and short vowels share one letter and retroflex/dental consonants
+    are not distinguished, which is how most users type Kannada in Latin
+    script. Non-Kannada characters are passed through unchanged.
+    """
+    output: List[str] = []
+    pending_consonant = False
+
+    for position, char in enumerate(text):
+        if char in KANNADA_CONSONANTS:
+            if pending_consonant:
+                output.append('a')
+            output.append(KANNADA_CONSONANTS[char])
+            pending_consonant = True
+            continue
+
+        if char in KANNADA_VOWEL_SIGNS:
+            output.append(KANNADA_VOWEL_SIGNS[char])
+            pending_consonant = False
+            continue
+
+        if char == KANNADA_VIRAMA:
+            pending_consonant = False
+            continue
+
+        if char == KANNADA_NUKTA:
+            continue
+
+        if pending_consonant:
+            output.append('a')
+            pending_consonant = False
+
+        if char in KANNADA_VOWELS:
+            output.append(KANNADA_VOWELS[char])
+        elif char == KANNADA_ANUSVARA:
+            following = text[position + 1] if position + 1 < len(text) else ''
+            nasal = 'n' if following in KANNADA_CONSONANTS and following not in KANNADA_LABIALS else 'm'
+            output.append(nasal)
+        elif char == KANNADA_VISARGA:
+            output.append('h')
+        else:
+            output.append(char)
+
+    if pending_consonant:
+        output.append('a')
+
+    return ''.join(output)
+
+
+@lru_cache(maxsize=PHONETIC_KEY_CACHE_SIZE)
+def phonetic_key(word: str) -> str:
+    """
+    Collapse common romanization variants of a single word
+
+    "Thale", "tale" and "thaale" all map to "tale"; "bukhaar" and
+    "bukhar" map to "bukar".
+    """
+    word = word.lower()
+    for source, target in PHONETIC_REPLACEMENTS:
+        word = word.replace(source, target)
+
+    # Doubled letters ("novvu", "kemmu", "aa") carry no meaning in romanized input
+    collapsed = []
+    for char in word:
+        if not collapsed or collapsed[-1] != char:
+            collapsed.append(char)
+    return ''.join(collapsed)
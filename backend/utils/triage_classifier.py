@@ -0,0 +1,278 @@
+"""
+Local triage classifier
+Multinomial naive Bayes over word n-grams predicting urgency and specialties
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.text_normalizer import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Bump when the artifact layout changes; older artifacts are ignored
+ARTIFACT_FORMAT_VERSION = 1
+
+_outcome_log_lock = Lock()
+
+
+def extract_features(text: str) -> List[str]:
+    """Word unigrams and bigrams of normalized text"""
+    tokens = tokenize(text)
+    return tokens + [f'{a} {b}' for a, b in zip(tokens, tokens[1:])]
+
+
+class _NaiveBayesHead:
+    """One multinomial naive Bayes output over a shared feature index"""
+
+    def __init__(self, labels: Sequence[str], feature_count: int, alpha: float):
+        self.labels = list(labels)
+        self.alpha = alpha
+        self.class_counts = np.zeros(len(self.labels), dtype=np.float64)
+        self.feature_counts = np.zeros((len(self.labels), feature_count), dtype=np.float64)
+        self.log_prior = None
+        self.log_likelihood = None
+
+    def finalize(self) -> None:
+        """Turn counts into smoothed log probabilities"""
+        totals = self.class_counts.sum() or 1.0
+        self.log_prior = np.log((self.class_counts + 1.0) / (totals + len(self.labels)))
+        smoothed = self.feature_counts + self.alpha
+        self.log_likelihood = np.log(smoothed / smoothed.sum(axis=1, keepdims=True))
+
+    def posterior(self, columns: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Class probabilities for a sparse feature vector"""
+        scores = self.log_prior + self.log_likelihood[:, columns] @ counts
+        scores -= scores.max()
+        probabilities = np.exp(scores)
+        return probabilities / probabilities.sum()
+
+    def to_dict(self) -> Dict:
+        rows, columns = np.nonzero(self.feature_counts)
+        return {
+            'labels': self.labels,
+            'class_counts': self.class_counts.tolist(),
+            'feature_counts': [
+                [int(r), int(c), float(self.feature_counts[r, c])] for r, c in zip(rows, columns)
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, feature_count: int, alpha: float) -> '_NaiveBayesHead':
+        head = cls(data['labels'], feature_count, alpha)
+        head.class_counts = np.array(data['class_counts'], dtype=np.float64)
+        for row, column, count in data['feature_counts']:
+            head.feature_counts[row, column] = count
+        head.finalize()
+        return head
+
+
+class TriageClassifier:
+    """
+    In-process urgency and specialty classifier
+
+    Trained from catalogue terms (and optionally logged Azure OpenAI
+    outcomes), predicts in microseconds and reports a confidence that the
+    analyzer uses to decide whether a cloud call is needed.
+    """
+
+    def __init__(self, alpha: float = 0.1):
+        self.alpha = alpha
+        self.features: Dict[str, int] = {}
+        self.urgency: Optional[_NaiveBayesHead] = None
+        self.specialty: Optional[_NaiveBayesHead] = None
+        self.metadata: Dict = {}
+
+    def fit(self, samples: Iterable[Tuple[str, str, Sequence[str]]],
+            dataset_version: str = '') -> 'TriageClassifier':
+        """
+        Train both heads
+
+        Args:
+            samples: (normalized text, urgency, specialties) tuples
+            dataset_version: Version of the catalogue the samples came from
+        """
+        samples = [
+            (extract_features(text), urgency, list(specialties))
+            for text, urgency, specialties in samples
+            if text and urgency
+        ]
+
+        for features, _, _ in samples:
+            for feature in features:
+                self.features.setdefault(feature, len(self.features))
+
+        urgency_labels = sorted({urgency for _, urgency, _ in samples})
+        specialty_labels = sorted({s for _, _, specialties in samples for s in specialties})
+        self.urgency = _NaiveBayesHead(urgency_labels, len(self.features), self.alpha)
+        self.specialty = _NaiveBayesHead(specialty_labels, len(self.features), self.alpha)
+
+        urgency_rows = {label: i for i, label in enumerate(urgency_labels)}
+        specialty_rows = {label: i for i, label in enumerate(specialty_labels)}
+
+        for features, urgency, specialties in samples:
+            columns = [self.features[f] for f in features]
+            row = urgency_rows[urgency]
+            self.urgency.class_counts[row] += 1
+            np.add.at(self.urgency.feature_counts[row], columns, 1)
+
+            for specialty in specialties:
+                row = specialty_rows[specialty]
+                self.specialty.class_counts[row] += 1
+                np.add.at(self.specialty.feature_counts[row], columns, 1)
+
+        self.urgency.finalize()
+        self.specialty.finalize()
+
+        self.metadata = {
+            'format_version': ARTIFACT_FORMAT_VERSION,
+            'dataset_version': dataset_version,
+            'trained_at': datetime.utcnow().isoformat(),
+            'sample_count': len(samples),
+            'feature_count': len(self.features)
+        }
+        return self
+
+    @property
+    def trained_on_outcomes(self) -> bool:
+        """
+        Whether the model learnt from logged Azure OpenAI outcomes
+
+        A catalogue-only model was trained on the very terms the rule engine
+        matches, so its agreement with the rules proves nothing.
+        """
+        return bool(self.metadata.get('trained_on_outcomes'))
+
+    def predict(self, text: str, top_specialties: int = 3) -> Optional[Dict]:
+        """
+        Predict urgency and specialties
+
+        Returns:
+            dict with urgency, confidence, specialties and known_feature_ratio,
+            or None when the text shares no feature with the training data
+        """
+        features = extract_features(text)
+        counts: Dict[int, int] = {}
+        for feature in features:
+            column = self.features.get(feature)
+            if column is not None:
+                counts[column] = counts.get(column, 0) + 1
+
+        if not counts or self.urgency is None:
+            return None
+
+        columns = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+
+        urgency_probabilities = self.urgency.posterior(columns, values)
+        best = int(urgency_probabilities.argmax())
+
+        specialty_probabilities = self.specialty.posterior(columns, values)
+        top = np.argsort(-specialty_probabilities)[:top_specialties]
+
+        return {
+            'urgency': self.urgency.labels[best],
+            'confidence': float(urgency_probabilities[best]),
+            'specialties': [self.specialty.labels[i] for i in top],
+            'known_feature_ratio': sum(counts.values()) / len(features)
+        }
+
+    def save(self, path: str) -> None:
+        """Write the model as a JSON artifact"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        features = sorted(self.features, key=self.features.get)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'metadata': self.metadata,
+                'alpha': self.alpha,
+                'features': features,
+                'urgency': self.urgency.to_dict(),
+                'specialty': self.specialty.to_dict()
+            }, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['TriageClassifier']:
+        """Load a JSON artifact, None if missing or of an older format"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if data.get('metadata', {}).get('format_version') != ARTIFACT_FORMAT_VERSION:
+            return None
+
+        model = cls(alpha=data['alpha'])
+        model.features = {feature: i for i, feature in enumerate(data['features'])}
+        model.urgency = _NaiveBayesHead.from_dict(data['urgency'], len(model.features), model.alpha)
+        model.specialty = _NaiveBayesHead.from_dict(data['specialty'], len(model.features), model.alpha)
+        model.metadata = data['metadata']
+        return model
+
+
+def rotated_log_path(path: str) -> str:
+    """Where log_ai_outcome keeps the previous generation of an outcome log"""
+    return path + '.1'
+
+
+def log_ai_outcome(path: str, text: str, urgency: str, specialties: Sequence[str],
+                   max_bytes: int = 0) -> None:
+    """
+    Append one Azure OpenAI triage outcome to the JSONL training log
+
+    The record holds the user's symptom text, so callers only log when
+    outcome logging has been explicitly enabled.
+
+    Args:
+        path: JSONL log file
+        text: Cleaned symptom text
+        urgency: Urgency returned by Azure OpenAI
+        specialties: Specialties returned by Azure OpenAI
+        max_bytes: Once the log would grow past this size it is moved to
+            ``<path>.1`` (replacing the previous generation) and a new log is
+            started; 0 disables rotation
+    """
+    record = json.dumps({
+        'text': text,
+        'urgency': urgency,
+        'specialties': list(specialties),
+        'logged_at': datetime.utcnow().isoformat()
+    }, ensure_ascii=False) + '\n'
+    try:
+        with _outcome_log_lock:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            if max_bytes > 0 and os.path.exists(path) and \
+                    os.path.getsize(path) + len(record.encode('utf-8')) > max_bytes:
+                os.replace(path, rotated_log_path(path))
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(record)
+    except OSError as e:
+        logger.warning(f"Could not log AI outcome: {e}")
+
+
+def load_ai_outcomes(path: str) -> List[Tuple[str, str, List[str]]]:
+    """
+    Read logged AI outcomes as training samples, skipping malformed lines
+
+    The rotated previous generation (``<path>.1``) is read first, then the
+    current log.
+    """
+    samples = []
+    for log_path in (rotated_log_path(path), path):
+        try:
+            with open(log_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        samples.append((record['text'], record['urgency'], record.get('specialties', [])))
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        continue
+        except FileNotFoundError:
+            continue
+    return samples
@@ -0,0 +1,79 @@
+"""
+As-you-type analysis sessions
+Resumable matcher state for symptom text that grows keystroke by keystroke
+"""
+
+from threading import Lock
+from typing import Dict, Optional, Set, Tuple
+
+
+class MatchStream:
+    """
+    Normalized text consumed so far and the raw hits found in it
+
+    Holds the keyword automaton and romanized automaton states, so new
+    words are scanned without rescanning the text before them. Hits are
+    kept unfiltered; they are pruned to candidate symptoms when scored,
+    because a later word can make an earlier partial hit a candidate.
+    """
+
+    __slots__ = (
+        'text', 'state', 'romanized_key', 'romanized_state', 'base',
+        'candidates', 'keyword_hits', 'regional_hits', 'romanized_hits'
+    )
+
+    def __init__(self, base: Optional['MatchStream'] = None):
+        self.text = base.text if base else ''
+        self.state = base.state if base else 0
+        self.romanized_key = base.romanized_key if base else ''
+        self.romanized_state = base.romanized_state if base else 0
+        # Stream this one continues; its hits count as this stream's too
+        self.base = base
+        self.candidates: Set[int] = set()
+        # symptom index -> {keyword position: whole-word hit seen}
+        self.keyword_hits: Dict[int, Dict[int, bool]] = {}
+        # symptom index -> last native-script term hit
+        self.regional_hits: Dict[int, str] = {}
+        # symptom index -> first romanized term hit
+        self.romanized_hits: Dict[int, str] = {}
+
+    def overlay(self) -> 'MatchStream':
+        """Continuation that can be extended without changing this stream"""
+        return MatchStream(base=self)
+
+    def layers(self):
+        """This stream's hits, oldest layer first"""
+        return (self.base, self) if self.base else (self,)
+
+
+class TypingSession:
+    """
+    State of one as-you-type session
+
+    Only words followed by whitespace are committed to the streams: a word
+    still being typed can change, so it is matched on a throwaway overlay.
+    `corrected` mirrors `literal` with typo-corrected words and is None
+    until the first correction (until then both would be identical).
+    """
+
+    __slots__ = (
+        'dataset_version', 'raw_text', 'committed_length', 'literal',
+        'corrected', 'reported', 'lock'
+    )
+
+    def __init__(self, dataset_version: str):
+        self.dataset_version = dataset_version
+        self.raw_text = ''
+        self.committed_length = 0
+        self.literal = MatchStream()
+        self.corrected: Optional[MatchStream] = None
+        # symptom id -> (match score, matched keywords) last returned to the client
+        self.reported: Dict[str, Tuple[int, Tuple[str, ...]]] = {}
+        self.lock = Lock()
+
+    def clear(self) -> None:
+        """Start over, e.g. after the user edited earlier text"""
+        self.raw_text = ''
+        self.committed_length = 0
+        self.literal = MatchStream()
+        self.corrected = None
@@ -0,0 +1,105 @@
+"""
+Common English word list
+Base forms from a data file, expanded with their regular inflections
+"""
+
+import json
+import logging
+from typing import FrozenSet, Iterable, Set
+
+logger = logging.getLogger(__name__)
+
+VOWELS = 'aeiou'
+
+
+def _doubles_final_consonant(word: str) -> bool:
+    """Short consonant-vowel-consonant words double their last letter (stop -> stopping)"""
+    return (
+        len(word) >= 3 and word[-1] not in VOWELS + 'wxy'
+        and word[-2] in VOWELS and word[-3] not in VOWELS
+        and len(word) <= 4
+    )
+
+
+def inflections(word: str) -> Set[str]:
+    """
+    Regular inflections of a base form: plural / third person, past tense,
+    present participle and comparative / agent noun
+
+    Irregular forms ("ran", "children") and adverbs are listed as forms in
+    the word file; words already ending in -ed or -ing are not inflected
+    again. Forms that do not exist for a word ("hurted") are harmless: they
+    only keep a string that nobody types from being treated as a typo.
+    """
+    forms = {word}
+    if len(word) < 3 or not word.isalpha() or word.endswith('ed'):
+        return forms
+    if word.endswith('ing'):
+        # Already inflected ("morning", "building")
+        forms.add(word + 's')
+        return forms
+
+    if word.endswith('y') and word[-2] not in VOWELS:
+        stem = word[:-1]
+        forms.update((stem + 'ies', stem + 'ied', word + 'ing', stem + 'ier'))
+        return forms
+
+    if word.endswith(('s', 'x', 'z', 'ch', 'sh')):
+        forms.add(word + 'es')
+    else:
+        forms.add(word + 's')
+
+    if word.endswith('e'):
+        forms.add(word + 'd')
+        if len(word) > 3:
+            # "safer", but not "feer" next to "fever"
+            forms.add(word + 'r')
+        if not word.endswith(('ee', 'ye', 'oe')):
+            forms.add(word[:-1] + 'ing')
+        else:
+            forms.add(word + 'ing')
+    elif _doubles_final_consonant(word):
+        doubled = word + word[-1]
+        forms.update((doubled + 'ed', doubled + 'ing', doubled + 'er'))
+    else:
+        forms.update((word + 'ed', word + 'ing', word + 'er'))
+    return forms
+
+
+def expand_words(words: Iterable[str]) -> FrozenSet[str]:
+    """Lowercased base forms and all their regular inflections"""
+    expanded = set()
+    for word in words:
+        word = word.strip().lower()
+        if word:
+            expanded.update(inflections(word))
+    return frozenset(expanded)
+
+
+def load_word_list(path: str) -> FrozenSet[str]:
+    """
+    Load the common word list
+
+    The JSON file holds "words", base forms expanded with their regular
+    inflections, and "forms" (function words, irregular forms, adverbs),
+    which are taken as listed.
+
+    Returns:
+        frozenset: Words, inflections and forms, empty when the file is
+        missing or malformed
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        logger.warning(f"Common word list not found: {path}")
+        return frozenset()
+    except json.JSONDecodeError as e:
+        logger.error(f"Error parsing common word list JSON: {e}")
+        return frozenset()
+
+    words = data.get('words', [])
+    forms = data.get('forms', [])
+    expanded = expand_words(words) | {form.strip().lower() for form in forms if form.strip()}
+    logger.info(f"Loaded {len(words) + len(forms)} common words ({len(expanded)} with inflections)")
+    return frozenset(expanded)